@@ -6,11 +6,17 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import pyperclip
 import datetime
+import queue
 
 from config.config_manager import ConfigManager
 from database.db_manager import DatabaseManager
 from database.user_manager import UserManager
-from utils.constants import COLORS, WINDOW_BREAK_POINT, QUESTIONS_PER_PAGE_DEFAULT, QUESTIONS_PER_PAGE_SMALL
+from database.connection import connection_registry
+from database.change_feed import ChangeFeed
+from utils.constants import (
+    COLORS, WINDOW_BREAK_POINT, QUESTIONS_PER_PAGE_DEFAULT, QUESTIONS_PER_PAGE_SMALL,
+    CHANGE_EVENTS_POLL_MS
+)
 from utils.helpers import safe_grab_set
 
 # Import UI tabs
@@ -50,6 +56,7 @@ class MCQDatabaseManager:
         self.config_manager = ConfigManager()
         self.db_manager = DatabaseManager()
         self.user_manager = UserManager()
+        self.change_feed = None
         
         # Current questions for display
         self.current_questions = []
@@ -260,11 +267,12 @@ class MCQDatabaseManager:
                 password_dialog.update()
                 
                 # Connect to MongoDB
-                success, message = self.db_manager.connect(password)
+                connection_settings = self.config_manager.connection_settings
+                success, message = self.db_manager.connect(password, connection_settings)
                 
                 if success:
-                    # Connect user manager to same database
-                    self.user_manager.connect(password)
+                    # Connect user manager to same database, reusing the shared client
+                    self.user_manager.connect(password, connection_settings)
                     
                     # Save password if requested
                     if remember_var.get():
@@ -284,6 +292,12 @@ class MCQDatabaseManager:
                     
                     # Load initial data
                     self.refresh_all_tabs()
+                    
+                    # Follow changes made by other clients
+                    self.start_change_feed()
+                    
+                    # Questions stored before fingerprints existed slow down and weaken duplicate checks
+                    self.manage_tab.offer_fingerprint_backfill()
                 else:
                     loading_label.destroy()
                     messagebox.showerror("Connection Error", f"Failed to connect:\n{message}")
@@ -450,6 +464,43 @@ class MCQDatabaseManager:
         # Update subject combos in all tabs
         self.update_all_combos()
     
+    def start_change_feed(self):
+        """Start receiving live question and statistics changes"""
+        if self.change_feed:
+            self.change_feed.stop()
+        
+        self.change_feed = ChangeFeed(self.db_manager)
+        self.change_feed.start()
+        self.root.after(CHANGE_EVENTS_POLL_MS, self.process_change_events)
+    
+    def process_change_events(self):
+        """Apply queued live changes on the Tk main thread"""
+        feed = self.change_feed
+        if not feed or feed.stop_event.is_set():
+            return
+        
+        rollups_changed = False
+        try:
+            while True:
+                event = feed.events.get_nowait()
+                if event[0] == 'question':
+                    self.browse_tab.apply_question_change(*event[1:])
+                elif event[0] == 'rollup':
+                    self.dashboard_tab.apply_rollup_change(*event[1:])
+                    rollups_changed = True
+                else:
+                    self.dashboard_tab.reload_rollups()
+                    rollups_changed = True
+        except queue.Empty:
+            pass
+        
+        if rollups_changed:
+            # Counts may have been changed by another client, so cached aggregates are stale
+            self.db_manager.query_cache.invalidate()
+            self.dashboard_tab.schedule_redraw()
+        
+        self.root.after(CHANGE_EVENTS_POLL_MS, self.process_change_events)
+    
     def update_all_combos(self):
         """Update all comboboxes with new subjects"""
         subjects = self.config_manager.get_all_subjects()
@@ -497,9 +548,16 @@ class MCQDatabaseManager:
             self.admin_tab.cleanup()
         
         # Update user activity log
-        if hasattr(self, 'user_manager') and self.user_manager.collection:
+        if hasattr(self, 'user_manager') and self.user_manager.collection is not None:
             duration = datetime.datetime.now() - self.session_start
             self.user_manager.log_session(self.username, self.session_start, duration)
         
+        # Stop live updates before the connections go away
+        if self.change_feed:
+            self.change_feed.stop()
+        
+        # Close the shared MongoDB connections
+        connection_registry.close_all()
+        
         # Destroy the window
         self.root.destroy()
\ No newline at end of file
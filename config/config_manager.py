@@ -5,7 +5,7 @@ Configuration management for MCQ Database Manager
 import json
 import os
 import base64
-from utils.constants import DEFAULT_SUBJECT_DATA, CONFIG_FILE
+from utils.constants import DEFAULT_SUBJECT_DATA, CONFIG_FILE, DEFAULT_CONNECTION_SETTINGS, NEAR_DUPLICATE_THRESHOLD
 
 
 class ConfigManager:
@@ -15,6 +15,8 @@ class ConfigManager:
         self.saved_password = None
         self.saved_username = None
         self.levels = ["easy", "medium", "hard"]
+        self.connection_settings = dict(DEFAULT_CONNECTION_SETTINGS)
+        self.near_duplicate_threshold = NEAR_DUPLICATE_THRESHOLD
         self.load_config()
     
     def load_config(self):
@@ -26,6 +28,8 @@ class ConfigManager:
                     self.subject_data = config.get('subject_data', DEFAULT_SUBJECT_DATA)
                     self.saved_password = config.get('password', None)
                     self.saved_username = config.get('username', None)
+                    self.connection_settings.update(config.get('connection_settings', {}))
+                    self.near_duplicate_threshold = config.get('near_duplicate_threshold', NEAR_DUPLICATE_THRESHOLD)
             else:
                 self.subject_data = DEFAULT_SUBJECT_DATA
                 self.saved_password = None
@@ -44,7 +48,9 @@ class ConfigManager:
             config = {
                 'subject_data': self.subject_data,
                 'password': self.saved_password,
-                'username': self.saved_username
+                'username': self.saved_username,
+                'connection_settings': self.connection_settings,
+                'near_duplicate_threshold': self.near_duplicate_threshold
             }
             with open(self.config_file, 'w') as f:
                 json.dump(config, f, indent=2)
@@ -108,4 +114,24 @@ class ConfigManager:
             self.subject_data[subject] = {"topics": [], "classifications": []}
             self.save_config()
             return True
-        return False
\ No newline at end of file
+        return False
+    
+    def merge_subject_data(self, subject_data):
+        """Merge subjects, topics and classifications from e.g. a backup"""
+        changed = False
+        
+        for subject, data in (subject_data or {}).items():
+            if subject not in self.subject_data:
+                self.subject_data[subject] = {"topics": [], "classifications": []}
+                changed = True
+            
+            for key in ("topics", "classifications"):
+                existing = self.subject_data[subject].setdefault(key, [])
+                for value in data.get(key, []):
+                    if value not in existing:
+                        existing.append(value)
+                        changed = True
+        
+        if changed:
+            self.save_config()
+        return changed
\ No newline at end of file
@@ -1,2 +1,9 @@
 from .db_manager import DatabaseManager
-from .user_manager import UserManager
\ No newline at end of file
+from .user_manager import UserManager
+from .connection import connection_registry
+from .bulk_importer import BulkImporter
+from .restore import RestoreJob
+from .change_feed import ChangeFeed
+from .import_pipeline import ImportPipeline
+from .batch_import import BatchImport
+from .import_journal import ImportJournal
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Parallel multi-file question import for MCQ Database Manager
+"""
+
+import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pymongo.errors import ConnectionFailure
+from utils.constants import IMPORT_BATCH_SIZE, BATCH_IMPORT_WORKERS
+from utils.file_ingest import find_question_files, parse_question_file
+from utils.helpers import dedupe_questions
+
+# Columns of the per-file summary report
+REPORT_FIELDS = ['file', 'read', 'invalid', 'repeated', 'duplicates', 'new', 'status', 'errors']
+
+
+class BatchImport:
+    """Imports every question file matching a directory or glob pattern
+    
+    Files are parsed and validated in a pool of worker processes, so large
+    batches use every core. The parent merges the results as files finish,
+    drops questions repeated across files or already stored, and feeds a
+    single writer that inserts IMPORT_BATCH_SIZE questions per insert_many.
+    
+    A file that can't be parsed, checked or written is recorded as failed
+    in its report row and the other files carry on; only a lost connection
+    stops the whole import.
+    """
+    
+    def __init__(self, db_manager, username, pattern, user_manager=None,
+                 batch_size=IMPORT_BATCH_SIZE, workers=BATCH_IMPORT_WORKERS):
+        self.db_manager = db_manager
+        self.username = username
+        self.user_manager = user_manager
+        self.files = find_question_files(pattern)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.buffer = []
+        self.seen = set()
+        self.file_reports = []
+        self.report = {
+            'files': len(self.files),
+            'failed_files': 0,
+            'read': 0,
+            'invalid': 0,
+            'repeated': 0,
+            'duplicates': 0,
+            'imported': 0
+        }
+    
+    def run(self, progress_callback=None, cancel_event=None):
+        """Import the files and return the overall report
+        
+        progress_callback(files done, total files, file report) is called
+        as each file is merged. Once cancel_event is set, files not parsed
+        yet are skipped; questions of merged files are still written.
+        """
+        # Spawned workers don't inherit the Tk process's threads and locks
+        context = multiprocessing.get_context('spawn')
+        
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            futures = {executor.submit(parse_question_file, path): path for path in self.files}
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    # e.g. a worker process that died
+                    parsed = {'file': futures[future], 'questions': [], 'read': 0, 'invalid': 0,
+                              'errors': [], 'warning': None, 'error': str(e)}
+                file_report = self.merge(parsed)
+                if progress_callback:
+                    progress_callback(done, len(self.files), file_report)
+        
+        self.flush()
+        return self.report
+    
+    def merge(self, parsed):
+        """Add one file's parsed questions to the write buffer; returns its report row"""
+        unique, repeated = dedupe_questions(parsed['questions'], self.seen)
+        
+        file_report = {
+            'file': parsed['file'],
+            'read': parsed['read'],
+            'invalid': parsed['invalid'],
+            'repeated': len(repeated),
+            'duplicates': 0,
+            'new': 0,
+            'status': parsed['error'] or parsed['warning'] or 'OK',
+            'errors': '; '.join(parsed['errors']),
+            'failed': bool(parsed['error'])
+        }
+        self.file_reports.append(file_report)
+        
+        if parsed['error']:
+            self.report['failed_files'] += 1
+        for key in ('read', 'invalid', 'repeated'):
+            self.report[key] += file_report[key]
+        
+        try:
+            existing = self.db_manager.find_existing_questions(
+                (q.get('subject', ''), q.get('question', '')) for q in unique
+            )
+        except ConnectionFailure:
+            raise
+        except Exception as e:
+            self.fail_file(file_report, f"Duplicate check failed: {str(e)}")
+            return file_report
+        
+        new = [q for q in unique if (q.get('subject', ''), q.get('question', '')) not in existing]
+        file_report['duplicates'] = len(unique) - len(new)
+        file_report['new'] = len(new)
+        self.report['duplicates'] += file_report['duplicates']
+        
+        self.buffer.extend((file_report, q) for q in new)
+        while len(self.buffer) >= self.batch_size:
+            self.write(self.buffer[:self.batch_size])
+            self.buffer = self.buffer[self.batch_size:]
+        
+        return file_report
+    
+    def fail_file(self, file_report, message):
+        """Mark a file as failed in its report row"""
+        if not file_report['failed']:
+            self.report['failed_files'] += 1
+        file_report['failed'] = True
+        file_report['status'] = message
+    
+    def flush(self):
+        """Write the questions still buffered"""
+        if self.buffer:
+            self.write(self.buffer)
+            self.buffer = []
+    
+    def write(self, entries):
+        """Insert one batch of (file report, question) entries
+        
+        If the batch is rejected, e.g. by a question the database can't
+        store, each file's questions are retried on their own so only the
+        offending files are marked as failed.
+        """
+        try:
+            self.insert(entries)
+            return
+        except ConnectionFailure:
+            raise
+        except Exception:
+            pass
+        
+        by_file = {}
+        for entry in entries:
+            by_file.setdefault(id(entry[0]), []).append(entry)
+        
+        for file_entries in by_file.values():
+            try:
+                self.insert(file_entries)
+            except ConnectionFailure:
+                raise
+            except Exception as e:
+                file_report = file_entries[0][0]
+                file_report['new'] -= len(file_entries)
+                self.fail_file(file_report, f"Write failed: {str(e)}")
+    
+    def insert(self, entries):
+        """Insert (file report, question) entries and update the counts"""
+        inserted = []
+        count = self.db_manager.insert_questions([q for _, q in entries], self.username, inserted)
+        self.report['imported'] += count
+        
+        # Questions inserted by someone else since the duplicate check
+        self.report['duplicates'] += len(entries) - count
+        inserted_ids = {id(q) for q in inserted}
+        for file_report, q in entries:
+            if id(q) not in inserted_ids:
+                file_report['new'] -= 1
+                file_report['duplicates'] += 1
+        
+        # Update user's question count
+        if self.user_manager is not None and self.user_manager.collection is not None:
+            self.user_manager.update_questions_created(self.username, count)
+    
+    def write_report(self, filename):
+        """Write the per-file summary as CSV"""
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            for file_report in sorted(self.file_reports, key=lambda r: r['file']):
+                writer.writerow(file_report)
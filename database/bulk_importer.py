@@ -0,0 +1,169 @@
+"""
+Batched question import engine for MCQ Database Manager
+"""
+
+from utils.constants import IMPORT_BATCH_SIZE
+from utils.helpers import validate_question, compute_fingerprint
+from utils.tabular import validate_frame
+
+# Only the first few validation errors are kept for the report
+MAX_REPORTED_ERRORS = 50
+
+
+class BulkImporter:
+    """Validates questions and writes them in unordered insert_many batches
+    
+    Rows repeating an earlier row of the same import are dropped before
+    they reach the database; only their first occurrence is inserted.
+    
+    With an ImportJournal every written batch is recorded, so running the
+    import of the same source again skips the rows through the last
+    committed batch, and questions written by the earlier run, without
+    querying the database. The journal is discarded once an import
+    completes.
+    """
+    
+    def __init__(self, db_manager, username, batch_size=IMPORT_BATCH_SIZE, journal=None):
+        self.db_manager = db_manager
+        self.username = username
+        self.batch_size = batch_size
+        self.journal = journal
+        if journal is not None:
+            journal.load()
+        self.report = {
+            'read': 0,
+            'imported': 0,
+            'duplicates': 0,
+            'invalid': 0,
+            'repeated': 0,
+            'resumed': 0,
+            'errors': [],
+            'repeats': []
+        }
+        # Fingerprint -> row number of the first occurrence
+        self.seen_rows = {}
+    
+    def prepare_batch(self, rows):
+        """Validate a batch of rows and return the ones that can be inserted"""
+        valid = []
+        
+        for row in rows:
+            self.report['read'] += 1
+            
+            is_valid, message = validate_question(row)
+            if not is_valid:
+                self.add_error(self.report['read'], message)
+                continue
+            
+            if self.accept(self.report['read'], row):
+                valid.append(row)
+        
+        return valid
+    
+    def prepare_frame(self, frame):
+        """Validate a DataFrame of rows column-wise and return the rows that can be inserted
+        
+        The frame's index must number its rows from 0 across the whole import.
+        """
+        rows, errors = validate_frame(frame)
+        for row_index, message in errors:
+            self.add_error(row_index + 1, message)
+        
+        valid_indexes = frame.index.difference([row_index for row_index, _ in errors], sort=False)
+        valid = [row for row_index, row in zip(valid_indexes, rows) if self.accept(row_index + 1, row)]
+        
+        self.report['read'] += len(frame)
+        return valid
+    
+    def accept(self, row_number, row):
+        """Check a valid row for repeats within the import and fill in defaults"""
+        fingerprint = compute_fingerprint(row.get('subject', ''), row.get('question', ''))
+        first_row = self.seen_rows.get(fingerprint)
+        if first_row is not None:
+            self.add_repeat(row_number, first_row)
+            return False
+        self.seen_rows[fingerprint] = row_number
+        
+        if self.journal is not None and fingerprint in self.journal.fingerprints:
+            self.report['resumed'] += 1
+            return False
+        
+        # Add created_by if not present
+        if not row.get('created_by'):
+            row['created_by'] = self.username
+        
+        return True
+    
+    def skip_committed(self, rows):
+        """Drop the leading rows of a batch (a list or DataFrame) an earlier run committed"""
+        if self.journal is None:
+            return rows
+        
+        skip = min(len(rows), max(self.journal.offset - self.report['read'], 0))
+        self.report['read'] += skip
+        self.report['resumed'] += skip
+        return rows.iloc[skip:] if hasattr(rows, 'iloc') else rows[skip:]
+    
+    def write_batch(self, questions):
+        """Insert a batch, counting questions rejected as duplicates, and journal it"""
+        inserted = 0
+        if questions:
+            inserted = self.db_manager.insert_questions(questions, self.username)
+            self.report['imported'] += inserted
+            self.report['duplicates'] += len(questions) - inserted
+        
+        if self.journal is not None:
+            self.journal.commit(self.report['read'], questions)
+        return inserted
+    
+    def add_error(self, row_number, message):
+        """Record an invalid row"""
+        self.report['invalid'] += 1
+        if len(self.report['errors']) < MAX_REPORTED_ERRORS:
+            self.report['errors'].append(f"Row {row_number}: {message}")
+    
+    def add_repeat(self, row_number, first_row):
+        """Record a row repeating an earlier row of the import"""
+        self.report['repeated'] += 1
+        if len(self.report['repeats']) < MAX_REPORTED_ERRORS:
+            self.report['repeats'].append(f"Row {row_number}: repeats row {first_row}")
+    
+    def run(self, batches, progress_callback=None, cancel_event=None):
+        """Import an iterable of row batches and return the import report
+        
+        Once cancel_event is set the import stops before the next batch and
+        keeps its journal, so importing the same source again resumes it.
+        """
+        for rows in batches:
+            if cancel_event is not None and cancel_event.is_set():
+                return self.report
+            
+            rows = self.skip_committed(rows)
+            if len(rows):
+                self.write_batch(self.prepare_batch(rows))
+            
+            if progress_callback:
+                progress_callback(self.report)
+        
+        return self.finish()
+    
+    def run_frames(self, frames, progress_callback=None, cancel_event=None):
+        """Import an iterable of DataFrame chunks and return the import report, like run"""
+        for frame in frames:
+            if cancel_event is not None and cancel_event.is_set():
+                return self.report
+            
+            frame = self.skip_committed(frame)
+            if len(frame):
+                self.write_batch(self.prepare_frame(frame))
+            
+            if progress_callback:
+                progress_callback(self.report)
+        
+        return self.finish()
+    
+    def finish(self):
+        """Discard the journal of a completed import and return the report"""
+        if self.journal is not None:
+            self.journal.discard()
+        return self.report
@@ -0,0 +1,241 @@
+"""
+Live change notifications for MCQ Database Manager
+"""
+
+import datetime
+import queue
+import threading
+from bson import ObjectId
+from pymongo import DESCENDING
+from pymongo.errors import OperationFailure, PyMongoError
+from utils.constants import CHANGE_FEED_POLL_SECONDS, QUESTION_PREVIEW_LENGTH
+from .db_manager import LIST_VIEW_FIELDS
+from .question_stats import rollup_key
+
+# Server errors meaning change streams can't be used, e.g. on a standalone mongod
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324, 136}
+
+# Fields whose changes are shown in question lists
+WATCHED_QUESTION_FIELDS = LIST_VIEW_FIELDS + ['question']
+
+
+def question_change_pipeline():
+    """Change stream pipeline passing only list-visible changes to questions"""
+    changed_fields = [
+        {'updateDescription.updatedFields.' + field: {'$exists': True}}
+        for field in WATCHED_QUESTION_FIELDS
+    ]
+    projection = {'fullDocument.' + field: 1 for field in WATCHED_QUESTION_FIELDS}
+    projection.update({'fullDocument._id': 1, 'operationType': 1, 'documentKey': 1})
+    
+    return [
+        {'$match': {'$or': [
+            {'operationType': {'$in': ['insert', 'replace', 'delete']}},
+            {'operationType': 'update', '$or': changed_fields}
+        ]}},
+        {'$project': projection},
+        {'$set': {'fullDocument.question': {
+            '$substrCP': [{'$ifNull': ['$fullDocument.question', '']}, 0, QUESTION_PREVIEW_LENGTH + 1]
+        }}}
+    ]
+
+
+def question_event(change):
+    """Turn a question change from question_change_pipeline() into a ChangeFeed event"""
+    question_id = change['documentKey']['_id']
+    document = change.get('fullDocument')
+    operation = change['operationType']
+    
+    # The pipeline's $set gives deletes a fullDocument too, but without an _id.
+    # An update can also race a delete, leaving nothing to look up.
+    if operation == 'delete' or not document or '_id' not in document:
+        return ('question', 'delete', question_id, None)
+    
+    operation = 'insert' if operation == 'insert' else 'update'
+    return ('question', operation, question_id, document)
+
+
+def is_newer_id(question_id, existing_up_to):
+    """Check whether a question _id was generated after existing_up_to, the newest _id seen before"""
+    if existing_up_to is None:
+        return True
+    return isinstance(question_id, ObjectId) and isinstance(existing_up_to, ObjectId) and question_id > existing_up_to
+
+
+class ChangeFeed:
+    """Delivers question and question rollup changes to the UI
+    
+    Two background threads watch the questions and the question_stats
+    collections with change streams. The stream pipelines only pass changes
+    to listed fields, and only the fields lists show, so a client never
+    receives whole questions. Where change streams are unavailable the
+    threads poll updated_at instead.
+    
+    Events are put on self.events as tuples for the Tk main thread to drain
+    with after():
+        ('question', operation, question_id, document)  operation is
+            'insert', 'update' or 'delete'; document is None for deletes
+        ('rollup', rollup_key, count)  count is 0 once a rollup is removed
+        ('rollups_reset',)  the rollups were rebuilt and must be reloaded
+    """
+    
+    def __init__(self, db_manager, poll_interval=CHANGE_FEED_POLL_SECONDS):
+        self.db_manager = db_manager
+        self.poll_interval = poll_interval
+        self.events = queue.Queue()
+        self.stop_event = threading.Event()
+        self.threads = []
+        self.mode = None
+        self._lock = threading.Lock()
+        self._visible_ids = []
+    
+    def start(self):
+        """Start watching both collections"""
+        self.stop_event.clear()
+        self.threads = [
+            threading.Thread(target=self._run, args=(self._watch_questions, self._poll_questions), daemon=True),
+            threading.Thread(target=self._run, args=(self._watch_rollups, self._poll_rollups), daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+    
+    def stop(self):
+        """Stop the watcher threads"""
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=2)
+        self.threads = []
+    
+    def set_visible_ids(self, question_ids):
+        """Tell the poller which questions are on screen, so it can notice their deletion"""
+        with self._lock:
+            self._visible_ids = list(question_ids)
+    
+    def _run(self, watch, poll):
+        """Watch with a change stream, falling back to polling when unsupported"""
+        resume_token = None
+        
+        while not self.stop_event.is_set():
+            try:
+                self.mode = 'change stream'
+                resume_token = watch(resume_token)
+            except OperationFailure as e:
+                if e.code not in CHANGE_STREAMS_UNSUPPORTED:
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+                self.mode = 'polling'
+                poll()
+                return
+            except PyMongoError:
+                # Transient network error; resume where the stream left off
+                self.stop_event.wait(self.poll_interval)
+    
+    def _watch_questions(self, resume_token):
+        """Forward question changes until stopped; returns the last resume token"""
+        with self.db_manager.collection.watch(
+            question_change_pipeline(),
+            full_document='updateLookup',
+            resume_after=resume_token,
+            max_await_time_ms=1000
+        ) as stream:
+            while not self.stop_event.is_set():
+                change = stream.try_next()
+                resume_token = stream.resume_token
+                if change is not None:
+                    self.events.put(question_event(change))
+        
+        return resume_token
+    
+    def _watch_rollups(self, resume_token):
+        """Forward rollup count changes until stopped; returns the last resume token"""
+        rollups = self.db_manager.question_stats.rollups
+        pipeline = [{'$project': {'operationType': 1, 'documentKey': 1, 'fullDocument.count': 1}}]
+        
+        with rollups.watch(
+            pipeline,
+            full_document='updateLookup',
+            resume_after=resume_token,
+            max_await_time_ms=1000
+        ) as stream:
+            while not self.stop_event.is_set():
+                change = stream.try_next()
+                if change is None:
+                    resume_token = stream.resume_token
+                    continue
+                
+                operation = change['operationType']
+                if operation in ('drop', 'rename', 'dropDatabase', 'invalidate'):
+                    # A rebuild replaced the collection; the stream can't be resumed
+                    self.events.put(('rollups_reset',))
+                    return None
+                
+                resume_token = stream.resume_token
+                key = rollup_key(change['documentKey']['_id'])
+                document = change.get('fullDocument') or {}
+                count = document.get('count', 0) if operation != 'delete' else 0
+                self.events.put(('rollup', key, count))
+        
+        return resume_token
+    
+    def _poll_questions(self):
+        """Poll for questions modified since the last poll
+        
+        updated_at is stamped in UTC, and questions stamped ahead of the
+        current time, such as ones written in local time by older versions,
+        are left until the clock catches up so they can't push the cursor
+        past later changes. A question is reported as inserted the first time
+        it's seen if its _id is newer than any stored when polling started.
+        """
+        collection = self.db_manager.collection
+        projection = self.db_manager.list_view_projection()
+        projection['updated_at'] = 1
+        
+        now = datetime.datetime.now(datetime.timezone.utc)
+        latest = collection.find_one({'updated_at': {'$lte': now}}, {'updated_at': 1}, sort=[('updated_at', DESCENDING)])
+        since = latest.get('updated_at') if latest else None
+        since = since or datetime.datetime.min
+        
+        newest = collection.find_one({}, {'_id': 1}, sort=[('_id', DESCENDING)])
+        existing_up_to = newest['_id'] if newest else None
+        seen_ids = set()
+        
+        while not self.stop_event.wait(self.poll_interval):
+            try:
+                now = datetime.datetime.now(datetime.timezone.utc)
+                changed = collection.find({'updated_at': {'$gt': since, '$lte': now}}, projection)
+                for doc in changed.sort('updated_at', 1):
+                    since = max(since, doc['updated_at'])
+                    
+                    question_id = doc['_id']
+                    is_new = question_id not in seen_ids and is_newer_id(question_id, existing_up_to)
+                    seen_ids.add(question_id)
+                    self.events.put(('question', 'insert' if is_new else 'update', question_id, doc))
+                
+                # Deletions leave nothing to poll for, so check the questions on screen
+                with self._lock:
+                    visible_ids = list(self._visible_ids)
+                if visible_ids:
+                    found = {doc['_id'] for doc in collection.find({'_id': {'$in': visible_ids}}, {'_id': 1})}
+                    for question_id in visible_ids:
+                        if question_id not in found:
+                            self.events.put(('question', 'delete', question_id, None))
+            except PyMongoError:
+                continue
+    
+    def _poll_rollups(self):
+        """Poll the rollups and ask for a reload whenever they changed"""
+        rollups = self.db_manager.question_stats.rollups
+        
+        def signature():
+            latest = rollups.find_one({}, {'updated_at': 1}, sort=[('updated_at', DESCENDING)])
+            return rollups.estimated_document_count(), latest.get('updated_at') if latest else None
+        
+        last_signature = signature()
+        while not self.stop_event.wait(self.poll_interval):
+            try:
+                current = signature()
+            except PyMongoError:
+                continue
+            if current != last_signature:
+                last_signature = current
+                self.events.put(('rollups_reset',))
@@ -0,0 +1,181 @@
+"""
+Shared MongoDB connection registry for MCQ Database Manager
+"""
+
+import threading
+import time
+from pymongo import MongoClient, monitoring
+from urllib.parse import quote_plus
+from utils.constants import MONGODB_CONNECTION_STRING, DEFAULT_CONNECTION_SETTINGS
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collects connection pool statistics, including checkout wait times"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+    
+    def reset(self):
+        """Reset all counters"""
+        with self._lock:
+            self.open_connections = 0
+            self.checked_out = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.total_wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+            self.pools_cleared = 0
+    
+    def get_stats(self):
+        """Get a snapshot of the pool statistics"""
+        with self._lock:
+            avg_wait = self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+            return {
+                'open_connections': self.open_connections,
+                'checked_out': self.checked_out,
+                'checkouts': self.checkouts,
+                'checkout_failures': self.checkout_failures,
+                'avg_wait_ms': round(avg_wait * 1000, 2),
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 2),
+                'pools_cleared': self.pools_cleared
+            }
+    
+    # Checkouts happen synchronously on the requesting thread, so the start
+    # time can be kept in a thread local until the connection is handed out
+    def connection_check_out_started(self, event):
+        self._local.started = time.monotonic()
+    
+    def connection_checked_out(self, event):
+        started = getattr(self._local, 'started', None)
+        wait = time.monotonic() - started if started is not None else 0.0
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.total_wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+    
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+    
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+
+
+class ConnectionRegistry:
+    """Hands out one shared MongoClient per connection string and settings"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._connect_locks = {}
+        self._indexed_collections = set()
+        self.pool_stats = PoolStatsListener()
+    
+    def get_client(self, password, settings=None):
+        """Get the shared client for password, connecting on first use"""
+        options = dict(DEFAULT_CONNECTION_SETTINGS)
+        options.update(settings or {})
+        
+        connection_string = MONGODB_CONNECTION_STRING.format(password=quote_plus(password))
+        key = (connection_string, tuple(sorted(options.items())))
+        
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                return client
+            key_lock = self._connect_locks.setdefault(key, threading.Lock())
+        
+        # Connecting can take up to the server selection timeout, so only
+        # callers for the same connection wait on it
+        with key_lock:
+            with self._lock:
+                client = self._clients.get(key)
+            if client is not None:
+                return client
+            
+            client = MongoClient(
+                connection_string,
+                maxPoolSize=options['max_pool_size'],
+                minPoolSize=options['min_pool_size'],
+                maxIdleTimeMS=options['max_idle_time_ms'],
+                serverSelectionTimeoutMS=options['server_selection_timeout_ms'],
+                compressors=options['compressors'],
+                event_listeners=[self.pool_stats]
+            )
+            
+            try:
+                client.admin.command('ping')  # Test connection
+            except Exception:
+                client.close()
+                raise
+            
+            with self._lock:
+                self._clients[key] = client
+            
+            return client
+    
+    def ensure_indexes(self, collection, index_models):
+        """Create indexes for a collection once per process in one round-trip"""
+        key = (id(collection.database.client), collection.full_name)
+        
+        with self._lock:
+            if key in self._indexed_collections:
+                return
+        
+        collection.create_indexes(index_models)
+        
+        with self._lock:
+            self._indexed_collections.add(key)
+    
+    def get_pool_stats(self):
+        """Get connection pool statistics across all shared clients"""
+        stats = self.pool_stats.get_stats()
+        
+        with self._lock:
+            stats['clients'] = len(self._clients)
+            if self._clients:
+                stats['max_pool_size'] = max(
+                    client.options.pool_options.max_pool_size for client in self._clients.values()
+                )
+        
+        return stats
+    
+    def close_all(self):
+        """Close every shared client"""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            self._indexed_collections.clear()
+
+
+# Process-wide registry shared by DatabaseManager and UserManager
+connection_registry = ConnectionRegistry()
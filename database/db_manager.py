@@ -2,34 +2,88 @@
 Database operations manager for MCQ Database
 """
 
-from pymongo import MongoClient
-from urllib.parse import quote_plus
+from pymongo import IndexModel, UpdateOne, ReplaceOne, ReturnDocument, TEXT
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from bson import ObjectId
 import datetime
-from utils.constants import MONGODB_CONNECTION_STRING, DATABASE_NAME, COLLECTION_NAME
+from utils.constants import (
+    DATABASE_NAME, COLLECTION_NAME, QUESTION_STATS_COLLECTION_NAME, QUESTION_PREVIEW_LENGTH,
+    DUPLICATE_CHECK_BATCH_SIZE, MIGRATION_BATCH_SIZE, EXPORT_BATCH_SIZE,
+    STATS_CACHE_TTL_SECONDS, NEAR_DUPLICATE_THRESHOLD
+)
+from utils.helpers import compute_fingerprint, parse_marks
+from utils.minhash import lsh_band_keys, shingles, jaccard
+from .connection import connection_registry
+from .query_cache import QueryCache
+from .question_stats import QuestionStats, ROLLUP_FIELDS, summarize_rollups
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class DuplicateQuestionError(Exception):
+    """Raised when an edit would make a question identical to another one"""
+
+# Index on the full question text, superseded by the fingerprint index
+LEGACY_QUESTION_INDEX = 'question_1_subject_1'
+
+# Relevance weights of the fields covered by the text index
+TEXT_SEARCH_WEIGHTS = {
+    'question': 10,
+    'topic': 5,
+    'classification': 3,
+    'option1': 1,
+    'option2': 1,
+    'option3': 1,
+    'option4': 1
+}
+
+# Questions stored before fingerprints existed, matched on their exact text instead
+MISSING_FINGERPRINT = {'fingerprint': {'$exists': False}}
+
+# Questions stored before some derived field existed
+MISSING_DERIVED_FIELDS = {'$or': [{'fingerprint': {'$exists': False}}, {'lsh_bands': {'$exists': False}}]}
+
+# Fields of a question handed to write listeners
+WRITE_EVENT_FIELDS = list(dict.fromkeys(ROLLUP_FIELDS + list(TEXT_SEARCH_WEIGHTS)))
+
+# Fields shown in question lists; everything else is fetched on demand
+LIST_VIEW_FIELDS = ['subject', 'topic', 'classification', 'level', 'marks', 'created_by', 'created_at']
+
+
+def derived_fields(subject, question):
+    """Compute the stored fields derived from a question's subject and text"""
+    return {
+        'fingerprint': compute_fingerprint(subject, question),
+        'lsh_bands': lsh_band_keys(subject, question)
+    }
 
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, cache_ttl=STATS_CACHE_TTL_SECONDS):
         self.mongo_client = None
         self.db = None
         self.collection = None
+        self.question_stats = None
+        # Whether some questions still lack a fingerprint, until the backfill runs
+        self.has_unfingerprinted = False
+        self.query_cache = QueryCache(cache_ttl)
+        self.write_listeners = []
     
-    def connect(self, password):
-        """Connect to MongoDB database"""
+    def connect(self, password, settings=None):
+        """Connect to MongoDB database using the shared connection pool"""
         try:
-            encoded_password = quote_plus(password)
-            connection_string = MONGODB_CONNECTION_STRING.format(password=encoded_password)
-            
-            self.mongo_client = MongoClient(connection_string, serverSelectionTimeoutMS=5000)
-            self.mongo_client.server_info()  # Test connection
+            self.mongo_client = connection_registry.get_client(password, settings)
             
             # Setup database and collection
             self.db = self.mongo_client[DATABASE_NAME]
             self.collection = self.db[COLLECTION_NAME]
+            self.question_stats = QuestionStats(self.collection, self.db[QUESTION_STATS_COLLECTION_NAME])
+            self.query_cache.clear()
             
             # Create indexes for better performance
             self.create_indexes()
+            self.question_stats.ensure()
+            self.refresh_unfingerprinted()
             
             return True, "Connected successfully"
             
@@ -38,66 +92,224 @@ class DatabaseManager:
     
     def create_indexes(self):
         """Create database indexes for better performance"""
-        if self.collection:
-            self.collection.create_index([("question", 1), ("subject", 1)])
-            self.collection.create_index("subject")
-            self.collection.create_index("topic")
-            self.collection.create_index("classification")
-            self.collection.create_index("level")
-            self.collection.create_index("created_by")
+        if self.collection is not None:
+            connection_registry.ensure_indexes(self.collection, [
+                # Sparse so documents awaiting the fingerprint backfill don't collide
+                IndexModel("fingerprint", unique=True, sparse=True),
+                # Multikey index over the LSH band keys for near-duplicate lookups
+                IndexModel("lsh_bands"),
+                IndexModel("subject"),
+                IndexModel("topic"),
+                IndexModel("classification"),
+                IndexModel("level"),
+                IndexModel("created_by"),
+                IndexModel([("created_at", -1), ("_id", -1)]),
+                # Lets clients without change streams poll for modified questions
+                IndexModel("updated_at"),
+                IndexModel(
+                    [(field, TEXT) for field in TEXT_SEARCH_WEIGHTS],
+                    weights=TEXT_SEARCH_WEIGHTS,
+                    name='question_text_search'
+                )
+            ])
+    
+    def add_write_listener(self, listener):
+        """Call listener(operation, question_id, question) after every question write
+        
+        operation is 'insert', 'update' or 'delete'. question holds at least
+        WRITE_EVENT_FIELDS as they are after the write, and is None for
+        deletes. Listeners may be called from worker threads.
+        """
+        self.write_listeners.append(listener)
+    
+    def remove_write_listener(self, listener):
+        """Stop calling a write listener"""
+        if listener in self.write_listeners:
+            self.write_listeners.remove(listener)
+    
+    def _notify_write(self, operation, question_id, question=None):
+        for listener in list(self.write_listeners):
+            listener(operation, question_id, question)
+    
+    def get_pool_stats(self):
+        """Get statistics of the shared connection pool"""
+        return connection_registry.get_pool_stats()
+    
+    def get_cache_stats(self):
+        """Get hit/miss statistics of the query cache"""
+        return self.query_cache.get_stats()
     
     def get_statistics(self):
-        """Get database statistics"""
-        if not self.collection:
+        """Get the total, per-level counts and number of subjects from the question rollups
+        
+        Results are cached until the TTL expires or a write changes them. The
+        dashboard doesn't use this; it applies live deltas to
+        get_question_rollups() instead.
+        """
+        if self.collection is None:
             return {}
         
-        stats = {
-            'total': self.collection.count_documents({}),
-            'easy': self.collection.count_documents({"level": "easy"}),
-            'medium': self.collection.count_documents({"level": "medium"}),
-            'hard': self.collection.count_documents({"level": "hard"}),
-            'subjects': len(self.collection.distinct("subject"))
-        }
-        return stats
+        def compute():
+            stats = summarize_rollups(self.question_stats.load())
+            del stats['subject_distribution']
+            return stats
+        
+        return self.query_cache.get_or_compute(('statistics',), ('level', 'subject'), compute)
+    
+    def get_question_rollups(self):
+        """Get the question counts per rollup key, for clients that apply live deltas"""
+        if self.collection is None:
+            return {}
+        return self.question_stats.load()
     
     def get_user_questions_count(self, username):
         """Get count of questions created by user"""
-        if not self.collection:
+        if self.collection is None:
             return 0
-        return self.collection.count_documents({"created_by": username})
-    
-    def get_subject_distribution(self, limit=10):
-        """Get subject distribution data"""
-        if not self.collection:
-            return []
         
-        pipeline = [
-            {"$group": {"_id": "$subject", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": limit}
-        ]
-        return list(self.collection.aggregate(pipeline))
+        return self.query_cache.get_or_compute(
+            ('user_count', username),
+            ('created_by',),
+            lambda: self.question_stats.count('created_by', username)
+        )
+    
+    def refresh_unfingerprinted(self):
+        """Check whether any stored question still lacks a fingerprint"""
+        self.has_unfingerprinted = (
+            self.collection is not None
+            and self.collection.find_one(MISSING_FINGERPRINT, {'_id': 1}) is not None
+        )
+        return self.has_unfingerprinted
     
     def check_duplicate(self, subject, question):
         """Check if question already exists"""
-        if not self.collection:
+        if self.collection is None:
             return False
         
-        existing = self.collection.find_one({
-            "subject": subject,
-            "question": question
-        })
+        query = {"fingerprint": compute_fingerprint(subject, question)}
+        if self.has_unfingerprinted:
+            query = {'$or': [query, dict(MISSING_FINGERPRINT, subject=subject, question=question)]}
+        
+        existing = self.collection.find_one(query, {"_id": 1})
         return existing is not None
     
-    def insert_questions(self, questions, username):
-        """Insert multiple questions"""
-        if not self.collection:
+    def find_existing_questions(self, pairs):
+        """Find which (subject, question) pairs already exist
+        
+        Pairs are matched by content fingerprint, so differences in case,
+        whitespace and Unicode form don't matter. Questions stored before
+        fingerprints existed are matched on their exact subject and text until
+        the backfill has run. Lookups are chunked to keep each $in query
+        small. Returns the set of existing pairs.
+        """
+        if self.collection is None:
+            return set()
+        
+        pairs_by_fingerprint = {}
+        for subject, question in pairs:
+            fingerprint = compute_fingerprint(subject, question)
+            pairs_by_fingerprint.setdefault(fingerprint, []).append((subject, question))
+        
+        existing = set()
+        fingerprints = list(pairs_by_fingerprint)
+        for start in range(0, len(fingerprints), DUPLICATE_CHECK_BATCH_SIZE):
+            chunk = fingerprints[start:start + DUPLICATE_CHECK_BATCH_SIZE]
+            cursor = self.collection.find({'fingerprint': {'$in': chunk}}, {'_id': 0, 'fingerprint': 1})
+            for doc in cursor:
+                existing.update(pairs_by_fingerprint[doc['fingerprint']])
+        
+        if self.has_unfingerprinted:
+            existing.update(self._find_unfingerprinted(
+                pair for pairs in pairs_by_fingerprint.values() for pair in pairs if pair not in existing
+            ))
+        
+        return existing
+    
+    def _find_unfingerprinted(self, pairs):
+        """Find which (subject, question) pairs exactly match a question without a fingerprint"""
+        pairs = set(pairs)
+        questions = list({question for _, question in pairs})
+        
+        found = set()
+        for start in range(0, len(questions), DUPLICATE_CHECK_BATCH_SIZE):
+            chunk = questions[start:start + DUPLICATE_CHECK_BATCH_SIZE]
+            cursor = self.collection.find(
+                dict(MISSING_FINGERPRINT, question={'$in': chunk}),
+                {'_id': 0, 'subject': 1, 'question': 1}
+            )
+            for doc in cursor:
+                pair = (doc.get('subject', ''), doc.get('question', ''))
+                if pair in pairs:
+                    found.add(pair)
+        
+        return found
+    
+    def find_near_duplicates(self, questions, threshold=NEAR_DUPLICATE_THRESHOLD):
+        """Find stored questions that are likely paraphrases of the given ones
+        
+        Candidates come from an indexed lookup of shared LSH band keys, so the
+        cost depends on the number of candidates, not the collection size.
+        Each candidate's exact word-shingle Jaccard similarity is then checked
+        against threshold; exact duplicates are left to find_existing_questions.
+        Returns {index in questions: [(similarity, stored question), ...]}
+        with the most similar first.
+        """
+        if self.collection is None:
+            return {}
+        
+        owners = {}
+        shingle_sets = []
+        fingerprints = []
+        for index, q in enumerate(questions):
+            subject, text = q.get('subject', ''), q.get('question', '')
+            shingle_sets.append(shingles(text))
+            fingerprints.append(compute_fingerprint(subject, text))
+            for key in lsh_band_keys(subject, text):
+                owners.setdefault(key, []).append(index)
+        
+        matches = {}
+        compared = set()
+        keys = list(owners)
+        for start in range(0, len(keys), DUPLICATE_CHECK_BATCH_SIZE):
+            chunk = keys[start:start + DUPLICATE_CHECK_BATCH_SIZE]
+            cursor = self.collection.find(
+                {'lsh_bands': {'$in': chunk}},
+                {'subject': 1, 'question': 1, 'fingerprint': 1, 'lsh_bands': 1}
+            )
+            for doc in cursor:
+                stored_shingles = None
+                for index in {i for key in doc.get('lsh_bands', []) for i in owners.get(key, ())}:
+                    if (index, doc['_id']) in compared or doc.get('fingerprint') == fingerprints[index]:
+                        continue
+                    compared.add((index, doc['_id']))
+                    
+                    if stored_shingles is None:
+                        stored_shingles = shingles(doc.get('question', ''))
+                    similarity = jaccard(shingle_sets[index], stored_shingles)
+                    if similarity >= threshold:
+                        matches.setdefault(index, []).append((similarity, doc))
+        
+        for found in matches.values():
+            found.sort(key=lambda match: match[0], reverse=True)
+        return matches
+    
+    def insert_questions(self, questions, username, inserted=None):
+        """Insert multiple questions
+        
+        Questions whose fingerprint already exists are skipped by the unique
+        index, and so are exact copies of questions stored before fingerprints
+        existed; the number of questions actually inserted is returned.
+        inserted, if given, is a list extended in place with the inserted
+        questions.
+        """
+        if self.collection is None:
             raise Exception("Database not connected")
         
         # Add metadata to each question
         for q in questions:
             q['created_at'] = datetime.datetime.now()
-            q['updated_at'] = datetime.datetime.now()
+            # Pollers compare updated_at across clients, so it is stamped in UTC
+            q['updated_at'] = datetime.datetime.now(datetime.timezone.utc)
             
             # Ensure created_by field exists
             if 'created_by' not in q:
@@ -108,41 +320,417 @@ class DatabaseManager:
                 q['topic'] = q['topic'][0] if q['topic'] else ''
             if isinstance(q.get('classification'), list):
                 q['classification'] = q['classification'][0] if q['classification'] else ''
+            
+            # Store levels and marks the way statistics and filters expect them
+            if isinstance(q.get('level'), str):
+                q['level'] = q['level'].strip().lower()
+            if 'marks' in q and parse_marks(q['marks']) is not None:
+                q['marks'] = parse_marks(q['marks'])
+            
+            q.update(derived_fields(q.get('subject', ''), q.get('question', '')))
+        
+        # The unique index can't see questions that have no fingerprint yet
+        if self.has_unfingerprinted:
+            existing = self._find_unfingerprinted((q.get('subject', ''), q.get('question', '')) for q in questions)
+            if existing:
+                questions = [q for q in questions if (q.get('subject', ''), q.get('question', '')) not in existing]
         
         # Insert questions
-        result = self.collection.insert_many(questions)
-        return len(result.inserted_ids)
+        inserted_documents, _ = self._insert_unordered(questions)
+        if inserted is not None:
+            inserted.extend(inserted_documents)
+        return len(inserted_documents)
+    
+    def _insert_unordered(self, documents):
+        """Insert documents with an unordered bulk write
+        
+        Duplicate-key errors are collected instead of raised, and the inserted
+        documents are added to the question rollups. Returns the inserted
+        documents and the indexes of the duplicates.
+        """
+        if not documents:
+            return [], []
+        
+        try:
+            self.collection.insert_many(documents, ordered=False)
+            duplicate_indexes = []
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            if any(error.get('code') != DUPLICATE_KEY_ERROR for error in write_errors) \
+                    or e.details.get('writeConcernErrors'):
+                raise
+            
+            duplicate_indexes = [error['index'] for error in write_errors]
+        finally:
+            self.query_cache.invalidate()
+        
+        skipped = set(duplicate_indexes)
+        inserted_documents = [doc for index, doc in enumerate(documents) if index not in skipped]
+        self.question_stats.record_insert(inserted_documents)
+        for doc in inserted_documents:
+            self._notify_write('insert', doc['_id'], doc)
+        
+        return inserted_documents, duplicate_indexes
     
     def find_questions(self, query, sort_by='created_at', sort_order=-1):
         """Find questions with query"""
-        if not self.collection:
+        if self.collection is None:
             return []
         
         return list(self.collection.find(query).sort(sort_by, sort_order))
     
+    def iter_questions(self, query=None, fields=None, batch_size=EXPORT_BATCH_SIZE):
+        """Iterate over questions with a cursor instead of loading them all
+        
+        With fields, only those fields are fetched. Documents are pulled from
+        the server batch_size at a time as the cursor is consumed.
+        """
+        if self.collection is None:
+            return iter(())
+        
+        projection = None
+        if fields is not None:
+            projection = {field: 1 for field in fields}
+            if '_id' not in fields:
+                projection['_id'] = 0
+        
+        return self.collection.find(query or {}, projection, batch_size=batch_size)
+    
+    def find_questions_page(self, query, limit, after=None, before=None, list_view=False, max_time_ms=None):
+        """Find one page of questions using a (created_at, _id) keyset cursor
+        
+        Results are ordered newest first. Pass the last question of the current
+        page as ``after`` to get the next page, or the first question as
+        ``before`` to get the previous one. Returns (questions, has_more), where
+        has_more tells whether another page exists in the requested direction.
+        With list_view, only the list columns and a question preview are returned.
+        max_time_ms aborts slow queries with ExecutionTimeout.
+        """
+        if self.collection is None:
+            return [], False
+        
+        conditions = [query] if query else []
+        if after is not None:
+            conditions.append(self._keyset_condition(after, '$lt'))
+        elif before is not None:
+            conditions.append(self._keyset_condition(before, '$gt'))
+        
+        page_query = {'$and': conditions} if len(conditions) > 1 else (conditions[0] if conditions else {})
+        
+        # Walk backwards from the cursor when paging to the previous page
+        direction = 1 if before is not None and after is None else -1
+        projection = self.list_view_projection() if list_view else None
+        cursor = self.collection.find(page_query, projection).sort(
+            [('created_at', direction), ('_id', direction)]
+        ).limit(limit + 1)
+        if max_time_ms is not None:
+            cursor = cursor.max_time_ms(max_time_ms)
+        
+        questions = list(cursor)
+        has_more = len(questions) > limit
+        questions = questions[:limit]
+        
+        if direction == 1:
+            questions.reverse()
+        
+        return questions, has_more
+    
+    def search_questions_page(self, query, page, limit, list_view=False, max_time_ms=None):
+        """Fetch one page of a $text search ranked by relevance
+        
+        Relevance isn't a stored field, so ranked results are paged with skip
+        rather than a keyset. Returns the questions and whether more follow.
+        """
+        if self.collection is None:
+            return [], False
+        
+        projection = self.list_view_projection() if list_view else {}
+        projection['score'] = {'$meta': 'textScore'}
+        
+        cursor = (
+            self.collection.find(query, projection)
+            .sort([('score', {'$meta': 'textScore'}), ('_id', -1)])
+            .skip(page * limit)
+            .limit(limit + 1)
+        )
+        if max_time_ms is not None:
+            cursor = cursor.max_time_ms(max_time_ms)
+        
+        questions = list(cursor)
+        return questions[:limit], len(questions) > limit
+    
+    def _keyset_condition(self, question, operator):
+        """Build the query clause that continues after/before a question"""
+        created_at = question.get('created_at')
+        question_id = question.get('_id')
+        if isinstance(question_id, str):
+            question_id = ObjectId(question_id)
+        
+        return {
+            '$or': [
+                {'created_at': {operator: created_at}},
+                {'created_at': created_at, '_id': {operator: question_id}}
+            ]
+        }
+    
+    def list_view_projection(self):
+        """Projection for list views with the question text truncated server-side"""
+        projection = {field: 1 for field in LIST_VIEW_FIELDS}
+        # One extra character lets the client tell whether the text was cut
+        projection['question'] = {'$substrCP': ['$question', 0, QUESTION_PREVIEW_LENGTH + 1]}
+        return projection
+    
+    def get_question(self, question_id):
+        """Get the full document of a single question"""
+        if self.collection is None:
+            return None
+        
+        return self.collection.find_one({'_id': ObjectId(question_id)})
+    
+    def get_questions_by_ids(self, question_ids, list_view=False):
+        """Get full documents for several questions, in the order of question_ids
+        
+        With list_view, only the list columns and a question preview are returned.
+        """
+        if self.collection is None or not question_ids:
+            return []
+        
+        object_ids = [ObjectId(question_id) for question_id in question_ids]
+        projection = self.list_view_projection() if list_view else None
+        questions = {q['_id']: q for q in self.collection.find({'_id': {'$in': object_ids}}, projection)}
+        return [questions[oid] for oid in object_ids if oid in questions]
+    
+    def count_questions(self, query, limit=None, max_time_ms=None):
+        """Count questions matching query
+        
+        With limit, counting stops there, so callers can show "limit+" cheaply.
+        max_time_ms aborts slow counts with ExecutionTimeout.
+        """
+        if self.collection is None:
+            return 0
+        
+        options = {}
+        if limit is not None:
+            options['limit'] = limit
+        if max_time_ms is not None:
+            options['maxTimeMS'] = max_time_ms
+        
+        if not query and not options:
+            return self.collection.estimated_document_count()
+        return self.collection.count_documents(query, **options)
+    
     def update_question(self, question_id, updates):
-        """Update a question"""
-        if not self.collection:
+        """Update a question
+        
+        Returns the question as it was before the update, or None if it
+        doesn't exist. Only cached aggregates over fields whose value actually
+        changed are invalidated. Raises DuplicateQuestionError if the edited
+        question's fingerprint matches another question.
+        """
+        if self.collection is None:
             raise Exception("Database not connected")
         
-        updates['updated_at'] = datetime.datetime.now()
+        updates['updated_at'] = datetime.datetime.now(datetime.timezone.utc)
         
-        return self.collection.update_one(
-            {'_id': ObjectId(question_id)},
-            {'$set': updates}
-        )
+        # Keep the fingerprint and LSH bands in sync with the subject and question text
+        current = {}
+        if 'subject' in updates or 'question' in updates:
+            if 'subject' not in updates or 'question' not in updates:
+                current = self.collection.find_one(
+                    {'_id': ObjectId(question_id)},
+                    {'subject': 1, 'question': 1}
+                ) or {}
+            
+            updates.update(derived_fields(
+                updates.get('subject', current.get('subject', '')),
+                updates.get('question', current.get('question', ''))
+            ))
+        
+        try:
+            previous = self.collection.find_one_and_update(
+                {'_id': ObjectId(question_id)},
+                {'$set': updates},
+                projection={field: 1 for field in WRITE_EVENT_FIELDS},
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            subject = updates.get('subject') or current.get('subject', '')
+            raise DuplicateQuestionError(f"An identical question already exists in {subject}")
+        
+        if previous is not None:
+            updated = dict(previous, **updates)
+            changed = [field for field in ROLLUP_FIELDS
+                       if field in updates and updates[field] != previous.get(field)]
+            if changed:
+                self.query_cache.invalidate(changed)
+                self.question_stats.record_update(previous, updated)
+            self._notify_write('update', previous['_id'], updated)
+        
+        return previous
     
     def delete_question(self, question_id):
         """Delete a question"""
-        if not self.collection:
+        if self.collection is None:
             raise Exception("Database not connected")
         
-        result = self.collection.delete_one({'_id': ObjectId(question_id)})
-        return result.deleted_count > 0
+        deleted = self.collection.find_one_and_delete(
+            {'_id': ObjectId(question_id)},
+            projection={field: 1 for field in ROLLUP_FIELDS}
+        )
+        if deleted is None:
+            return False
+        
+        self.query_cache.invalidate()
+        self.question_stats.record_delete(deleted)
+        self._notify_write('delete', deleted['_id'])
+        return True
     
     def get_distinct_values(self, field):
         """Get distinct values for a field"""
-        if not self.collection:
+        if self.collection is None:
             return []
         
-        return self.collection.distinct(field)
\ No newline at end of file
+        if field in ROLLUP_FIELDS:
+            compute = lambda: self.question_stats.distinct(field)
+        else:
+            compute = lambda: self.collection.distinct(field)
+        
+        return self.query_cache.get_or_compute(('distinct', field), (field,), compute)
+    
+    def rebuild_question_stats(self):
+        """Recompute the question rollups from scratch; returns the number of rollups"""
+        if self.collection is None:
+            raise Exception("Database not connected")
+        
+        try:
+            return self.question_stats.rebuild()
+        finally:
+            self.query_cache.invalidate()
+    
+    def verify_question_stats(self):
+        """Get the question rollups whose counts have drifted from the questions"""
+        if self.collection is None:
+            raise Exception("Database not connected")
+        
+        return self.question_stats.verify()
+    
+    def count_missing_fingerprints(self):
+        """Count questions that still need a fingerprint or LSH bands"""
+        if self.collection is None:
+            return 0
+        
+        return self.collection.count_documents(MISSING_DERIVED_FIELDS)
+    
+    def backfill_fingerprints(self, batch_size=MIGRATION_BATCH_SIZE, progress_callback=None, cancel_event=None):
+        """Add fingerprints and LSH band keys to existing questions in batches
+        
+        Walks the questions missing either field in _id order, so an interrupted
+        run can simply be started again. Questions whose fingerprint collides
+        with another question are normalized duplicates; they are left without
+        derived fields and counted as conflicts. Once every question has a
+        fingerprint, the legacy full-text (question, subject) index is dropped.
+        Stops between batches once cancel_event is set.
+        """
+        if self.collection is None:
+            raise Exception("Database not connected")
+        
+        updated = 0
+        conflicts = 0
+        last_id = None
+        
+        while cancel_event is None or not cancel_event.is_set():
+            query = dict(MISSING_DERIVED_FIELDS)
+            if last_id is not None:
+                query['_id'] = {'$gt': last_id}
+            
+            batch = list(
+                self.collection.find(query, {'subject': 1, 'question': 1})
+                .sort('_id', 1)
+                .limit(batch_size)
+            )
+            if not batch:
+                break
+            
+            operations = [
+                UpdateOne(
+                    {'_id': doc['_id']},
+                    {'$set': derived_fields(doc.get('subject', ''), doc.get('question', ''))}
+                )
+                for doc in batch
+            ]
+            
+            try:
+                result = self.collection.bulk_write(operations, ordered=False)
+                updated += result.modified_count
+            except BulkWriteError as e:
+                write_errors = e.details.get('writeErrors', [])
+                if any(error.get('code') != DUPLICATE_KEY_ERROR for error in write_errors):
+                    raise
+                updated += e.details.get('nModified', 0)
+                conflicts += len(write_errors)
+            
+            last_id = batch[-1]['_id']
+            
+            if progress_callback:
+                progress_callback(updated, conflicts)
+        
+        if not self.refresh_unfingerprinted() and LEGACY_QUESTION_INDEX in self.collection.index_information():
+            self.collection.drop_index(LEGACY_QUESTION_INDEX)
+        
+        return {'updated': updated, 'conflicts': conflicts}
+    
+    def prepare_restored_question(self, question):
+        """Turn a question read from a backup file back into a database document"""
+        question_id = question.get('_id')
+        if isinstance(question_id, str) and ObjectId.is_valid(question_id):
+            question['_id'] = ObjectId(question_id)
+        elif question_id is None:
+            question['_id'] = ObjectId()
+        
+        for field in ('created_at', 'updated_at'):
+            value = question.get(field)
+            if isinstance(value, str):
+                try:
+                    question[field] = datetime.datetime.fromisoformat(value)
+                except ValueError:
+                    pass
+        
+        if not question.get('fingerprint') or not question.get('lsh_bands'):
+            question.update(derived_fields(question.get('subject', ''), question.get('question', '')))
+        
+        return question
+    
+    def restore_questions(self, questions):
+        """Upsert restored questions keyed by _id with one unordered bulk write
+        
+        Re-running a batch is harmless, which makes restores resumable. Returns
+        the number of questions written and the number rejected because an
+        identical question with a different _id already exists. Replacements
+        don't maintain the question rollups; rebuild them after restoring.
+        """
+        if self.collection is None:
+            raise Exception("Database not connected")
+        
+        if not questions:
+            return 0, 0
+        
+        operations = [ReplaceOne({'_id': q['_id']}, q, upsert=True) for q in questions]
+        
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            written, rejected = result.matched_count + result.upserted_count, []
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            if any(error.get('code') != DUPLICATE_KEY_ERROR for error in write_errors):
+                raise
+            written = e.details.get('nMatched', 0) + e.details.get('nUpserted', 0)
+            rejected = [error['index'] for error in write_errors]
+        finally:
+            self.query_cache.invalidate()
+        
+        skipped = set(rejected)
+        for index, q in enumerate(questions):
+            if index not in skipped:
+                self._notify_write('update', q['_id'], q)
+        
+        return written, len(rejected)
\ No newline at end of file
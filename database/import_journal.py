@@ -0,0 +1,155 @@
+"""
+Resumable import journals for MCQ Database Manager
+"""
+
+import hashlib
+import json
+import os
+from utils.constants import IMPORT_JOURNAL_DIR
+from utils.helpers import compute_fingerprint
+
+
+class ImportJournal:
+    """Append-only local record of the batches an import has committed
+    
+    The first line identifies the import source; every later line records
+    one committed batch: the number of input rows consumed through that
+    batch and the fingerprints of the questions it wrote. Each line is
+    flushed to disk before the next batch starts, so after a dropped
+    connection or a crash the import can resume after its last committed
+    batch and skip questions it already wrote without querying the
+    database. A line torn by a crash is ignored.
+    
+    Journals live in IMPORT_JOURNAL_DIR. If one can't be written, the
+    import carries on without it; self.error then says why it can't be
+    resumed.
+    """
+    
+    def __init__(self, path, signature):
+        self.path = path
+        self.signature = signature
+        self.offset = 0
+        self.fingerprints = set()
+        self.started = False
+        self.error = None
+    
+    @classmethod
+    def for_file(cls, filename):
+        """Journal of importing a file, keyed by its path and tied to its size and mtime
+        
+        The file's own folder may be read-only, so the journal is kept in
+        IMPORT_JOURNAL_DIR like those of processed questions.
+        """
+        source = os.path.abspath(filename)
+        stat = os.stat(filename)
+        signature = {
+            'source': source,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime
+        }
+        digest = hashlib.blake2b(source.encode('utf-8'), digest_size=16).hexdigest()
+        return cls(os.path.join(IMPORT_JOURNAL_DIR, 'file-' + digest + '.jsonl'), signature)
+    
+    @classmethod
+    def for_questions(cls, questions):
+        """Journal of saving a list of questions, identified by their content"""
+        digest = hashlib.blake2b(digest_size=16)
+        for q in questions:
+            digest.update(compute_fingerprint(q.get('subject', ''), q.get('question', '')).encode('ascii'))
+        signature = {'source': 'questions', 'digest': digest.hexdigest(), 'count': len(questions)}
+        return cls(os.path.join(IMPORT_JOURNAL_DIR, digest.hexdigest() + '.jsonl'), signature)
+    
+    def load(self):
+        """Read what an earlier run committed; returns the number of rows to skip
+        
+        A journal written for a different or changed source is ignored.
+        """
+        self.offset = 0
+        self.fingerprints = set()
+        self.started = False
+        self.error = None
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return 0
+        
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+        
+        if not entries or entries[0].get('journal') != self.signature:
+            return 0
+        
+        if len(entries) < len(lines):
+            # Drop the torn line so later commits don't append to it
+            temp_file = self.path + '.tmp'
+            try:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    for entry in entries:
+                        self._append(f, entry)
+                os.replace(temp_file, self.path)
+            except OSError as e:
+                self.error = str(e)
+        
+        for entry in entries[1:]:
+            self.offset = max(self.offset, entry.get('offset', 0))
+            self.fingerprints.update(entry.get('fingerprints', []))
+        self.started = True
+        return self.offset
+    
+    def _append(self, f, record):
+        f.write(json.dumps(record) + '\n')
+    
+    def commit(self, offset, questions):
+        """Durably record a written batch: rows consumed through it and its questions
+        
+        A journal that can't be written is given up, leaving the error in
+        self.error, so the import itself goes on. Returns whether the batch
+        was recorded.
+        """
+        if self.error is not None:
+            return False
+        
+        fingerprints = [
+            q.get('fingerprint') or compute_fingerprint(q.get('subject', ''), q.get('question', ''))
+            for q in questions
+        ]
+        
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            with open(self.path, 'a' if self.started else 'w', encoding='utf-8') as f:
+                if not self.started:
+                    self._append(f, {'journal': self.signature})
+                self._append(f, {'offset': offset, 'fingerprints': fingerprints})
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            self.error = str(e)
+            return False
+        
+        self.started = True
+        self.offset = offset
+        self.fingerprints.update(fingerprints)
+        return True
+    
+    def is_written(self, question):
+        """Check whether an earlier run already wrote a question"""
+        return compute_fingerprint(question.get('subject', ''), question.get('question', '')) in self.fingerprints
+    
+    def discard(self):
+        """Remove the journal after a complete import"""
+        self.offset = 0
+        self.fingerprints = set()
+        self.started = False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
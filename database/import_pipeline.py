@@ -0,0 +1,290 @@
+"""
+Staged background import pipeline for MCQ Database Manager
+"""
+
+import queue
+import threading
+from utils.constants import IMPORT_PIPELINE_BATCH_SIZE, IMPORT_PIPELINE_QUEUE_SIZE, NEAR_DUPLICATE_THRESHOLD
+from utils.helpers import validate_question, dedupe_questions
+from utils.json_stream import JSONStreamParser
+
+# Marks the end of a stage's output
+_END = object()
+
+# Seconds a stage waits on a queue before checking for cancellation again
+_WAIT_SECONDS = 0.1
+
+
+class ImportPipeline:
+    """Imports questions through parse → validate → dedupe → insert stages
+    
+    Each stage runs on its own worker thread and hands batches to the next
+    one through a small bounded queue, so parsing a large input overlaps
+    with the database round-trips of earlier batches. Without insert the
+    last stage only collects the questions that would be inserted, for a
+    preview.
+    
+    Results are put on self.events as tuples for the Tk main thread to
+    drain with after():
+        ('progress', report)  a snapshot of the report counters
+        ('invalid', [(question number, message), ...])
+        ('repeated', [question, ...])  repeats within the input
+        ('duplicates', [question, ...])  already stored
+        ('paraphrases', [(question, similarity, stored question), ...])
+        ('accepted', [question, ...])  new questions, without insert
+        ('done', report, error)  always last; error is None on success
+    
+    cancel() stops every stage at its next batch boundary.
+    """
+    
+    def __init__(self, db_manager, username, open_stream=None, questions=None, insert=False,
+                 user_manager=None, near_duplicate_threshold=NEAR_DUPLICATE_THRESHOLD,
+                 batch_size=IMPORT_PIPELINE_BATCH_SIZE, journal=None):
+        """Import from a text stream returned by open_stream, or from a list of questions
+        
+        With an ImportJournal, inserted batches are journaled and the input
+        an earlier run committed is skipped without querying the database.
+        """
+        self.db_manager = db_manager
+        self.journal = journal
+        if journal is not None:
+            journal.load()
+        self.username = username
+        self.user_manager = user_manager
+        self.open_stream = open_stream
+        self.questions = questions
+        self.insert = insert
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.batch_size = batch_size
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.threads = []
+        self.error = None
+        self.meta = {}
+        self.report = {
+            'read': 0,
+            'total': len(questions) if questions is not None else None,
+            'position': 0,
+            'size': None,
+            'invalid': 0,
+            'repeated': 0,
+            'duplicates': 0,
+            'paraphrases': 0,
+            'new': 0,
+            'imported': 0,
+            'resumed': 0,
+            'warning': None,
+            'topic_subjects': {},
+            'classification_subjects': {}
+        }
+    
+    def start(self):
+        """Start the stage threads"""
+        parsed, validated, deduped = (queue.Queue(IMPORT_PIPELINE_QUEUE_SIZE) for _ in range(3))
+        stages = [
+            (self._parse, (parsed,)),
+            (self._validate, (parsed, validated)),
+            (self._dedupe, (validated, deduped)),
+            (self._store, (deduped,))
+        ]
+        self.threads = [
+            threading.Thread(target=self._run_stage, args=(stage, args), daemon=True)
+            for stage, args in stages[:-1]
+        ]
+        self.threads.append(threading.Thread(target=self._run_last_stage, args=stages[-1], daemon=True))
+        for thread in self.threads:
+            thread.start()
+    
+    def cancel(self):
+        """Stop the import at the next batch boundary"""
+        self.cancel_event.set()
+        self.stop_event.set()
+    
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+    
+    def _run_stage(self, stage, args):
+        try:
+            stage(*args)
+        except Exception as e:
+            # The first failure stops every stage
+            if self.error is None:
+                self.error = e
+            self.stop_event.set()
+    
+    def _run_last_stage(self, stage, args):
+        self._run_stage(stage, args)
+        if self.journal is not None and self.error is None and not self.cancelled:
+            self.journal.discard()
+        
+        # Let the other stages wind down before reporting the outcome
+        self.stop_event.set()
+        for thread in self.threads[:-1]:
+            thread.join()
+        self.events.put(('done', dict(self.report), self.error))
+    
+    def _put(self, out, item):
+        """Hand item to the next stage; returns False once the pipeline is stopping"""
+        while not self.stop_event.is_set():
+            try:
+                out.put(item, timeout=_WAIT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _batches(self, source):
+        """Yield the batches of the previous stage until it ends or the pipeline stops"""
+        while not self.stop_event.is_set():
+            try:
+                batch = source.get(timeout=_WAIT_SECONDS)
+            except queue.Empty:
+                continue
+            if batch is _END:
+                return
+            yield batch
+    
+    def _progress(self):
+        self.events.put(('progress', dict(self.report)))
+    
+    def _iter_source(self):
+        """Yield the input questions, streaming and leniently parsing a text source"""
+        if self.questions is not None:
+            yield from self.questions
+            return
+        
+        with self.open_stream() as fp:
+            # Track how far into the input parsing is, for the progress bar
+            raw = getattr(fp, 'buffer', fp)
+            try:
+                raw.seek(0, 2)
+                self.report['size'] = raw.tell()
+                raw.seek(0)
+            except (OSError, ValueError):
+                raw = None
+            
+            parser = JSONStreamParser(fp, lenient=True)
+            for q in parser.iter_array('questions', self.meta):
+                if raw is not None:
+                    self.report['position'] = raw.tell()
+                yield q
+            
+            if parser.error:
+                self.report['warning'] = (
+                    f"Input ended early or is malformed after {self.report['read']} questions ({parser.error})"
+                )
+    
+    def _parse(self, out):
+        """Stage 1: read questions from the source in batches"""
+        batch = []
+        for q in self._iter_source():
+            if self.stop_event.is_set():
+                return
+            if not isinstance(q, dict):
+                continue
+            
+            self.report['read'] += 1
+            if self.journal is not None and self.report['read'] <= self.journal.offset:
+                self.report['resumed'] += 1
+                continue
+            
+            subject = q.get('subject', '')
+            if subject:
+                self.report['topic_subjects'].setdefault(q.get('topic'), subject)
+                self.report['classification_subjects'].setdefault(q.get('classification'), subject)
+            
+            batch.append((self.report['read'], q))
+            if len(batch) >= self.batch_size:
+                if not self._put(out, (self.report['read'], batch)):
+                    return
+                self._progress()
+                batch = []
+        
+        if batch and not self._put(out, (self.report['read'], batch)):
+            return
+        self._progress()
+        self._put(out, _END)
+    
+    def _validate(self, source, out):
+        """Stage 2: drop questions missing required fields"""
+        for end, batch in self._batches(source):
+            valid = []
+            invalid = []
+            for number, q in batch:
+                is_valid, message = validate_question(q)
+                if is_valid:
+                    valid.append(q)
+                else:
+                    invalid.append((number, message))
+            
+            if invalid:
+                self.report['invalid'] += len(invalid)
+                self.events.put(('invalid', invalid))
+            if not self._put(out, (end, valid)):
+                return
+        
+        self._put(out, _END)
+    
+    def _dedupe(self, source, out):
+        """Stage 3: drop repeats within the input and questions already stored"""
+        seen = set()
+        
+        for end, batch in self._batches(source):
+            if self.journal is not None:
+                # Written by an earlier run of this import; no need to ask the database
+                before = len(batch)
+                batch = [q for q in batch if not self.journal.is_written(q)]
+                self.report['resumed'] += before - len(batch)
+            
+            unique, repeated = dedupe_questions(batch, seen)
+            if repeated:
+                self.report['repeated'] += len(repeated)
+                self.events.put(('repeated', repeated))
+            
+            if self.db_manager.collection is not None:
+                existing = self.db_manager.find_existing_questions(
+                    (q.get('subject', ''), q.get('question', '')) for q in unique
+                )
+                duplicates = [q for q in unique if (q.get('subject', ''), q.get('question', '')) in existing]
+                unique = [q for q in unique if (q.get('subject', ''), q.get('question', '')) not in existing]
+                
+                if duplicates:
+                    self.report['duplicates'] += len(duplicates)
+                    self.events.put(('duplicates', duplicates))
+                
+                # Reworded versions of stored questions are reported, not dropped
+                if not self.insert:
+                    paraphrases = self.db_manager.find_near_duplicates(unique, self.near_duplicate_threshold)
+                    if paraphrases:
+                        self.report['paraphrases'] += len(paraphrases)
+                        self.events.put(('paraphrases', [
+                            (unique[index], *found[0]) for index, found in sorted(paraphrases.items())
+                        ]))
+            
+            if not self._put(out, (end, unique)):
+                return
+        
+        self._put(out, _END)
+    
+    def _store(self, source):
+        """Stage 4: insert the new questions, or collect them for a preview"""
+        for end, batch in self._batches(source):
+            self.report['new'] += len(batch)
+            
+            if not self.insert:
+                if batch:
+                    self.events.put(('accepted', batch))
+            elif batch:
+                count = self.db_manager.insert_questions(batch, self.username)
+                self.report['imported'] += count
+                
+                # Update user's question count
+                if self.user_manager is not None and self.user_manager.collection is not None:
+                    self.user_manager.update_questions_created(self.username, count)
+            
+            if self.insert and self.journal is not None:
+                self.journal.commit(end, batch)
+            
+            self._progress()
@@ -0,0 +1,75 @@
+"""
+Write-invalidated cache for aggregate queries
+"""
+
+import threading
+import time
+
+# Dependency that changes whenever questions are inserted or deleted
+ALL_DOCUMENTS = '*'
+
+
+class QueryCache:
+    """TTL cache whose entries are also invalidated by write generations
+    
+    Every cached value declares the question fields it depends on. Writes
+    bump the generation of the fields they change (or of ALL_DOCUMENTS for
+    inserts and deletes), so only the entries that depend on those fields
+    are recomputed on their next read. Cached values are shared and must be
+    treated as read-only.
+    """
+    
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._generations = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def _snapshot(self, dependencies):
+        return tuple(self._generations.get(field, 0) for field in (ALL_DOCUMENTS,) + tuple(dependencies))
+    
+    def get_or_compute(self, key, dependencies, compute):
+        """Return the cached value for key, computing it when missing or stale"""
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            snapshot = self._snapshot(dependencies)
+            if entry and entry[1] > now and entry[2] == snapshot:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        
+        value = compute()
+        
+        with self._lock:
+            # Only keep the value if no write happened while computing it
+            if self._snapshot(dependencies) == snapshot:
+                self._entries[key] = (value, now + self.ttl_seconds, snapshot)
+        
+        return value
+    
+    def invalidate(self, fields=None):
+        """Bump the generation of changed fields; None means documents were added or removed"""
+        with self._lock:
+            for field in fields if fields is not None else (ALL_DOCUMENTS,):
+                self._generations[field] = self._generations.get(field, 0) + 1
+    
+    def clear(self):
+        """Drop every cached value"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self):
+        """Get hit/miss counters for tuning the TTL"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'ttl_seconds': self.ttl_seconds
+            }
@@ -0,0 +1,169 @@
+"""
+Incrementally maintained question counters for MCQ Database Manager
+"""
+
+import datetime
+from collections import Counter
+from pymongo import UpdateOne
+
+# Questions are counted per combination of these fields
+ROLLUP_FIELDS = ['subject', 'topic', 'classification', 'level', 'created_by']
+
+
+def rollup_key(question):
+    """Get the rollup key of a question as a tuple of ROLLUP_FIELDS values"""
+    return tuple(question.get(field) for field in ROLLUP_FIELDS)
+
+
+def summarize_rollups(counts, username=None, top_n=10):
+    """Compute the dashboard statistics from a {rollup key: count} mapping
+    
+    Returns the total, per-level counts, number of subjects, the top_n
+    subjects by question count and, with a username, that user's count.
+    """
+    level_index = ROLLUP_FIELDS.index('level')
+    subject_index = ROLLUP_FIELDS.index('subject')
+    creator_index = ROLLUP_FIELDS.index('created_by')
+    
+    levels = Counter()
+    subjects = Counter()
+    mine = 0
+    for key, count in counts.items():
+        levels[key[level_index]] += count
+        subjects[key[subject_index]] += count
+        if key[creator_index] == username:
+            mine += count
+    
+    subjects = [{'_id': subject, 'count': count} for subject, count in subjects.most_common() if count > 0]
+    
+    stats = {
+        'total': sum(counts.values()),
+        'easy': levels['easy'],
+        'medium': levels['medium'],
+        'hard': levels['hard'],
+        'subjects': len(subjects),
+        'subject_distribution': subjects[:top_n]
+    }
+    if username is not None:
+        stats['my_questions'] = mine
+    
+    return stats
+
+
+class QuestionStats:
+    """Question counts kept in a small rollup collection
+    
+    Each rollup document counts the questions sharing one combination of
+    ROLLUP_FIELDS, so dashboard numbers are summed over a few hundred
+    documents instead of scanning every question. Writers apply +1/-1
+    deltas as they change questions; rebuild() recomputes everything from
+    the questions collection to repair drift.
+    """
+    
+    def __init__(self, questions, rollups):
+        self.questions = questions
+        self.rollups = rollups
+    
+    def _rollup_id(self, key):
+        return dict(zip(ROLLUP_FIELDS, key))
+    
+    def apply(self, deltas):
+        """Apply a mapping of {rollup key: count delta} with one bulk write"""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        
+        now = datetime.datetime.now()
+        operations = [
+            UpdateOne(
+                {'_id': self._rollup_id(key)},
+                {'$inc': {'count': delta}, '$set': {'updated_at': now}},
+                upsert=True
+            )
+            for key, delta in deltas.items()
+        ]
+        self.rollups.bulk_write(operations, ordered=False)
+        
+        # Drop combinations that no longer have any questions
+        emptied = [self._rollup_id(key) for key, delta in deltas.items() if delta < 0]
+        if emptied:
+            self.rollups.delete_many({'_id': {'$in': emptied}, 'count': {'$lte': 0}})
+    
+    def record_insert(self, questions):
+        """Count newly inserted questions"""
+        self.apply(Counter(rollup_key(q) for q in questions))
+    
+    def record_update(self, before, after):
+        """Move a question between rollups when its key fields changed"""
+        old_key, new_key = rollup_key(before), rollup_key(after)
+        if old_key != new_key:
+            self.apply({old_key: -1, new_key: 1})
+    
+    def record_delete(self, question):
+        """Uncount a deleted question"""
+        self.apply({rollup_key(question): -1})
+    
+    def _group_pipeline(self):
+        """Pipeline computing the rollups from the questions collection"""
+        return [{
+            '$group': {
+                '_id': {field: {'$ifNull': ['$' + field, None]} for field in ROLLUP_FIELDS},
+                'count': {'$sum': 1}
+            }
+        }]
+    
+    def rebuild(self):
+        """Recompute every rollup from the questions; returns the number of rollups
+        
+        $out replaces the rollup collection atomically once the aggregation
+        has finished, so readers never see a half-built collection.
+        """
+        pipeline = self._group_pipeline() + [
+            {'$set': {'updated_at': '$$NOW'}},
+            {'$out': self.rollups.name}
+        ]
+        self.questions.aggregate(pipeline, allowDiskUse=True)
+        return self.rollups.estimated_document_count()
+    
+    def verify(self):
+        """Compare the rollups with the questions collection
+        
+        Returns a list of drifted rollups as dicts with the rollup key and the
+        expected and actual counts; an empty list means the rollups are exact.
+        """
+        expected = {
+            rollup_key(doc['_id']): doc['count']
+            for doc in self.questions.aggregate(self._group_pipeline(), allowDiskUse=True)
+        }
+        actual = self.load()
+        
+        drift = []
+        for key in expected.keys() | actual.keys():
+            if expected.get(key, 0) != actual.get(key, 0):
+                drift.append({
+                    'key': self._rollup_id(key),
+                    'expected': expected.get(key, 0),
+                    'actual': actual.get(key, 0)
+                })
+        return drift
+    
+    def ensure(self):
+        """Build the rollups if they don't exist yet but questions do"""
+        if self.rollups.estimated_document_count() == 0 and self.questions.estimated_document_count() > 0:
+            self.rebuild()
+    
+    def load(self):
+        """Get every rollup as {rollup key: count}"""
+        return {rollup_key(doc['_id']): doc.get('count', 0) for doc in self.rollups.find()}
+    
+    def count(self, field, value):
+        """Count the questions whose field equals value"""
+        result = list(self.rollups.aggregate([
+            {'$match': {'_id.' + field: value}},
+            {'$group': {'_id': None, 'count': {'$sum': '$count'}}}
+        ]))
+        return result[0]['count'] if result else 0
+    
+    def distinct(self, field):
+        """Get the distinct values of one of ROLLUP_FIELDS"""
+        return [value for value in self.rollups.distinct('_id.' + field) if value is not None]
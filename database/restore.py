@@ -0,0 +1,155 @@
+"""
+Restore questions from backup files for MCQ Database Manager
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.backup import iter_backup_questions
+from utils.constants import RESTORE_BATCH_SIZE, RESTORE_WORKERS
+
+
+class RestoreJob:
+    """Streams a backup file into the database with parallel bulk upserts
+    
+    Progress is checkpointed next to the backup file, so an interrupted
+    restore can resume after the last run of batches that all completed.
+    """
+    
+    def __init__(self, db_manager, filename, batch_size=RESTORE_BATCH_SIZE, workers=RESTORE_WORKERS):
+        self.db_manager = db_manager
+        self.filename = filename
+        self.batch_size = batch_size
+        self.workers = workers
+        self.checkpoint_file = filename + '.restore-checkpoint.json'
+        self.meta = {}
+        self.report = {
+            'restored': 0,
+            'conflicts': 0,
+            'skipped': 0
+        }
+    
+    def _source_signature(self):
+        """Identify the backup file so stale checkpoints are ignored"""
+        stat = os.stat(self.filename)
+        return {
+            'source': os.path.abspath(self.filename),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime
+        }
+    
+    def load_checkpoint(self):
+        """Get the number of questions already restored by an earlier run"""
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        
+        signature = self._source_signature()
+        if any(checkpoint.get(key) != value for key, value in signature.items()):
+            return 0
+        return checkpoint.get('restored', 0)
+    
+    def save_checkpoint(self, restored):
+        """Atomically record how many questions have been restored"""
+        checkpoint = self._source_signature()
+        checkpoint['restored'] = restored
+        
+        temp_file = self.checkpoint_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_file, self.checkpoint_file)
+    
+    def clear_checkpoint(self):
+        """Remove the checkpoint after a complete restore"""
+        try:
+            os.remove(self.checkpoint_file)
+        except OSError:
+            pass
+    
+    def _write_batch(self, batch):
+        """Prepare and upsert one batch; runs on a worker thread"""
+        documents = [self.db_manager.prepare_restored_question(q) for q in batch]
+        return self.db_manager.restore_questions(documents)
+    
+    def run(self, resume=True, progress_callback=None, cancel_event=None):
+        """Restore the backup and return the restore report"""
+        skip = self.load_checkpoint() if resume else 0
+        if not resume:
+            self.clear_checkpoint()
+        
+        # Batches finish out of order; the checkpoint only advances over the
+        # leading run of finished batches so resuming never loses a batch
+        batch_sizes = []
+        finished = set()
+        next_to_commit = 0
+        committed = skip
+        pending = {}
+        
+        def collect(done):
+            nonlocal next_to_commit, committed
+            for future in done:
+                index = pending.pop(future)
+                written, conflicts = future.result()
+                self.report['restored'] += written
+                self.report['conflicts'] += conflicts
+                finished.add(index)
+            
+            advanced = False
+            while next_to_commit in finished:
+                finished.discard(next_to_commit)
+                committed += batch_sizes[next_to_commit]
+                next_to_commit += 1
+                advanced = True
+            
+            if advanced:
+                self.save_checkpoint(committed)
+                if progress_callback:
+                    progress_callback(committed, self.meta)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                batch = []
+                position = 0
+                
+                def submit(batch):
+                    batch_sizes.append(len(batch))
+                    pending[executor.submit(self._write_batch, batch)] = len(batch_sizes) - 1
+                    
+                    # Keep a bounded number of batches in memory
+                    if len(pending) >= self.workers * 2:
+                        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                        collect(done)
+                
+                for question in iter_backup_questions(self.filename, self.meta):
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    
+                    position += 1
+                    if position <= skip:
+                        self.report['skipped'] += 1
+                        continue
+                    
+                    batch.append(question)
+                    if len(batch) >= self.batch_size:
+                        submit(batch)
+                        batch = []
+                
+                if batch and not (cancel_event is not None and cancel_event.is_set()):
+                    submit(batch)
+                
+                while pending:
+                    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                    collect(done)
+            
+        finally:
+            # Upserts replace whole questions, so recount the rollups once at
+            # the end, even when a failed batch cut the restore short
+            if batch_sizes:
+                self.db_manager.rebuild_question_stats()
+        
+        if not (cancel_event is not None and cancel_event.is_set()):
+            self.clear_checkpoint()
+        
+        return self.report
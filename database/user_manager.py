@@ -2,10 +2,10 @@
 User management for MCQ Database Manager
 """
 
-from pymongo import MongoClient
-from urllib.parse import quote_plus
+from pymongo import IndexModel
 import datetime
-from utils.constants import MONGODB_CONNECTION_STRING, DATABASE_NAME
+from utils.constants import DATABASE_NAME
+from .connection import connection_registry
 
 
 class UserManager:
@@ -14,22 +14,20 @@ class UserManager:
         self.db = None
         self.collection = None
     
-    def connect(self, password):
-        """Connect to MongoDB database"""
+    def connect(self, password, settings=None):
+        """Connect to MongoDB database using the shared connection pool"""
         try:
-            encoded_password = quote_plus(password)
-            connection_string = MONGODB_CONNECTION_STRING.format(password=encoded_password)
-            
-            self.mongo_client = MongoClient(connection_string, serverSelectionTimeoutMS=5000)
-            self.mongo_client.server_info()  # Test connection
+            self.mongo_client = connection_registry.get_client(password, settings)
             
             # Setup database and collection
             self.db = self.mongo_client[DATABASE_NAME]
             self.collection = self.db['users']
             
             # Create indexes
-            self.collection.create_index("username", unique=True)
-            self.collection.create_index("last_active")
+            connection_registry.ensure_indexes(self.collection, [
+                IndexModel("username", unique=True),
+                IndexModel("last_active")
+            ])
             
             return True, "Connected successfully"
             
@@ -38,7 +36,7 @@ class UserManager:
     
     def create_or_update_user(self, username):
         """Create or update user record"""
-        if not self.collection:
+        if self.collection is None:
             return None
         
         try:
@@ -89,7 +87,7 @@ class UserManager:
     
     def update_user_profile(self, username, profile_data):
         """Update user profile information"""
-        if not self.collection:
+        if self.collection is None:
             return False
         
         try:
@@ -109,7 +107,7 @@ class UserManager:
     
     def get_user_profile(self, username):
         """Get user profile information"""
-        if not self.collection:
+        if self.collection is None:
             return None
         
         try:
@@ -122,7 +120,7 @@ class UserManager:
     
     def get_all_users(self):
         """Get all users for admin view"""
-        if not self.collection:
+        if self.collection is None:
             return []
         
         try:
@@ -146,7 +144,7 @@ class UserManager:
     
     def log_session(self, username, session_start, duration):
         """Log a user session"""
-        if not self.collection:
+        if self.collection is None:
             return
         
         try:
@@ -185,7 +183,7 @@ class UserManager:
     
     def get_user_sessions(self, username, limit=10):
         """Get recent sessions for a user"""
-        if not self.collection:
+        if self.collection is None:
             return []
         
         try:
@@ -202,7 +200,7 @@ class UserManager:
     
     def update_questions_created(self, username, count=1):
         """Update questions created count"""
-        if not self.collection:
+        if self.collection is None:
             return
         
         try:
@@ -215,7 +213,7 @@ class UserManager:
     
     def get_online_users(self):
         """Get currently online users (active in last 5 minutes)"""
-        if not self.collection:
+        if self.collection is None:
             return []
         
         try:
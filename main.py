@@ -2,11 +2,13 @@
 MCQ Database Management System - Main Entry Point
 """
 
-import tkinter as tk
-from app import MCQDatabaseManager
-
 
 def main():
+    # Imported here rather than at module level: import worker processes
+    # are spawned and re-import this module, and don't need the UI
+    import tkinter as tk
+    from app import MCQDatabaseManager
+    
     root = tk.Tk()
     app = MCQDatabaseManager(root)
     
@@ -2,6 +2,7 @@
 Question model and related data structures
 """
 
+import re
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -104,6 +105,13 @@ class Question:
 class QuestionFilter:
     """Filter criteria for questions"""
     
+    # Ranked search on the text index, unindexed regex matching, or an exact
+    # or typo-tolerant search answered by the in-memory index (not part of the query)
+    SEARCH_TEXT = 'text'
+    SEARCH_REGEX = 'regex'
+    SEARCH_LOCAL = 'local'
+    SEARCH_FUZZY = 'fuzzy'
+    
     def __init__(self):
         self.subject: Optional[str] = None
         self.topic: Optional[str] = None
@@ -111,6 +119,13 @@ class QuestionFilter:
         self.level: Optional[str] = None
         self.created_by: Optional[str] = None
         self.search_text: Optional[str] = None
+        self.search_mode: str = self.SEARCH_TEXT
+        # Whether the last word of search_text may still be being typed
+        self.partial_word: bool = False
+    
+    def is_local_search(self) -> bool:
+        """Check whether the search is answered by the in-memory index"""
+        return self.search_mode in (self.SEARCH_LOCAL, self.SEARCH_FUZZY)
     
     def to_query(self) -> Dict:
         """Convert filter to MongoDB query"""
@@ -131,7 +146,20 @@ class QuestionFilter:
         if self.created_by:
             query['created_by'] = self.created_by
         
-        if self.search_text:
+        if self.search_text and self.search_mode == self.SEARCH_TEXT:
+            search_text = self.search_text
+            words = search_text.split()
+            
+            # $text only matches whole words, so an unfinished last word is
+            # matched as a word prefix of the question instead
+            if self.partial_word and words and re.fullmatch(r'\w+', words[-1]):
+                query['question'] = {'$regex': r'\b' + re.escape(words[-1]), '$options': 'i'}
+                search_text = ' '.join(words[:-1])
+            
+            if search_text:
+                query['$text'] = {'$search': search_text}
+        elif self.search_text and self.search_mode == self.SEARCH_REGEX:
+            # Advanced search; unanchored regexes can't use an index
             query['$or'] = [
                 {"question": {"$regex": self.search_text, "$options": "i"}},
                 {"subject": {"$regex": self.search_text, "$options": "i"}},
@@ -39,6 +39,7 @@ setup(
     extras_require={
         "charts": ["matplotlib>=3.5.0"],
         "excel": ["pandas>=1.3.0", "openpyxl>=3.0.0"],
+        "compression": ["zstandard>=0.18.0"],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
@@ -0,0 +1,93 @@
+"""
+Tests for the parallel multi-file import
+"""
+
+import json
+from database.batch_import import BatchImport
+from utils.helpers import compute_fingerprint
+
+
+def make_question(number, subject='Math'):
+    return {
+        'subject': subject,
+        'topic': 'Arithmetic',
+        'classification': 'Addition',
+        'level': 'easy',
+        'marks': 1,
+        'question': f'What is {number} + {number}?',
+        'option1': str(number * 2),
+        'option2': str(number * 2 + 1),
+        'option3': str(number * 2 + 2),
+        'option4': str(number * 2 + 3),
+        'correctAnswer': str(number * 2)
+    }
+
+
+class FakeManager:
+    """Stores questions by fingerprint; stored_later are added by another client after the duplicate check"""
+    
+    def __init__(self, stored=(), stored_later=()):
+        self.fingerprints = {compute_fingerprint(q['subject'], q['question']) for q in stored}
+        self.stored_later = list(stored_later)
+        self.inserted = []
+    
+    def find_existing_questions(self, pairs):
+        return {pair for pair in pairs if compute_fingerprint(*pair) in self.fingerprints}
+    
+    def insert_questions(self, questions, username, inserted=None):
+        for q in self.stored_later:
+            self.fingerprints.add(compute_fingerprint(q['subject'], q['question']))
+        
+        added = []
+        for q in questions:
+            fingerprint = compute_fingerprint(q['subject'], q['question'])
+            if fingerprint not in self.fingerprints:
+                self.fingerprints.add(fingerprint)
+                added.append(q)
+        
+        self.inserted.extend(added)
+        if inserted is not None:
+            inserted.extend(added)
+        return len(added)
+
+
+def write_json(path, questions):
+    path.write_text(json.dumps(questions), encoding='utf-8')
+    return str(path)
+
+
+def parsed_file(path, questions):
+    return {'file': path, 'questions': questions, 'read': len(questions), 'invalid': 0,
+            'errors': [], 'warning': None, 'error': None}
+
+
+def test_files_are_parsed_in_workers_and_deduplicated_across_files(tmp_path):
+    write_json(tmp_path / 'a.json', [make_question(1), make_question(2)])
+    write_json(tmp_path / 'b.json', [make_question(2), make_question(3), {'subject': 'Math'}])
+    manager = FakeManager(stored=[make_question(3)])
+    
+    job = BatchImport(manager, 'tester', str(tmp_path), workers=2)
+    report = job.run()
+    
+    assert report['files'] == 2
+    assert report['read'] == 5
+    assert report['invalid'] == 1
+    assert report['repeated'] == 1
+    assert report['duplicates'] == 1
+    assert report['imported'] == 2
+    assert sum(row['new'] for row in job.file_reports) == 2
+
+
+def test_questions_stored_meanwhile_move_from_new_to_duplicates(tmp_path):
+    # Another client stores question 2 between the duplicate check and the insert
+    manager = FakeManager(stored_later=[make_question(2)])
+    job = BatchImport(manager, 'tester', str(tmp_path / '*.json'), batch_size=10)
+    
+    first = job.merge(parsed_file('a.json', [make_question(1), make_question(2)]))
+    second = job.merge(parsed_file('b.json', [make_question(3)]))
+    job.flush()
+    
+    assert (first['new'], first['duplicates']) == (1, 1)
+    assert (second['new'], second['duplicates']) == (1, 0)
+    assert job.report['imported'] == 2
+    assert job.report['duplicates'] == 1
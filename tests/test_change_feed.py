@@ -0,0 +1,98 @@
+"""
+Tests for the question change stream handling
+"""
+
+import datetime
+from bson import ObjectId
+from utils.constants import QUESTION_PREVIEW_LENGTH
+from database.change_feed import question_change_pipeline, question_event, is_newer_id
+
+
+def run_pipeline(change):
+    """Apply the pipeline's $project and $set stages the way the server would"""
+    stages = question_change_pipeline()
+    projection = stages[1]['$project']
+    
+    projected = {}
+    for path in projection:
+        source, target = change, projected
+        parts = path.split('.')
+        for part in parts[:-1]:
+            source = source.get(part) if isinstance(source, dict) else None
+            if source is None:
+                break
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and parts[-1] in source:
+                target[parts[-1]] = source[parts[-1]]
+    
+    full_document = projected.setdefault('fullDocument', {})
+    full_document['question'] = (full_document.get('question') or '')[:QUESTION_PREVIEW_LENGTH + 1]
+    return projected
+
+
+def make_change(operation, question_id, full_document):
+    return {
+        '_id': {'_data': 'token'},
+        'operationType': operation,
+        'documentKey': {'_id': question_id},
+        'fullDocument': full_document,
+        'ns': {'db': 'mcq_db', 'coll': 'questions'},
+        'clusterTime': None
+    }
+
+
+def make_question(question_id):
+    return {
+        '_id': question_id,
+        'subject': 'Math',
+        'topic': 'Algebra',
+        'classification': 'Equations',
+        'level': 'easy',
+        'marks': 1,
+        'created_by': 'tester',
+        'created_at': datetime.datetime(2024, 1, 1),
+        'question': 'Solve x + 1 = 2',
+        'options': ['1', '2'],
+        'answer': '1'
+    }
+
+
+def test_projection_keeps_the_document_id():
+    question_id = ObjectId()
+    projected = run_pipeline(make_change('insert', question_id, make_question(question_id)))
+    
+    assert projected['fullDocument']['_id'] == question_id
+    assert 'options' not in projected['fullDocument']
+
+
+def test_insert_and_update_events_survive_the_projection():
+    question_id = ObjectId()
+    
+    for operation, expected in (('insert', 'insert'), ('update', 'update'), ('replace', 'update')):
+        event = question_event(run_pipeline(make_change(operation, question_id, make_question(question_id))))
+        
+        assert event[:3] == ('question', expected, question_id)
+        assert event[3]['subject'] == 'Math'
+
+
+def test_deletes_and_vanished_updates_are_deletes():
+    question_id = ObjectId()
+    
+    deleted = question_event(run_pipeline(make_change('delete', question_id, None)))
+    # An update whose lookup found nothing, because a delete got there first
+    vanished = question_event(run_pipeline(make_change('update', question_id, None)))
+    
+    assert deleted == ('question', 'delete', question_id, None)
+    assert vanished == ('question', 'delete', question_id, None)
+
+
+def test_new_ids_are_only_those_after_the_starting_point():
+    existing = ObjectId.from_datetime(datetime.datetime(2024, 1, 1))
+    older = ObjectId.from_datetime(datetime.datetime(2023, 1, 1))
+    newer = ObjectId()
+    
+    assert is_newer_id(newer, existing)
+    assert not is_newer_id(older, existing)
+    assert not is_newer_id('legacy-id', existing)
+    assert is_newer_id(older, None)
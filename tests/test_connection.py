@@ -0,0 +1,75 @@
+"""
+Tests for the shared connection registry
+"""
+
+import threading
+from database import connection
+from database.connection import ConnectionRegistry
+
+
+class FakeAdmin:
+    def __init__(self, client):
+        self.client = client
+    
+    def command(self, name):
+        self.client.pinged.wait(5)
+
+
+class FakeClient:
+    """Stands in for MongoClient; ping blocks until the test lets it through"""
+    
+    instances = []
+    
+    def __init__(self, connection_string, **options):
+        self.connection_string = connection_string
+        self.pinged = threading.Event()
+        self.admin = FakeAdmin(self)
+        FakeClient.instances.append(self)
+    
+    def close(self):
+        pass
+
+
+def test_slow_connect_does_not_block_other_connections(monkeypatch):
+    FakeClient.instances = []
+    monkeypatch.setattr(connection, 'MongoClient', FakeClient)
+    registry = ConnectionRegistry()
+    
+    slow = threading.Thread(target=registry.get_client, args=('slow',))
+    slow.start()
+    while not FakeClient.instances:
+        pass
+    
+    # While the first server hasn't answered, a second connection goes through
+    fast = threading.Thread(target=registry.get_client, args=('fast',))
+    fast.start()
+    while len(FakeClient.instances) < 2:
+        pass
+    FakeClient.instances[1].pinged.set()
+    fast.join(5)
+    
+    assert not fast.is_alive()
+    assert len(registry._clients) == 1
+    
+    FakeClient.instances[0].pinged.set()
+    slow.join(5)
+    assert len(registry._clients) == 2
+
+
+def test_concurrent_callers_share_one_client(monkeypatch):
+    FakeClient.instances = []
+    monkeypatch.setattr(connection, 'MongoClient', FakeClient)
+    registry = ConnectionRegistry()
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get_client('same'))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while not FakeClient.instances:
+        pass
+    FakeClient.instances[0].pinged.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(FakeClient.instances) == 1
+    assert len(results) == 4 and all(client is results[0] for client in results)
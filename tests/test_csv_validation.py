@@ -0,0 +1,93 @@
+"""
+Tests that CSV rows are validated the same way row by row and column-wise
+"""
+
+import pytest
+from utils.helpers import CSV_FIELDS, clean_csv_row, parse_marks, validate_question
+
+pd = pytest.importorskip('pandas')
+from utils.tabular import validate_frame
+
+
+def make_row(**changes):
+    row = {
+        'subject': 'Math',
+        'topic': 'Algebra',
+        'classification': 'Equations',
+        'question': 'Solve x + 1 = 2',
+        'option1': '1',
+        'option2': '2',
+        'option3': '3',
+        'option4': '4',
+        'correctAnswer': '1',
+        'level': 'easy',
+        'marks': '1',
+        'created_by': 'tester'
+    }
+    row.update(changes)
+    return row
+
+
+# Rows as csv.DictReader and pandas (dtype=str, keep_default_na=False) read them
+ROWS = [
+    make_row(),
+    make_row(marks=''),
+    make_row(marks=' 2 '),
+    make_row(marks='3.0'),
+    make_row(marks='2.5'),
+    make_row(marks='two'),
+    make_row(level=' Hard '),
+    make_row(level='MEDIUM'),
+    make_row(level='expert'),
+    make_row(level=''),
+    make_row(correctAnswer='5'),
+    make_row(option4=''),
+    make_row(question=''),
+    make_row(topic='', marks='x', level='impossible')
+]
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, 1), ('', 1), ('  ', 1), ('2', 2), (' 4 ', 4), ('3.0', 3), (5, 5), (2.0, 2),
+    ('2.5', None), ('two', None), (float('nan'), None)
+])
+def test_parse_marks(value, expected):
+    assert parse_marks(value) == expected
+
+
+def test_row_and_frame_validation_agree():
+    row_results = []
+    for row in ROWS:
+        cleaned = clean_csv_row(dict(row))
+        is_valid, _ = validate_question(cleaned)
+        row_results.append(cleaned if is_valid else None)
+    
+    valid, errors = validate_frame(pd.DataFrame(ROWS, columns=CSV_FIELDS))
+    
+    assert {index for index, _ in errors} == {i for i, result in enumerate(row_results) if result is None}
+    
+    expected = [result for result in row_results if result is not None]
+    assert len(valid) == len(expected)
+    for from_frame, from_row in zip(valid, expected):
+        assert from_frame['marks'] == from_row['marks']
+        assert from_frame['level'] == from_row['level']
+
+
+def test_frame_errors_list_every_problem():
+    _, errors = validate_frame(pd.DataFrame([ROWS[-1]], columns=CSV_FIELDS))
+    
+    assert len(errors) == 1
+    index, message = errors[0]
+    assert index == 0
+    assert 'Missing required field: topic' in message
+    assert 'Marks must be a number' in message
+    assert 'Level must be one of' in message
+
+
+def test_missing_columns_are_reported_not_raised():
+    frame = pd.DataFrame([{'subject': 'Math', 'question': 'Solve x'}])
+    
+    valid, errors = validate_frame(frame)
+    
+    assert valid == []
+    assert 'Missing required field: topic' in errors[0][1]
@@ -0,0 +1,36 @@
+"""
+Tests for dropping questions repeated within a batch
+"""
+
+from utils.helpers import compute_fingerprint, dedupe_questions
+
+
+def make_question(subject, question):
+    return {'subject': subject, 'question': question}
+
+
+def test_first_occurrence_is_kept():
+    questions = [
+        make_question('Math', 'What is 2 + 2?'),
+        make_question('Math', 'what is  2 + 2?'),
+        make_question('Physics', 'What is 2 + 2?'),
+        make_question('Math', 'ＷＨＡＴ is 2 + 2?')
+    ]
+    
+    unique, dropped = dedupe_questions(questions)
+    
+    assert unique == [questions[0], questions[2]]
+    assert dropped == [questions[1], questions[3]]
+
+
+def test_seen_carries_over_between_batches():
+    seen = set()
+    first = [make_question('Math', 'What is 2 + 2?')]
+    second = [make_question('Math', 'What is 2 + 2?'), make_question('Math', 'What is 3 + 3?')]
+    
+    dedupe_questions(first, seen)
+    unique, dropped = dedupe_questions(second, seen)
+    
+    assert unique == [second[1]]
+    assert dropped == [second[0]]
+    assert seen == {compute_fingerprint('Math', 'What is 2 + 2?'), compute_fingerprint('Math', 'What is 3 + 3?')}
@@ -0,0 +1,52 @@
+"""
+Tests for question fingerprints and edits that collide with them
+"""
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from database.db_manager import DatabaseManager, DuplicateQuestionError
+from utils.helpers import compute_fingerprint, normalize_text
+
+
+def test_normalize_text_folds_case_whitespace_and_unicode_form():
+    assert normalize_text('  What   IS\tthe\nAnswer? ') == 'what is the answer?'
+    # Full-width letters and the ligature fold to their plain forms
+    assert normalize_text('ＡＢＣ ﬁle') == 'abc file'
+    assert normalize_text('Straße') == normalize_text('STRASSE')
+    assert normalize_text(None) == ''
+
+
+def test_fingerprint_ignores_formatting_differences():
+    assert compute_fingerprint('Math', 'What is 2 + 2?') == compute_fingerprint(' math ', 'what  is 2 + 2?')
+    assert len(compute_fingerprint('Math', 'What is 2 + 2?')) == 32
+
+
+def test_fingerprint_depends_on_subject_and_text():
+    fingerprint = compute_fingerprint('Math', 'What is 2 + 2?')
+    
+    assert fingerprint != compute_fingerprint('Physics', 'What is 2 + 2?')
+    assert fingerprint != compute_fingerprint('Math', 'What is 2 + 3?')
+    # The separator keeps text from moving between subject and question
+    assert compute_fingerprint('Math a', 'b') != compute_fingerprint('Math', 'a b')
+
+
+class CollidingCollection:
+    """Collection whose every update hits the unique fingerprint index"""
+    
+    def __init__(self, stored):
+        self.stored = stored
+    
+    def find_one(self, query, projection=None):
+        return dict(self.stored)
+    
+    def find_one_and_update(self, query, update, **options):
+        raise DuplicateKeyError('E11000 duplicate key error collection: mcq_db.questions index: fingerprint_1')
+
+
+def test_edit_matching_another_question_reports_the_subject():
+    manager = DatabaseManager()
+    manager.collection = CollidingCollection({'subject': 'Math', 'question': 'What is 2 + 2?'})
+    
+    with pytest.raises(DuplicateQuestionError, match='An identical question already exists in Math'):
+        manager.update_question(str(ObjectId()), {'question': 'What is 2+2?'})
@@ -0,0 +1,131 @@
+"""
+Tests for resuming interrupted imports from their journal
+"""
+
+import os
+import pytest
+from pymongo.errors import AutoReconnect
+from database.bulk_importer import BulkImporter
+from database.import_journal import ImportJournal
+from utils.helpers import compute_fingerprint
+
+
+def make_row(number):
+    return {
+        'subject': 'Math',
+        'topic': 'Arithmetic',
+        'classification': 'Addition',
+        'level': 'easy',
+        'marks': 1,
+        'question': f'What is {number} + {number}?',
+        'option1': str(number * 2),
+        'option2': 'none',
+        'option3': 'both',
+        'option4': 'neither',
+        'correctAnswer': str(number * 2)
+    }
+
+
+class FakeManager:
+    """Inserts everything, until fail_after batches when the connection drops"""
+    
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.batches = []
+    
+    def insert_questions(self, questions, username):
+        if self.fail_after is not None and len(self.batches) == self.fail_after:
+            raise AutoReconnect('connection lost')
+        self.batches.append([q['question'] for q in questions])
+        return len(questions)
+
+
+def batches(rows, size):
+    return [[dict(row) for row in rows[start:start + size]] for start in range(0, len(rows), size)]
+
+
+SIGNATURE = {'source': 'questions.csv', 'size': 100, 'mtime': 1.0}
+
+
+def test_interrupted_import_resumes_after_the_last_committed_batch(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    rows = [make_row(number) for number in range(7)]
+    
+    first = FakeManager(fail_after=2)
+    with pytest.raises(AutoReconnect):
+        BulkImporter(first, 'tester', journal=ImportJournal(path, SIGNATURE)).run(batches(rows, 3))
+    assert sum(len(batch) for batch in first.batches) == 6
+    
+    second = FakeManager()
+    importer = BulkImporter(second, 'tester', journal=ImportJournal(path, SIGNATURE))
+    report = importer.run(batches(rows, 3))
+    
+    assert second.batches == [['What is 6 + 6?']]
+    assert report['resumed'] == 6
+    assert report['imported'] == 1
+    assert not os.path.exists(path)
+
+
+def test_questions_written_past_the_offset_are_skipped(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    rows = [make_row(number) for number in range(4)]
+    
+    # One row consumed, but a question from further on written as well
+    ImportJournal(path, SIGNATURE).commit(1, [rows[0], rows[2]])
+    
+    manager = FakeManager()
+    report = BulkImporter(manager, 'tester', journal=ImportJournal(path, SIGNATURE)).run(batches(rows, 4))
+    
+    assert manager.batches == [['What is 1 + 1?', 'What is 3 + 3?']]
+    assert report['resumed'] == 2
+
+
+def test_journal_for_another_source_is_ignored(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    ImportJournal(path, SIGNATURE).commit(3, [make_row(0)])
+    
+    changed = ImportJournal(path, dict(SIGNATURE, size=101))
+    
+    assert changed.load() == 0
+    assert not changed.fingerprints
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = ImportJournal(path, SIGNATURE)
+    journal.commit(1, [make_row(0)])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"offset": 2, "fingerpr')
+    
+    resumed = ImportJournal(path, SIGNATURE)
+    assert resumed.load() == 1
+    assert resumed.is_written(make_row(0))
+    
+    resumed.commit(2, [make_row(1)])
+    again = ImportJournal(path, SIGNATURE)
+    assert again.load() == 2
+    assert again.fingerprints == {compute_fingerprint('Math', 'What is 0 + 0?'), compute_fingerprint('Math', 'What is 1 + 1?')}
+
+
+def test_unwritable_journal_does_not_stop_the_import(tmp_path):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    journal = ImportJournal(str(blocker / 'journal.jsonl'), SIGNATURE)
+    
+    manager = FakeManager()
+    report = BulkImporter(manager, 'tester', journal=journal).run(batches([make_row(0), make_row(1)], 1))
+    
+    assert report['imported'] == 2
+    assert journal.error is not None
+
+
+def test_file_journals_live_in_the_journal_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / 'questions.csv'
+    source.write_text('subject,question\n')
+    
+    journal = ImportJournal.for_file(str(source))
+    
+    assert os.path.dirname(journal.path) == 'import_journals'
+    assert journal.signature['source'] == str(source)
+    assert journal.signature['size'] == source.stat().st_size
@@ -0,0 +1,113 @@
+"""
+Tests for lenient, incremental JSON question parsing
+"""
+
+import io
+import json
+import pytest
+from utils.helpers import read_json_questions
+from utils.json_stream import JSONStreamParser, iter_object_array
+
+
+def read(text):
+    return read_json_questions(io.StringIO(text))
+
+
+def parse(text, chunk_size):
+    """Parse leniently in small chunks, so values straddle buffer refills"""
+    parser = JSONStreamParser(io.StringIO(text), chunk_size=chunk_size, lenient=True)
+    meta = {}
+    items = list(parser.iter_array('questions', meta))
+    return items, meta, parser.error
+
+
+QUESTIONS = [{'question': 'First?', 'marks': 1}, {'question': 'Second?', 'marks': 12}]
+
+
+def test_plain_object_with_suggestions():
+    text = json.dumps({
+        'suggested_topics': ['Algebra'],
+        'questions': QUESTIONS,
+        'suggested_classifications': ['Equations']
+    })
+    
+    success, questions, topics, classifications, warning = read(text)
+    
+    assert success
+    assert questions == QUESTIONS
+    assert topics == ['Algebra']
+    assert classifications == ['Equations']
+    assert warning is None
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7])
+def test_small_chunks(chunk_size):
+    text = 'Output: [see below]\n```json\n' + json.dumps({'total': 12, 'questions': QUESTIONS}) + '\n```'
+    
+    items, meta, error = parse(text, chunk_size)
+    
+    assert items == QUESTIONS
+    assert meta == {'total': 12}
+    assert error is None
+
+
+def test_code_fences_and_surrounding_text():
+    text = 'Sure! Here you go:\n```json\n' + json.dumps({'questions': QUESTIONS}) + '\n```\nLet me know.'
+    
+    success, questions, _, _, warning = read(text)
+    
+    assert success and questions == QUESTIONS and warning is None
+
+
+def test_bare_array():
+    success, questions, topics, _, _ = read('```\n' + json.dumps(QUESTIONS) + '\n```')
+    
+    assert success and questions == QUESTIONS and topics == []
+
+
+def test_trailing_commas():
+    text = '{"questions": [{"question": "First?", "marks": 1}, {"question": "Second?", "marks": 12},],}'
+    
+    success, questions, _, _, warning = read(text)
+    
+    assert success and questions == QUESTIONS and warning is None
+
+
+def test_truncation_keeps_complete_questions():
+    text = json.dumps({'questions': QUESTIONS + [{'question': 'Third?'}]})
+    truncated = text[:text.index('Third') + 3]
+    
+    success, questions, _, _, warning = read(truncated)
+    
+    assert success
+    assert questions == QUESTIONS
+    assert warning.startswith('Input ended early or is malformed after 2 complete questions')
+    
+    # The same holds when the cut falls across buffer refills
+    items, _, error = parse(truncated, 3)
+    assert items == QUESTIONS
+    assert error is not None
+
+
+def test_brackets_in_leading_text_are_passed_over():
+    text = 'Here are [2] questions {as requested}:\n' + json.dumps({'questions': QUESTIONS})
+    
+    success, questions, _, _, _ = read(text)
+    
+    assert success and questions == QUESTIONS
+
+
+def test_no_questions_is_an_error():
+    success, message, _, _, _ = read('I could not generate any questions.')
+    
+    assert not success
+    assert message.startswith('No questions found in JSON')
+
+
+def test_strict_parsing_rejects_trailing_commas():
+    meta = {}
+    items = iter_object_array(io.StringIO('{"total": 2, "questions": [1, 2,]}'), 'questions', meta)
+    
+    with pytest.raises(ValueError):
+        list(items)
+    assert meta == {'total': 2}
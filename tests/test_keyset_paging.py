@@ -0,0 +1,118 @@
+"""
+Tests for paging question lists with (created_at, _id) keyset cursors
+"""
+
+import datetime
+import operator
+from bson import ObjectId
+from database.db_manager import DatabaseManager
+
+OPERATORS = {'$lt': operator.lt, '$gt': operator.gt}
+
+
+def matches(document, query):
+    """Evaluate the query operators find_questions_page uses"""
+    for key, condition in query.items():
+        if key == '$and':
+            if not all(matches(document, clause) for clause in condition):
+                return False
+        elif key == '$or':
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(OPERATORS[name](document[key], value) for name, value in condition.items()):
+                return False
+        elif document.get(key) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[field], reverse=direction == -1)
+        return self
+    
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+    
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def find(self, query, projection=None):
+        return FakeCursor([dict(document) for document in self.documents if matches(document, query)])
+
+
+def make_manager(count):
+    # Pairs of questions share a created_at, so the _id has to break ties
+    start = datetime.datetime(2024, 1, 1)
+    documents = [
+        {'_id': ObjectId(), 'created_at': start + datetime.timedelta(minutes=number // 2),
+         'subject': 'Math' if number % 3 else 'Physics'}
+        for number in range(count)
+    ]
+    manager = DatabaseManager()
+    manager.collection = FakeCollection(documents)
+    newest_first = sorted(documents, key=lambda d: (d['created_at'], d['_id']), reverse=True)
+    return manager, [document['_id'] for document in newest_first]
+
+
+def page_ids(questions):
+    return [question['_id'] for question in questions]
+
+
+def test_pages_forward_cover_every_question_once():
+    manager, expected = make_manager(11)
+    
+    seen = []
+    questions, has_more = manager.find_questions_page({}, 4)
+    seen += page_ids(questions)
+    while has_more:
+        questions, has_more = manager.find_questions_page({}, 4, after=questions[-1])
+        seen += page_ids(questions)
+    
+    assert seen == expected
+
+
+def test_paging_back_returns_the_previous_page_in_order():
+    manager, expected = make_manager(11)
+    
+    first, _ = manager.find_questions_page({}, 4)
+    second, _ = manager.find_questions_page({}, 4, after=first[-1])
+    third, has_more = manager.find_questions_page({}, 4, after=second[-1])
+    back, has_more_before = manager.find_questions_page({}, 4, before=third[0])
+    
+    assert page_ids(third) == expected[8:]
+    assert not has_more
+    assert page_ids(back) == page_ids(second)
+    assert has_more_before
+
+
+def test_filters_apply_to_every_page():
+    manager, _ = make_manager(11)
+    
+    first, has_more = manager.find_questions_page({'subject': 'Math'}, 5)
+    rest, _ = manager.find_questions_page({'subject': 'Math'}, 5, after=first[-1])
+    
+    assert has_more
+    assert len(first) + len(rest) == 7
+    assert all(question['subject'] == 'Math' for question in first + rest)
+
+
+def test_string_ids_from_the_ui_are_accepted():
+    manager, expected = make_manager(6)
+    
+    first, _ = manager.find_questions_page({}, 3)
+    cursor = dict(first[-1], _id=str(first[-1]['_id']))
+    second, _ = manager.find_questions_page({}, 3, after=cursor)
+    
+    assert page_ids(second) == expected[3:]
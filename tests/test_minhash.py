@@ -0,0 +1,47 @@
+"""
+Tests for MinHash signatures and LSH band keys
+"""
+
+from utils.minhash import LSH_BANDS, MINHASH_PERMUTATIONS, jaccard, lsh_band_keys, minhash_signature, shingles
+
+
+def test_shingles_are_normalized_word_pairs():
+    assert shingles('What is  RECURSION?') == {'what is', 'is recursion'}
+    assert shingles('Recursion') == {'recursion'}
+    assert shingles('  ') == set()
+
+
+def test_jaccard():
+    assert jaccard({'a', 'b'}, {'b', 'c'}) == 1 / 3
+    assert jaccard(set(), set()) == 1.0
+
+
+def test_signature_agreement_estimates_similarity():
+    first = shingles('Which data structure follows the last in first out principle for its elements')
+    second = shingles('Which data structure follows the last in first out principle for stored elements')
+    
+    signature_a, signature_b = minhash_signature(first), minhash_signature(second)
+    agreement = sum(a == b for a, b in zip(signature_a, signature_b)) / MINHASH_PERMUTATIONS
+    
+    assert len(signature_a) == MINHASH_PERMUTATIONS
+    assert abs(agreement - jaccard(first, second)) < 0.25
+
+
+def test_band_keys_are_stable_and_formatting_insensitive():
+    keys = lsh_band_keys('Math', 'What is the derivative of x squared?')
+    
+    assert len(keys) == LSH_BANDS
+    assert keys == lsh_band_keys(' math ', 'what is the  DERIVATIVE of x squared')
+
+
+def test_paraphrases_share_a_band_and_unrelated_questions_do_not():
+    question = 'Which data structure follows the last in first out principle for its elements?'
+    paraphrase = 'Which data structure follows the last in first out principle for stored elements?'
+    unrelated = 'What is the capital city of France and when was it founded?'
+    
+    keys = set(lsh_band_keys('CS', question))
+    
+    assert keys & set(lsh_band_keys('CS', paraphrase))
+    assert not keys & set(lsh_band_keys('CS', unrelated))
+    # Band keys include the subject, so other subjects never become candidates
+    assert not keys & set(lsh_band_keys('Physics', question))
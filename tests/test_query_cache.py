@@ -0,0 +1,85 @@
+"""
+Tests for the write-invalidated query cache
+"""
+
+from database.db_manager import DatabaseManager
+from database.query_cache import QueryCache
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_values_are_reused_until_a_dependency_changes():
+    cache = QueryCache(60)
+    compute = Counter()
+    
+    assert cache.get_or_compute('levels', ('level',), compute) == 1
+    assert cache.get_or_compute('levels', ('level',), compute) == 1
+    
+    # Updates to unrelated fields keep the entry
+    cache.invalidate(['topic'])
+    assert cache.get_or_compute('levels', ('level',), compute) == 1
+    
+    cache.invalidate(['level'])
+    assert cache.get_or_compute('levels', ('level',), compute) == 2
+    
+    # Inserts and deletes invalidate everything
+    cache.invalidate()
+    assert cache.get_or_compute('levels', ('level',), compute) == 3
+    assert cache.get_stats()['hits'] == 2
+
+
+def test_expired_entries_are_recomputed():
+    cache = QueryCache(0)
+    compute = Counter()
+    
+    cache.get_or_compute('levels', ('level',), compute)
+    assert cache.get_or_compute('levels', ('level',), compute) == 2
+
+
+def test_values_computed_across_a_write_are_not_kept():
+    cache = QueryCache(60)
+    
+    def compute_during_write():
+        cache.invalidate(['level'])
+        return 'stale'
+    
+    assert cache.get_or_compute('levels', ('level',), compute_during_write) == 'stale'
+    assert cache.get_or_compute('levels', ('level',), lambda: 'fresh') == 'fresh'
+
+
+class FakeStats:
+    def __init__(self, counts):
+        self.counts = counts
+        self.loads = 0
+    
+    def load(self):
+        self.loads += 1
+        return dict(self.counts)
+
+
+def test_statistics_are_cached_until_levels_or_subjects_change():
+    manager = DatabaseManager()
+    manager.collection = object()
+    manager.question_stats = FakeStats({
+        ('Math', 'Algebra', 'Equations', 'easy', 'alice'): 3,
+        ('Physics', 'Motion', 'Speed', 'hard', 'bob'): 2
+    })
+    
+    stats = manager.get_statistics()
+    assert stats == {'total': 5, 'easy': 3, 'medium': 0, 'hard': 2, 'subjects': 2}
+    
+    manager.get_statistics()
+    manager.query_cache.invalidate(['created_by'])
+    manager.get_statistics()
+    assert manager.question_stats.loads == 1
+    
+    manager.query_cache.invalidate(['level'])
+    manager.get_statistics()
+    assert manager.question_stats.loads == 2
@@ -0,0 +1,50 @@
+"""
+Tests for turning question filters into MongoDB queries
+"""
+
+import re
+from models.question import QuestionFilter
+
+
+def text_filter(search_text, partial_word=False):
+    question_filter = QuestionFilter()
+    question_filter.search_text = search_text
+    question_filter.partial_word = partial_word
+    return question_filter
+
+
+def test_submitted_search_uses_the_text_index():
+    assert text_filter('recursion depth').to_query() == {'$text': {'$search': 'recursion depth'}}
+
+
+def test_unfinished_word_is_matched_as_a_prefix():
+    query = text_filter('recur', partial_word=True).to_query()
+    
+    assert '$text' not in query
+    pattern = re.compile(query['question']['$regex'], re.IGNORECASE)
+    assert pattern.search('What is Recursion?')
+    assert not pattern.search('Explain incurring costs')
+
+
+def test_finished_words_still_use_the_text_index_while_typing():
+    query = text_filter('binary tree trav', partial_word=True).to_query()
+    
+    assert query['$text'] == {'$search': 'binary tree'}
+    assert query['question']['$regex'] == r'\btrav'
+
+
+def test_phrases_and_negations_are_left_to_the_text_index():
+    assert text_filter('tree -binary', partial_word=True).to_query() == {'$text': {'$search': 'tree -binary'}}
+    assert text_filter('"binary tree"', partial_word=True).to_query() == {'$text': {'$search': '"binary tree"'}}
+
+
+def test_filters_combine_with_the_search():
+    question_filter = text_filter('stack', partial_word=True)
+    question_filter.subject = 'Computer Science'
+    question_filter.level = 'All'
+    
+    query = question_filter.to_query()
+    
+    assert query['subject'] == 'Computer Science'
+    assert 'level' not in query
+    assert query['question']['$regex'] == r'\bstack'
@@ -0,0 +1,90 @@
+"""
+Tests for the incrementally maintained question rollups
+"""
+
+from database.question_stats import QuestionStats, rollup_key, summarize_rollups
+
+
+class FakeRollups:
+    """Applies the $inc upserts and deletes QuestionStats sends to an in-memory dict"""
+    
+    def __init__(self):
+        self.counts = {}
+        self.bulk_writes = 0
+    
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes += 1
+        for operation in operations:
+            key = tuple(sorted(operation._filter['_id'].items()))
+            self.counts[key] = self.counts.get(key, 0) + operation._doc['$inc']['count']
+    
+    def delete_many(self, query):
+        for rollup_id in query['_id']['$in']:
+            key = tuple(sorted(rollup_id.items()))
+            if self.counts.get(key, 0) <= query['count']['$lte']:
+                self.counts.pop(key, None)
+    
+    def count(self, question):
+        return self.counts.get(tuple(sorted(dict(zip(
+            ['subject', 'topic', 'classification', 'level', 'created_by'], rollup_key(question)
+        )).items())))
+
+
+def make_question(subject='Math', level='easy', created_by='alice'):
+    return {'subject': subject, 'topic': 'Algebra', 'classification': 'Equations',
+            'level': level, 'created_by': created_by}
+
+
+def test_inserts_are_counted_in_one_bulk_write():
+    rollups = FakeRollups()
+    stats = QuestionStats(None, rollups)
+    
+    stats.record_insert([make_question(), make_question(), make_question(level='hard')])
+    
+    assert rollups.bulk_writes == 1
+    assert rollups.count(make_question()) == 2
+    assert rollups.count(make_question(level='hard')) == 1
+
+
+def test_updates_move_questions_between_rollups():
+    rollups = FakeRollups()
+    stats = QuestionStats(None, rollups)
+    stats.record_insert([make_question(), make_question()])
+    
+    stats.record_update(make_question(), make_question(level='medium'))
+    # Changes outside the rollup fields don't write anything
+    stats.record_update(make_question(level='medium'), dict(make_question(level='medium'), question='Edited'))
+    
+    assert rollups.count(make_question()) == 1
+    assert rollups.count(make_question(level='medium')) == 1
+    assert rollups.bulk_writes == 2
+
+
+def test_emptied_rollups_are_removed():
+    rollups = FakeRollups()
+    stats = QuestionStats(None, rollups)
+    stats.record_insert([make_question()])
+    
+    stats.record_delete(make_question())
+    
+    assert rollups.counts == {}
+
+
+def test_summarize_rollups():
+    counts = {
+        rollup_key(make_question()): 3,
+        rollup_key(make_question(level='hard', created_by='bob')): 2,
+        rollup_key(make_question(subject='Physics', level='medium')): 4
+    }
+    
+    stats = summarize_rollups(counts, 'alice', top_n=1)
+    
+    assert stats == {
+        'total': 9,
+        'easy': 3,
+        'medium': 4,
+        'hard': 2,
+        'subjects': 2,
+        'subject_distribution': [{'_id': 'Math', 'count': 5}],
+        'my_questions': 7
+    }
@@ -0,0 +1,66 @@
+"""
+Tests for restoring questions from backup files
+"""
+
+import pytest
+from pymongo.errors import AutoReconnect
+from database.restore import RestoreJob
+from utils.backup import write_backup
+
+
+class FakeManager:
+    """Records restored batches; fails the batch starting at fail_at, if given"""
+    
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.restored = []
+        self.rebuilds = 0
+    
+    def prepare_restored_question(self, question):
+        return question
+    
+    def restore_questions(self, documents):
+        if self.fail_at is not None and documents[0]['number'] == self.fail_at:
+            raise AutoReconnect('connection reset')
+        self.restored.extend(documents)
+        return len(documents), 0
+    
+    def rebuild_question_stats(self):
+        self.rebuilds += 1
+
+
+@pytest.fixture
+def backup_file(tmp_path):
+    filename = str(tmp_path / 'backup.jsonl')
+    questions = [{'_id': f'q{number}', 'number': number, 'subject': 'Math'} for number in range(10)]
+    write_backup(questions, filename, {'Math': {}})
+    return filename
+
+
+def test_restore_rebuilds_rollups_and_clears_the_checkpoint(backup_file):
+    manager = FakeManager()
+    
+    report = RestoreJob(manager, backup_file, batch_size=3, workers=2).run()
+    
+    assert report['restored'] == 10
+    assert manager.rebuilds == 1
+    assert RestoreJob(manager, backup_file).load_checkpoint() == 0
+
+
+def test_failed_restore_still_rebuilds_rollups(backup_file):
+    manager = FakeManager(fail_at=6)
+    job = RestoreJob(manager, backup_file, batch_size=3, workers=1)
+    
+    with pytest.raises(AutoReconnect):
+        job.run()
+    
+    # Earlier batches were written, so the rollups must match them
+    assert manager.restored
+    assert manager.rebuilds == 1
+    checkpoint = job.load_checkpoint()
+    assert 0 < checkpoint <= 6
+    
+    # Resuming writes the rest
+    resumed = FakeManager()
+    RestoreJob(resumed, backup_file, batch_size=3, workers=1).run()
+    assert [q['number'] for q in resumed.restored] == list(range(checkpoint, 10))
@@ -0,0 +1,118 @@
+"""
+Tests for the in-memory BM25 search index
+"""
+
+import pytest
+from utils.search_index import SearchIndex, tokenize
+
+
+def make_question(question_id, question, subject='CS', topic='Basics', level='easy', options=('', '', '', '')):
+    return {
+        '_id': question_id,
+        'subject': subject,
+        'topic': topic,
+        'classification': 'General',
+        'level': level,
+        'created_by': 'tester',
+        'question': question,
+        'option1': options[0],
+        'option2': options[1],
+        'option3': options[2],
+        'option4': options[3]
+    }
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.build([
+        make_question(1, 'What is recursion in programming?'),
+        make_question(2, 'Recursion recursion: define a recursive function that uses recursion'),
+        make_question(3, 'Which data structure is used for a stack?', level='hard'),
+        make_question(4, 'What is a queue?', subject='Math', options=('Uses recursion', 'A list', 'A tree', 'A map'))
+    ])
+    return index
+
+
+def ids(results):
+    return [question_id for question_id, _ in results]
+
+
+def test_tokenize_normalizes_and_drops_stop_words():
+    assert tokenize('What IS the  Answer, of-course?') == ['what', 'answer', 'course']
+
+
+def test_more_frequent_terms_rank_higher(index):
+    results = index.search('recursion')
+    
+    assert ids(results)[0] == 2
+    assert set(ids(results)) == {1, 2, 4}
+    assert all(earlier[1] >= later[1] for earlier, later in zip(results, results[1:]))
+
+
+def test_any_query_word_matches(index):
+    assert set(ids(index.search('stack queue'))) == {3, 4}
+    assert index.search('the of') == []
+    assert index.search('nonexistent') == []
+
+
+def test_filters_and_limit(index):
+    assert ids(index.search('recursion', {'subject': 'CS'})) == [2, 1]
+    assert ids(index.search('recursion', limit=1)) == [2]
+    assert ids(index.search('stack', {'level': 'easy'})) == []
+    
+    with pytest.raises(ValueError):
+        index.search('recursion', {'marks': 1})
+
+
+def test_writes_keep_the_index_in_sync(index):
+    index.on_write('update', 1, make_question(1, 'What is a binary tree?'))
+    index.on_write('delete', 2, None)
+    index.on_write('insert', 5, make_question(5, 'Explain tail recursion'))
+    
+    assert set(ids(index.search('recursion'))) == {4, 5}
+    assert ids(index.search('binary')) == [1]
+    assert len(index) == 4
+
+
+def test_compaction_keeps_results(index):
+    for question_id in (1, 2):
+        index.remove(question_id)
+    index.compact()
+    
+    assert index.tombstones == 0
+    assert len(index.doc_ids) == 2
+    assert ids(index.search('recursion')) == [4]
+    assert ids(index.search('stack')) == [3]
+
+
+def test_subject_index_ignores_other_subjects():
+    index = SearchIndex(['Math'])
+    index.add(make_question(1, 'What is recursion?', subject='CS'))
+    index.add(make_question(2, 'What is a recursive sequence?', subject='Math'))
+    
+    assert len(index) == 1
+    assert index.covers('Math') and not index.covers('CS')
+
+
+def test_fuzzy_search_tolerates_typos(index):
+    assert index.search('recusrion') == []
+    
+    results = index.search('recusrion', fuzzy=True)
+    assert ids(results)[0] == 2
+    assert set(ids(results)) >= {1, 2, 4}
+
+
+def test_exact_matches_outrank_fuzzy_ones():
+    index = SearchIndex()
+    index.add(make_question(1, 'Explain the stack'))
+    index.add(make_question(2, 'Explain the stacks'))
+    
+    terms = dict(index.fuzzy_terms('stack'))
+    assert terms['stack'] == 1.0
+    assert 0 < terms['stacks'] < 1.0
+    assert ids(index.search('stack', fuzzy=True)) == [1, 2]
+
+
+def test_dissimilar_words_do_not_match(index):
+    assert index.search('zebra', fuzzy=True) == []
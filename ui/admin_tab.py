@@ -141,7 +141,7 @@ class AdminTab(BaseTab):
         stats_frame = self.create_label_frame(container, "System Statistics")
         stats_frame.pack(fill=tk.X, pady=(0, 20))
         
-        self.stats_text = tk.Text(stats_frame, height=6, font=('Arial', 10), wrap=tk.WORD)
+        self.stats_text = tk.Text(stats_frame, height=11, font=('Arial', 10), wrap=tk.WORD)
         self.stats_text.pack(fill=tk.BOTH, expand=True)
         
         # All Users Table
@@ -207,7 +207,7 @@ class AdminTab(BaseTab):
         if not self.is_authenticated:
             return
         
-        if not hasattr(self.app, 'user_manager') or not self.app.user_manager.collection:
+        if not hasattr(self.app, 'user_manager') or self.app.user_manager.collection is None:
             self.update_status("User database not connected", self.app.colors['warning'])
             return
         
@@ -252,14 +252,21 @@ class AdminTab(BaseTab):
         total_time = sum(user.get('total_time_seconds', 0) for user in all_users)
         
         # Get database stats
-        db_stats = self.app.db_manager.get_statistics() if self.app.db_manager.collection else {}
+        db_stats = self.app.db_manager.get_statistics() if self.app.db_manager.collection is not None else {}
+        pool_stats = self.app.db_manager.get_pool_stats()
+        cache_stats = self.app.db_manager.get_cache_stats()
         
         stats_text = f"""Total Registered Users: {total_users}
 Currently Online: {online_count}
 Total User Sessions: {total_sessions}
 Total Time Spent: {self.app.user_manager.format_duration(total_time)}
 Total Questions in Database: {db_stats.get('total', 0)}
-Total Questions Created by Users: {total_questions}"""
+Total Questions Created by Users: {total_questions}
+
+Connection Pool: {pool_stats.get('open_connections', 0)} open, {pool_stats.get('checked_out', 0)} in use (max {pool_stats.get('max_pool_size', 0)})
+Pool Checkouts: {pool_stats.get('checkouts', 0)} (failed: {pool_stats.get('checkout_failures', 0)})
+Checkout Wait: avg {pool_stats.get('avg_wait_ms', 0)} ms, max {pool_stats.get('max_wait_ms', 0)} ms
+Statistics Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate, TTL {cache_stats['ttl_seconds']}s)"""
         
         self.stats_text.insert(1.0, stats_text)
     
@@ -423,7 +430,7 @@ class UserDetailsDialog:
     
     def load_user_data(self):
         """Load and display user data"""
-        if not hasattr(self.app, 'user_manager') or not self.app.user_manager.collection:
+        if not hasattr(self.app, 'user_manager') or self.app.user_manager.collection is None:
             tk.Label(
                 self.content_frame,
                 text="User database not connected",
@@ -5,8 +5,26 @@ Browse tab for viewing and editing questions
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import datetime
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from .base_tab import BaseTab
+from .progress_dialog import ProgressDialog
+from database.db_manager import DuplicateQuestionError
+from models.question import QuestionFilter
+from utils.constants import (
+    QUESTION_PREVIEW_LENGTH, LOCAL_SEARCH_MAX_RESULTS, SEARCH_DEBOUNCE_MS,
+    SEARCH_COUNT_LIMIT, SEARCH_MAX_TIME_MS
+)
 from utils.helpers import export_questions_to_csv, safe_grab_set, validate_question
+from utils.search_index import SearchIndex, INDEXED_FIELDS, FILTER_FIELDS
+
+# Search modes offered next to the search box
+SEARCH_MODES = {
+    'Text (ranked)': QuestionFilter.SEARCH_TEXT,
+    'Local (in-memory)': QuestionFilter.SEARCH_LOCAL,
+    'Fuzzy (in-memory)': QuestionFilter.SEARCH_FUZZY,
+    'Advanced (regex)': QuestionFilter.SEARCH_REGEX
+}
 
 
 class BrowseTab(BaseTab):
@@ -14,7 +32,28 @@ class BrowseTab(BaseTab):
         super().__init__(parent, app)
         self.current_questions = []
         self.current_page = 0
+        self.current_query = {}
+        self.total_count = 0
+        # Set while total_count only counts up to SEARCH_COUNT_LIMIT matches
+        self.count_is_lower_bound = False
+        self.page_anchor = (None, None)
+        self.has_prev_page = False
+        self.has_next_page = False
+        self.search_index = None
+        self.local_results = None
+        
+        # Search-as-you-type state; only the newest search's results are shown
+        self.search_after_id = None
+        self.last_search_text = ''
+        self.search_sequence = 0
+        self.pending_sequence = 0
+        self.search_results = queue.Queue()
+        self.search_executor = ThreadPoolExecutor(max_workers=1)
+        self.polling_search = False
         self.setup()
+        
+        # Keep the local search index in step with this app's writes
+        self.app.db_manager.add_write_listener(self.on_question_written)
     
     def setup(self):
         """Setup browse and edit tab"""
@@ -48,10 +87,22 @@ class BrowseTab(BaseTab):
             bg=self.app.colors['bg']
         ).pack(side=tk.LEFT, padx=5)
         
-        self.search_entry = tk.Entry(search_frame, font=('Arial', 11))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self.on_search_text_changed)
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=('Arial', 11))
         self.search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         self.search_entry.bind('<Return>', lambda e: self.search_questions())
         
+        self.search_mode = ttk.Combobox(
+            search_frame,
+            values=list(SEARCH_MODES),
+            font=('Arial', 10),
+            state='readonly',
+            width=16
+        )
+        self.search_mode.pack(side=tk.LEFT, padx=5)
+        self.search_mode.current(0)
+        
         self.create_button(
             search_frame,
             "🔍 Search",
@@ -308,7 +359,7 @@ class BrowseTab(BaseTab):
         subject = self.filter_subject.get()
         if subject == 'All':
             # Get all unique topics from database
-            if self.app.db_manager.collection:
+            if self.app.db_manager.collection is not None:
                 topics = self.app.db_manager.get_distinct_values("topic")
                 self.filter_topic['values'] = ['All'] + sorted(topics)
                 
@@ -329,128 +380,332 @@ class BrowseTab(BaseTab):
         self.filter_topic.current(0)
         self.filter_classification.current(0)
     
+    def build_question_filter(self, search_text=None, partial_word=False):
+        """Build a question filter from the current filter controls
+        
+        partial_word marks search_text as still being typed.
+        """
+        question_filter = QuestionFilter()
+        question_filter.subject = self.filter_subject.get()
+        question_filter.topic = self.filter_topic.get()
+        question_filter.classification = self.filter_classification.get()
+        question_filter.level = self.filter_level.get()
+        
+        if self.filter_created_by.get() == 'My Questions':
+            question_filter.created_by = self.app.username
+        
+        question_filter.search_text = search_text
+        question_filter.search_mode = SEARCH_MODES[self.search_mode.get()]
+        question_filter.partial_word = partial_word
+        return question_filter
+    
     def apply_filters(self):
         """Apply filters and refresh questions list"""
-        if not self.app.db_manager.collection:
+        if self.app.db_manager.collection is None:
             messagebox.showwarning("Database Error", "Database not connected")
             return
         
-        try:
-            # Build filter query
-            query = {}
-            
-            # Subject filter
-            subject = self.filter_subject.get()
-            if subject != 'All':
-                query['subject'] = subject
-            
-            # Topic filter
-            topic = self.filter_topic.get()
-            if topic != 'All':
-                query['topic'] = topic
-            
-            # Classification filter
-            classification = self.filter_classification.get()
-            if classification != 'All':
-                query['classification'] = classification
-            
-            # Level filter
-            level = self.filter_level.get()
-            if level != 'All':
-                query['level'] = level
-            
-            # Created by filter
-            created_by = self.filter_created_by.get()
-            if created_by == 'My Questions':
-                query['created_by'] = self.app.username
-            
-            # Get questions
-            self.current_questions = self.app.db_manager.find_questions(query)
-            self.app.current_page = 0
-            
-            # Update display
-            self.display_questions()
-            
-            self.update_status(f"Found {len(self.current_questions)} questions matching filters")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to apply filters: {str(e)}")
+        self.cancel_live_search()
+        self.start_search(None)
     
     def search_questions(self):
         """Search questions"""
-        if not self.app.db_manager.collection:
+        if self.app.db_manager.collection is None:
             messagebox.showwarning("Database Error", "Database not connected")
             return
         
+        self.cancel_live_search()
         search_text = self.search_entry.get().strip()
         if not search_text:
-            self.apply_filters()
+            self.start_search(None)
             return
         
+        question_filter = self.build_question_filter(search_text)
+        if question_filter.is_local_search() and not self.index_covers(question_filter):
+            subject = question_filter.subject if question_filter.subject != 'All' else None
+            self.load_search_index([subject] if subject else None, lambda: self.start_search(search_text))
+            return
+        
+        self.start_search(search_text)
+    
+    def on_search_text_changed(self, *args):
+        """Restart the debounce timer whenever the search text changes"""
+        search_text = self.search_var.get().strip()
+        if search_text == self.last_search_text:
+            return
+        self.last_search_text = search_text
+        
+        if self.search_after_id is not None:
+            self.frame.after_cancel(self.search_after_id)
+        self.search_after_id = self.frame.after(SEARCH_DEBOUNCE_MS, self.start_live_search)
+    
+    def start_live_search(self):
+        """Run the typed search once typing pauses"""
+        self.search_after_id = None
+        if self.app.db_manager.collection is None:
+            return
+        
+        search_text = self.search_entry.get().strip()
+        
+        # Local searches only run as you type once the index is loaded
+        question_filter = self.build_question_filter(search_text or None)
+        if question_filter.is_local_search() and search_text and not self.index_covers(question_filter):
+            return
+        
+        self.start_search(search_text or None, partial_word=True)
+    
+    def index_covers(self, question_filter):
+        """Check whether the loaded local index holds the questions of the filtered subject"""
+        index = self.search_index
+        if index is None:
+            return False
+        subject = question_filter.subject if question_filter.subject != 'All' else None
+        return index.subjects is None or (subject is not None and subject in index.subjects)
+    
+    def start_search(self, search_text, partial_word=False):
+        """Run a search, or just the filters without search_text, on the worker thread"""
+        question_filter = self.build_question_filter(search_text, partial_word)
+        
+        # Newer searches invalidate older ones; stale results are dropped
+        self.search_sequence += 1
+        sequence = self.pending_sequence = self.search_sequence
+        per_page = self.app.questions_per_page
+        index = self.search_index
+        
+        def run():
+            if sequence != self.search_sequence:
+                return
+            try:
+                result = self.run_live_search(question_filter, index, per_page)
+                self.search_results.put((sequence, search_text, result, None))
+            except Exception as e:
+                self.search_results.put((sequence, search_text, None, e))
+        
+        self.search_executor.submit(run)
+        if not self.polling_search:
+            self.polling_search = True
+            self.frame.after(50, self.poll_search_results)
+    
+    def cancel_live_search(self):
+        """Drop any pending or running search-as-you-type query"""
+        if self.search_after_id is not None:
+            self.frame.after_cancel(self.search_after_id)
+            self.search_after_id = None
+        self.search_sequence += 1
+    
+    def run_live_search(self, question_filter, index, per_page):
+        """Fetch the first page and the match count; runs on the worker thread
+        
+        Searches count at most SEARCH_COUNT_LIMIT matches; filters alone are
+        counted exactly. Returns (query, local result IDs, questions,
+        has_more, count, whether count is only a lower bound).
+        """
+        db_manager = self.app.db_manager
+        query = question_filter.to_query()
+        
+        if question_filter.is_local_search() and question_filter.search_text:
+            fuzzy = question_filter.search_mode == QuestionFilter.SEARCH_FUZZY
+            ids = [question_id for question_id, _ in
+                   index.search(question_filter.search_text, query, LOCAL_SEARCH_MAX_RESULTS, fuzzy)]
+            questions = db_manager.get_questions_by_ids(ids[:per_page], list_view=True)
+            return query, ids, questions, len(ids) > per_page, len(ids), False
+        
+        if '$text' in query:
+            questions, has_more = db_manager.search_questions_page(
+                query, 0, per_page, list_view=True, max_time_ms=SEARCH_MAX_TIME_MS
+            )
+        else:
+            questions, has_more = db_manager.find_questions_page(
+                query, per_page, list_view=True, max_time_ms=SEARCH_MAX_TIME_MS
+            )
+        
+        count = len(questions)
+        count_is_lower_bound = False
+        if has_more and question_filter.search_text:
+            count = db_manager.count_questions(query, limit=SEARCH_COUNT_LIMIT, max_time_ms=SEARCH_MAX_TIME_MS)
+            count_is_lower_bound = count >= SEARCH_COUNT_LIMIT
+        elif has_more:
+            count = db_manager.count_questions(query)
+        return query, None, questions, has_more, count, count_is_lower_bound
+    
+    def poll_search_results(self):
+        """Show the newest search's results once the worker delivers them"""
+        latest = None
         try:
-            # Build search query
-            query = {
-                "$or": [
-                    {"question": {"$regex": search_text, "$options": "i"}},
-                    {"subject": {"$regex": search_text, "$options": "i"}},
-                    {"topic": {"$regex": search_text, "$options": "i"}},
-                    {"classification": {"$regex": search_text, "$options": "i"}},
-                    {"created_by": {"$regex": search_text, "$options": "i"}}
-                ]
-            }
-            
-            # Apply existing filters
-            subject = self.filter_subject.get()
-            if subject != 'All':
-                query['subject'] = subject
-            
-            topic = self.filter_topic.get()
-            if topic != 'All':
-                query['topic'] = topic
-            
-            classification = self.filter_classification.get()
-            if classification != 'All':
-                query['classification'] = classification
-            
-            level = self.filter_level.get()
-            if level != 'All':
-                query['level'] = level
-            
-            created_by = self.filter_created_by.get()
-            if created_by == 'My Questions':
-                query['created_by'] = self.app.username
-            
-            # Get questions
-            self.current_questions = self.app.db_manager.find_questions(query)
-            self.app.current_page = 0
-            
-            # Update display
-            self.display_questions()
-            
-            self.update_status(f"Found {len(self.current_questions)} questions matching '{search_text}'")
+            while True:
+                result = self.search_results.get_nowait()
+                if result[0] == self.search_sequence:
+                    latest = result
+        except queue.Empty:
+            pass
+        
+        if latest is None:
+            # Keep waiting unless the search was cancelled meanwhile
+            if self.pending_sequence == self.search_sequence:
+                self.frame.after(50, self.poll_search_results)
+            else:
+                self.polling_search = False
+            return
+        
+        self.polling_search = False
+        _, search_text, result, error = latest
+        if error:
+            self.update_status(f"Search failed: {str(error)}", self.app.colors['danger'])
+            return
+        
+        query, local_results, questions, has_more, count, count_is_lower_bound = result
+        self.current_query = query
+        self.local_results = local_results
+        self.total_count = count
+        self.count_is_lower_bound = count_is_lower_bound
+        self.app.current_page = 0
+        self.page_anchor = (None, None)
+        self.has_prev_page = False
+        self.has_next_page = has_more
+        self.current_questions = questions
+        self.display_questions()
+        
+        shown = f"{count}+" if count_is_lower_bound else str(count)
+        if not search_text:
+            self.update_status(f"Found {shown} questions matching filters")
+        elif local_results is not None:
+            self.update_status(f"Found {shown} questions matching '{search_text}' in the local index")
+        else:
+            self.update_status(f"Found {shown} questions matching '{search_text}'")
+    
+    def load_search_index(self, subjects, on_loaded):
+        """Load the questions of subjects (None for all) into a new in-memory index"""
+        query = {'subject': {'$in': subjects}} if subjects else {}
+        total = self.app.db_manager.count_questions(query)
+        index = SearchIndex(subjects)
+        
+        # Writes made while loading go straight into the new index
+        self.search_index = index
+        
+        def task(progress, cancel_event):
+            questions = self.app.db_manager.iter_questions(
+                query, fields=['_id'] + list(dict.fromkeys(list(INDEXED_FIELDS) + FILTER_FIELDS))
+            )
+            return index.build(
+                questions,
+                progress_callback=lambda count: progress(count, total, f"Indexed {count} of {total} questions"),
+                cancel_event=cancel_event
+            )
+        
+        def on_complete(count, error, cancelled):
+            if error or cancelled:
+                self.search_index = None
+                if error:
+                    messagebox.showerror("Search Error", f"Failed to load the local index: {str(error)}")
+                return
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to search: {str(e)}")
+            self.update_status(f"✓ Loaded {count} questions into the local search index")
+            on_loaded()
+        
+        ProgressDialog(self.app, "Loading Local Search Index", task, on_complete, total=total)
+    
+    def on_question_written(self, operation, question_id, question):
+        """Apply a question write to the local search index; may run on a worker thread"""
+        index = self.search_index
+        if index is not None:
+            index.on_write(operation, question_id, question)
+    
+    def load_first_page(self, query):
+        """Start paging through the questions matching query"""
+        self.current_query = query
+        self.local_results = None
+        self.total_count = self.app.db_manager.count_questions(query)
+        self.count_is_lower_bound = False
+        self.app.current_page = 0
+        self.load_page()
+    
+    def load_page(self, after=None, before=None):
+        """Fetch a single page of questions around the given keyset cursor"""
+        if self.local_results is not None:
+            self.load_local_page()
+            return
+        
+        if '$text' in self.current_query:
+            self.load_ranked_page()
+            return
+        
+        questions, has_more = self.app.db_manager.find_questions_page(
+            self.current_query,
+            self.app.questions_per_page,
+            after=after,
+            before=before,
+            list_view=True
+        )
+        
+        if before is not None:
+            self.has_next_page = True
+            self.has_prev_page = has_more
+        else:
+            self.has_next_page = has_more
+            self.has_prev_page = after is not None
+        
+        self.page_anchor = (after, before)
+        self.current_questions = questions
+        self.display_questions()
+    
+    def load_ranked_page(self):
+        """Fetch the current page of a text search, ordered by relevance"""
+        questions, has_more = self.app.db_manager.search_questions_page(
+            self.current_query,
+            self.app.current_page,
+            self.app.questions_per_page,
+            list_view=True
+        )
+        
+        self.has_next_page = has_more
+        self.has_prev_page = self.app.current_page > 0
+        self.page_anchor = (None, None)
+        self.current_questions = questions
+        self.display_questions()
+    
+    def load_local_page(self):
+        """Fetch the current page of a local search from its ranked question IDs"""
+        start = self.app.current_page * self.app.questions_per_page
+        page_ids = self.local_results[start:start + self.app.questions_per_page]
+        
+        self.has_next_page = start + self.app.questions_per_page < len(self.local_results)
+        self.has_prev_page = self.app.current_page > 0
+        self.page_anchor = (None, None)
+        self.current_questions = self.app.db_manager.get_questions_by_ids(page_ids, list_view=True)
+        self.display_questions()
+    
+    def reload_page(self):
+        """Reload the current page after questions were changed"""
+        after, before = self.page_anchor
+        if self.local_results is None:
+            self.total_count = self.app.db_manager.count_questions(self.current_query)
+            self.count_is_lower_bound = False
+        self.load_page(after=after, before=before)
+        
+        # The page may have emptied out, e.g. after deleting its last question
+        if not self.current_questions and self.app.current_page > 0:
+            if self.local_results is not None:
+                self.app.current_page = 0
+                self.load_page()
+            else:
+                self.load_first_page(self.current_query)
     
     def display_questions(self):
         """Display questions in treeview"""
+        # Keep the selection across live refreshes of the list
+        selected = {self.questions_tree.item(item)['tags'][0] for item in self.questions_tree.selection()}
+        
         # Clear existing items
         for item in self.questions_tree.get_children():
             self.questions_tree.delete(item)
         
-        # Calculate pagination
-        total_pages = max(1, (len(self.current_questions) + self.app.questions_per_page - 1) // self.app.questions_per_page)
-        self.app.current_page = min(self.app.current_page, total_pages - 1)
-        
-        start_idx = self.app.current_page * self.app.questions_per_page
-        end_idx = min(start_idx + self.app.questions_per_page, len(self.current_questions))
-        
         # Display questions for current page
-        for i in range(start_idx, end_idx):
-            q = self.current_questions[i]
-            question_text = q.get('question', '')[:60] + '...' if len(q.get('question', '')) > 60 else q.get('question', '')
+        for q in self.current_questions:
+            question_text = q.get('question', '')
+            if len(question_text) > QUESTION_PREVIEW_LENGTH:
+                question_text = question_text[:QUESTION_PREVIEW_LENGTH] + '...'
             
-            self.questions_tree.insert('', 'end', values=(
+            item = self.questions_tree.insert('', 'end', values=(
                 str(q.get('_id', ''))[-8:],  # Show last 8 chars of ID
                 question_text,
                 q.get('subject', ''),
@@ -460,24 +715,81 @@ class BrowseTab(BaseTab):
                 q.get('marks', ''),
                 q.get('created_by', '')
             ), tags=(str(q.get('_id', '')),))  # Store full ID in tags
+            
+            if str(q.get('_id', '')) in selected:
+                self.questions_tree.selection_add(item)
+        
+        if self.app.change_feed:
+            self.app.change_feed.set_visible_ids([q['_id'] for q in self.current_questions if '_id' in q])
         
         # Update pagination controls
-        self.page_label.config(text=f"Page {self.app.current_page + 1} of {total_pages}")
-        self.prev_btn.config(state=tk.NORMAL if self.app.current_page > 0 else tk.DISABLED)
-        self.next_btn.config(state=tk.NORMAL if self.app.current_page < total_pages - 1 else tk.DISABLED)
+        total_pages = max(1, (self.total_count + self.app.questions_per_page - 1) // self.app.questions_per_page)
+        total_pages = max(total_pages, self.app.current_page + 1)
+        self.page_label.config(
+            text=f"Page {self.app.current_page + 1} of {total_pages}" + ("+" if self.count_is_lower_bound else "")
+        )
+        self.prev_btn.config(state=tk.NORMAL if self.has_prev_page else tk.DISABLED)
+        self.next_btn.config(state=tk.NORMAL if self.has_next_page else tk.DISABLED)
+    
+    def query_matches(self, question):
+        """Check a question against the current filters
+        
+        Returns None when the query can't be evaluated locally, e.g. for searches.
+        """
+        if self.local_results is not None:
+            return None
+        if any(key.startswith('$') or isinstance(value, dict) for key, value in self.current_query.items()):
+            return None
+        return all(question.get(key) == value for key, value in self.current_query.items())
+    
+    def apply_question_change(self, operation, question_id, document):
+        """Apply a single changed question to the list without refetching the page"""
+        index = next((i for i, q in enumerate(self.current_questions) if q.get('_id') == question_id), None)
+        matches = self.query_matches(document) if document else False
+        
+        if index is not None:
+            if operation == 'delete' or matches is False:
+                del self.current_questions[index]
+                self.total_count = max(0, self.total_count - 1)
+                if self.local_results is not None and question_id in self.local_results:
+                    self.local_results.remove(question_id)
+            else:
+                self.current_questions[index] = document
+        elif operation == 'insert' and matches:
+            self.total_count += 1
+            
+            # Newest questions come first, so they only show up on the first page
+            if self.app.current_page == 0:
+                self.current_questions.insert(0, document)
+                if len(self.current_questions) > self.app.questions_per_page:
+                    self.current_questions.pop()
+                    self.has_next_page = True
+        else:
+            return
+        
+        if not self.current_questions and (self.has_next_page or self.app.current_page > 0):
+            self.reload_page()
+        else:
+            self.display_questions()
     
     def prev_page(self):
         """Go to previous page"""
-        if self.app.current_page > 0:
-            self.app.current_page -= 1
-            self.display_questions()
+        if not self.has_prev_page or not self.current_questions:
+            return
+        
+        self.app.current_page = max(0, self.app.current_page - 1)
+        if self.app.current_page == 0:
+            self.load_page()
+        else:
+            self.load_page(before=self.current_questions[0])
     
     def next_page(self):
         """Go to next page"""
-        total_pages = (len(self.current_questions) + self.app.questions_per_page - 1) // self.app.questions_per_page
-        if self.app.current_page < total_pages - 1:
-            self.app.current_page += 1
-            self.display_questions()
+        if not self.has_next_page or not self.current_questions:
+            return
+        
+        self.app.current_page += 1
+        self.load_page(after=self.current_questions[-1])
     
     def refresh_questions(self):
         """Refresh questions list"""
@@ -485,7 +797,7 @@ class BrowseTab(BaseTab):
     
     def initial_load(self):
         """Initial data load when tab is first shown"""
-        if self.app.db_manager.collection and not hasattr(self, 'data_loaded'):
+        if self.app.db_manager.collection is not None and not hasattr(self, 'data_loaded'):
             self.apply_filters()
             self.data_loaded = True
     
@@ -500,12 +812,12 @@ class BrowseTab(BaseTab):
         item = self.questions_tree.item(selection[0])
         question_id = item['tags'][0]
         
-        # Find question in current list
-        question = None
-        for q in self.current_questions:
-            if str(q.get('_id', '')) == question_id:
-                question = q
-                break
+        # The list only holds a preview, so load the full question
+        try:
+            question = self.app.db_manager.get_question(question_id)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load question: {str(e)}")
+            return
         
         if not question:
             messagebox.showerror("Error", "Question not found")
@@ -514,9 +826,10 @@ class BrowseTab(BaseTab):
         # Create edit dialog
         EditQuestionDialog(self.app, question, self.on_question_updated)
     
-    def on_question_updated(self):
+    def on_question_updated(self, question_id, updates):
         """Callback when question is updated"""
-        self.apply_filters()
+        current = next((q for q in self.current_questions if q.get('_id') == question_id), {})
+        self.apply_question_change('update', question_id, dict(current, **updates))
     
     def delete_question(self):
         """Delete selected question"""
@@ -558,8 +871,8 @@ class BrowseTab(BaseTab):
             # Delete from database
             if self.app.db_manager.delete_question(question_id):
                 messagebox.showinfo("Success", "Question deleted successfully!")
-                self.apply_filters()
-                self.app.refresh_dashboard()
+                # The dashboard follows through the change feed
+                self.apply_question_change('delete', question['_id'], None)
             else:
                 messagebox.showerror("Error", "Failed to delete question")
                 
@@ -573,14 +886,13 @@ class BrowseTab(BaseTab):
             messagebox.showwarning("No Selection", "Please select questions to export")
             return
         
-        # Get selected questions
-        selected_questions = []
-        for item in selection:
-            question_id = self.questions_tree.item(item)['tags'][0]
-            for q in self.current_questions:
-                if str(q.get('_id', '')) == question_id:
-                    selected_questions.append(q)
-                    break
+        # Get full documents for the selected questions
+        question_ids = [self.questions_tree.item(item)['tags'][0] for item in selection]
+        try:
+            selected_questions = self.app.db_manager.get_questions_by_ids(question_ids)
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to load questions: {str(e)}")
+            return
         
         if not selected_questions:
             return
@@ -867,14 +1179,18 @@ class EditQuestionDialog:
                 return
             
             # Update in database
-            self.app.db_manager.update_question(str(self.question['_id']), updated)
+            try:
+                self.app.db_manager.update_question(str(self.question['_id']), updated)
+            except DuplicateQuestionError as e:
+                messagebox.showwarning("Duplicate Question", str(e))
+                return
             
             messagebox.showinfo("Success", "Question updated successfully!")
             self.dialog.destroy()
             
             # Refresh list
             if self.callback:
-                self.callback()
+                self.callback(self.question['_id'], updated)
             
         except ValueError:
             messagebox.showerror("Invalid Input", "Marks must be a number")
@@ -4,9 +4,12 @@ Dashboard tab for MCQ Database Manager
 
 import tkinter as tk
 from .base_tab import BaseTab
+from database.question_stats import summarize_rollups
 from utils.helpers import is_matplotlib_available
 
 if is_matplotlib_available():
+    import matplotlib
+    matplotlib.use('TkAgg')
     import matplotlib.pyplot as plt
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
@@ -15,6 +18,8 @@ class DashboardTab(BaseTab):
     def __init__(self, parent, app):
         super().__init__(parent, app)
         self.stat_cards = {}
+        self.rollup_counts = {}
+        self.redraw_pending = False
         self.setup()
     
     def setup(self):
@@ -103,13 +108,39 @@ class DashboardTab(BaseTab):
     
     def refresh(self):
         """Refresh dashboard statistics"""
-        if not self.app.db_manager.collection:
+        if self.app.db_manager.collection is None:
             return
         
+        self.reload_rollups()
+        self.show_statistics()
+    
+    def reload_rollups(self):
+        """Load the question counts that live changes are applied to"""
+        try:
+            self.rollup_counts = self.app.db_manager.get_question_rollups()
+        except Exception as e:
+            self.update_status(f"Error refreshing dashboard: {str(e)}", self.app.colors['danger'])
+    
+    def apply_rollup_change(self, key, count):
+        """Apply a live change of one rollup count"""
+        if count:
+            self.rollup_counts[key] = count
+        else:
+            self.rollup_counts.pop(key, None)
+    
+    def schedule_redraw(self):
+        """Redraw once a burst of live changes has been applied"""
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.frame.after(500, self.show_statistics)
+    
+    def show_statistics(self):
+        """Show the statistics summed from the local rollup counts"""
+        self.redraw_pending = False
+        
         try:
-            # Get statistics from database
-            stats = self.app.db_manager.get_statistics()
-            my_questions = self.app.db_manager.get_user_questions_count(self.app.username)
+            stats = summarize_rollups(self.rollup_counts, self.app.username)
+            my_questions = stats.get('my_questions', 0)
             
             # Update stat cards
             self.stat_cards["Total Questions"].value_label.config(text=str(stats.get('total', 0)))
@@ -123,14 +154,14 @@ class DashboardTab(BaseTab):
             self.app.total_questions_label.config(text=f"Total Questions: {stats.get('total', 0)}")
             
             # Update charts
-            self.update_charts()
+            self.update_charts(stats)
             
         except Exception as e:
             self.update_status(f"Error refreshing dashboard: {str(e)}", self.app.colors['danger'])
     
-    def update_charts(self):
-        """Update dashboard charts"""
-        if not self.app.db_manager.collection or not is_matplotlib_available():
+    def update_charts(self, stats):
+        """Update dashboard charts from the dashboard statistics"""
+        if self.app.db_manager.collection is None or not is_matplotlib_available():
             return
         
         try:
@@ -144,7 +175,7 @@ class DashboardTab(BaseTab):
                     widget.destroy()
             
             # Subject distribution
-            subject_data = self.app.db_manager.get_subject_distribution()
+            subject_data = stats.get('subject_distribution', [])
             
             if subject_data:
                 # Create bar chart for subjects
@@ -171,7 +202,6 @@ class DashboardTab(BaseTab):
                 canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
             
             # Level distribution (pie chart)
-            stats = self.app.db_manager.get_statistics()
             level_data = [
                 {"_id": "easy", "count": stats.get('easy', 0)},
                 {"_id": "medium", "count": stats.get('medium', 0)},
@@ -5,9 +5,18 @@ Manage tab for subjects, topics, and classifications management
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import datetime
-import json
+import os
 from .base_tab import BaseTab
-from utils.helpers import export_questions_to_csv, import_questions_from_csv, create_backup_data
+from .progress_dialog import ProgressDialog
+from database.bulk_importer import BulkImporter
+from database.batch_import import BatchImport
+from database.import_journal import ImportJournal
+from database.restore import RestoreJob
+from utils.backup import write_backup, detect_backup_format, ZSTD_AVAILABLE
+from utils.helpers import CSV_FIELDS, stream_questions_to_csv, iter_csv_chunks
+from utils.file_ingest import IMPORT_REPORT_PREFIX
+from utils.tabular import PANDAS_AVAILABLE, iter_csv_frames
+from utils.excel import OPENPYXL_AVAILABLE, is_excel_file, iter_xlsx_chunks, stream_questions_to_xlsx
 
 
 class ManageTab(BaseTab):
@@ -205,17 +214,45 @@ class ManageTab(BaseTab):
         
         self.create_button(
             ops_frame,
-            "Import from CSV",
+            "Import CSV/Excel",
             self.import_from_csv,
             'warning'
         ).pack(side=tk.LEFT, padx=5)
         
+        self.create_button(
+            ops_frame,
+            "Import Folder",
+            self.import_folder,
+            'warning'
+        ).pack(side=tk.LEFT, padx=5)
+        
         self.create_button(
             ops_frame,
             "Backup Database",
             self.backup_database,
             'success'
         ).pack(side=tk.LEFT, padx=5)
+        
+        self.create_button(
+            ops_frame,
+            "Restore Backup",
+            self.restore_backup,
+            'danger'
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.create_button(
+            ops_frame,
+            "Backfill Fingerprints",
+            self.backfill_fingerprints,
+            'secondary'
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.create_button(
+            ops_frame,
+            "Verify Statistics",
+            self.verify_statistics,
+            'info'
+        ).pack(side=tk.LEFT, padx=5)
     
     def on_manage_subject_change(self, event=None):
         """Handle subject change in manage tab"""
@@ -293,112 +330,450 @@ class ManageTab(BaseTab):
             messagebox.showinfo("Info", "Classification already exists for this subject")
     
     def export_all_questions(self):
-        """Export all questions from database"""
-        if not self.app.db_manager.collection:
+        """Export all questions from database, streaming them to the file"""
+        if self.app.db_manager.collection is None:
             messagebox.showerror("Database Error", "Database not connected")
             return
         
         try:
-            # Get all questions
-            all_questions = self.app.db_manager.find_questions({})
-            
-            if not all_questions:
-                messagebox.showinfo("No Data", "No questions in database")
-                return
-            
-            # Ask for filename
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                initialfile=f"all_questions_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            )
-            
-            if filename:
-                success, message = export_questions_to_csv(all_questions, filename)
-                
-                if success:
-                    messagebox.showinfo("Success", message)
-                    self.update_status(f"✓ Exported all {len(all_questions)} questions", self.app.colors['success'])
-                else:
-                    messagebox.showerror("Export Error", message)
-                
+            total = self.app.db_manager.count_questions({})
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export: {str(e)}")
+            return
+        
+        if not total:
+            messagebox.showinfo("No Data", "No questions in database")
+            return
+        
+        # Ask for filename; the extension picks the format
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Excel workbooks", "*.xlsx"), ("All files", "*.*")],
+            initialfile=f"all_questions_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        
+        if not filename:
+            return
+        
+        if is_excel_file(filename) and not OPENPYXL_AVAILABLE:
+            messagebox.showerror("Export Error", "Excel export requires the 'openpyxl' package")
+            return
+        
+        write_questions = stream_questions_to_xlsx if is_excel_file(filename) else stream_questions_to_csv
+        
+        def task(progress, cancel_event):
+            cursor = self.app.db_manager.iter_questions({}, fields=CSV_FIELDS)
+            try:
+                return write_questions(
+                    cursor,
+                    filename,
+                    progress_callback=lambda count: progress(count, total, f"Exported {count} of ~{total} questions"),
+                    cancel_event=cancel_event
+                )
+            finally:
+                cursor.close()
+        
+        def on_complete(count, error, cancelled):
+            if error:
+                messagebox.showerror("Export Error", f"Failed to export: {str(error)}")
+            elif cancelled:
+                self.remove_partial_file(filename)
+                self.update_status(f"Export cancelled after {count} questions", self.app.colors['warning'])
+            else:
+                messagebox.showinfo("Success", f"Exported {count} questions successfully")
+                self.update_status(f"✓ Exported all {count} questions", self.app.colors['success'])
+        
+        ProgressDialog(self.app, "Exporting Questions", task, on_complete, total=total)
+    
+    def remove_partial_file(self, filename):
+        """Remove a partially written output file"""
+        try:
+            if os.path.exists(filename):
+                os.remove(filename)
+        except OSError:
+            pass
     
     def import_from_csv(self):
-        """Import questions from CSV"""
+        """Import questions from a CSV file or Excel workbook in batches"""
+        if self.app.db_manager.collection is None:
+            messagebox.showerror("Database Error", "Database not connected")
+            return
+        
         filename = filedialog.askopenfilename(
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[
+                ("Question files", "*.csv *.xlsx"),
+                ("CSV files", "*.csv"),
+                ("Excel workbooks", "*.xlsx"),
+                ("All files", "*.*")
+            ]
         )
         
         if not filename:
             return
         
-        success, result = import_questions_from_csv(filename)
+        if is_excel_file(filename) and not OPENPYXL_AVAILABLE:
+            messagebox.showerror("Import Error", "Excel import requires the 'openpyxl' package")
+            return
+        
+        journal = ImportJournal.for_file(filename)
+        already_imported = journal.load()
+        if already_imported:
+            answer = messagebox.askyesnocancel(
+                "Resume Import",
+                f"A previous import of this file stopped after {already_imported} rows.\n\n"
+                "Yes: resume from there\nNo: import the whole file again"
+            )
+            if answer is None:
+                return
+            if not answer:
+                journal.discard()
+        
+        importer = BulkImporter(self.app.db_manager, self.app.username, journal=journal)
         
-        if not success:
-            messagebox.showerror("Import Error", result)
+        def task(progress, cancel_event):
+            def on_progress(report):
+                progress(report['read'], None, f"Imported {report['imported']} questions ({report['read']} rows read)")
+            
+            if is_excel_file(filename):
+                return importer.run(iter_xlsx_chunks(filename, importer.batch_size), on_progress, cancel_event)
+            if PANDAS_AVAILABLE:
+                # Validate each chunk column-wise instead of row by row
+                with iter_csv_frames(filename, importer.batch_size) as frames:
+                    return importer.run_frames(frames, on_progress, cancel_event)
+            return importer.run(iter_csv_chunks(filename, importer.batch_size), on_progress, cancel_event)
+        
+        def on_complete(report, error, cancelled):
+            report = importer.report
+            if report['imported']:
+                self.app.update_all_combos()
+                self.app.refresh_dashboard()
+            
+            if journal.error:
+                resume_hint = f"Progress couldn't be recorded for resuming ({journal.error})."
+            else:
+                resume_hint = "Import the file again to resume after the last saved batch."
+            
+            if error:
+                messagebox.showerror(
+                    "Import Error",
+                    f"Failed to import: {str(error)}\n\nImported before the error: {report['imported']} questions\n"
+                    + resume_hint
+                )
+                return
+            
+            if cancelled:
+                messagebox.showinfo(
+                    "Import Cancelled",
+                    f"Import cancelled after {report['read']} rows; {report['imported']} questions were imported.\n"
+                    + resume_hint
+                )
+                self.update_status(f"Import cancelled after {report['imported']} questions", self.app.colors['warning'])
+                return
+            
+            message = (
+                f"Imported: {report['imported']} questions\n"
+                f"Already imported by an earlier run: {report['resumed']}\n"
+                f"Duplicates skipped: {report['duplicates']}\n"
+                f"Repeated rows skipped: {report['repeated']}\n"
+                f"Invalid rows skipped: {report['invalid']}"
+            )
+            if report['errors']:
+                message += "\n\n" + "\n".join(report['errors'][:10])
+            if report['repeats']:
+                message += "\n\n" + "\n".join(report['repeats'][:10])
+            
+            messagebox.showinfo("Import Complete", message)
+            self.update_status(f"✓ Imported {report['imported']} questions from {os.path.basename(filename)}", self.app.colors['success'])
+        
+        ProgressDialog(self.app, "Importing Questions", task, on_complete)
+    
+    def import_folder(self):
+        """Import every JSON, JSONL and CSV question file in a folder, parsing files in parallel"""
+        if self.app.db_manager.collection is None:
+            messagebox.showerror("Database Error", "Database not connected")
             return
         
-        questions = result
-        imported = 0
-        duplicates = 0
+        directory = filedialog.askdirectory(title="Select a folder of question files")
+        if not directory:
+            return
         
-        try:
-            for row in questions:
-                # Check for duplicate
-                if not self.app.db_manager.check_duplicate(row.get('subject', ''), row.get('question', '')):
-                    # Add created_by if not present
-                    if 'created_by' not in row or not row['created_by']:
-                        row['created_by'] = self.app.username
-                    
-                    self.app.db_manager.insert_questions([row], self.app.username)
-                    imported += 1
-                else:
-                    duplicates += 1
+        job = BatchImport(
+            self.app.db_manager,
+            self.app.username,
+            directory,
+            user_manager=getattr(self.app, 'user_manager', None)
+        )
+        
+        if not job.files:
+            messagebox.showinfo("No Files", "No JSON, JSONL or CSV files found in this folder")
+            return
+        
+        if not messagebox.askyesno("Import Folder", f"Import questions from {len(job.files)} files?"):
+            return
+        
+        def task(progress, cancel_event):
+            def on_progress(done, total, file_report):
+                progress(done, total, f"Imported {done} of {total} files ({job.report['imported']} questions)")
+            
+            return job.run(on_progress, cancel_event)
+        
+        def on_complete(report, error, cancelled):
+            report = job.report
+            if report['imported']:
+                self.app.update_all_combos()
+                self.app.refresh_dashboard()
             
-            messagebox.showinfo(
-                "Import Complete",
-                f"Imported: {imported} questions\nDuplicates skipped: {duplicates}"
+            # The per-file summary goes next to the imported files
+            report_file = os.path.join(
+                directory, f"{IMPORT_REPORT_PREFIX}{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             )
+            try:
+                job.write_report(report_file)
+            except OSError as e:
+                report_file = f"not written ({str(e)})"
             
-            self.app.refresh_dashboard()
-            self.update_status(f"✓ Imported {imported} questions from CSV", self.app.colors['success'])
+            if error:
+                messagebox.showerror(
+                    "Import Error",
+                    f"Failed to import: {str(error)}\n\nImported before the error: {report['imported']} questions"
+                )
+                return
             
-        except Exception as e:
-            messagebox.showerror("Import Error", f"Failed to import: {str(e)}")
+            message = (
+                f"Files: {len(job.file_reports)} of {report['files']}"
+                + (" (cancelled)" if cancelled else "") + "\n"
+                f"Imported: {report['imported']} questions\n"
+                f"Duplicates skipped: {report['duplicates']}\n"
+                f"Repeated across files skipped: {report['repeated']}\n"
+                f"Invalid questions skipped: {report['invalid']}\n"
+                f"Unreadable files: {report['failed_files']}\n\n"
+                f"Per-file report: {report_file}"
+            )
+            messagebox.showinfo("Import Complete", message)
+            self.update_status(f"✓ Imported {report['imported']} questions from {len(job.file_reports)} files", self.app.colors['success'])
+        
+        ProgressDialog(self.app, "Importing Folder", task, on_complete, total=len(job.files))
     
     def backup_database(self):
-        """Backup entire database"""
-        if not self.app.db_manager.collection:
+        """Backup entire database, streaming questions into a (compressed) JSON/JSONL file"""
+        if self.app.db_manager.collection is None:
             messagebox.showerror("Database Error", "Database not connected")
             return
         
         try:
-            # Get all questions
-            all_questions = self.app.db_manager.find_questions({})
-            
-            if not all_questions:
-                messagebox.showinfo("No Data", "No questions to backup")
+            total = self.app.db_manager.count_questions({})
+        except Exception as e:
+            messagebox.showerror("Backup Error", f"Failed to backup: {str(e)}")
+            return
+        
+        if not total:
+            messagebox.showinfo("No Data", "No questions to backup")
+            return
+        
+        # Create backup filename; the extension picks format and compression
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".jsonl.gz",
+            filetypes=[
+                ("Compressed JSON Lines", "*.jsonl.gz"),
+                ("Zstandard JSON Lines", "*.jsonl.zst"),
+                ("JSON Lines", "*.jsonl"),
+                ("JSON files", "*.json"),
+                ("All files", "*.*")
+            ],
+            initialfile=f"mcq_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+        )
+        
+        if not filename:
+            return
+        
+        if detect_backup_format(filename)[1] == 'zstd' and not ZSTD_AVAILABLE:
+            messagebox.showerror("Backup Error", "Zstandard compression requires the 'zstandard' package")
+            return
+        
+        subject_data = self.app.config_manager.subject_data
+        
+        def task(progress, cancel_event):
+            cursor = self.app.db_manager.iter_questions({})
+            try:
+                return write_backup(
+                    cursor,
+                    filename,
+                    subject_data,
+                    total=total,
+                    progress_callback=lambda count: progress(count, total, f"Backed up {count} of ~{total} questions"),
+                    cancel_event=cancel_event
+                )
+            finally:
+                cursor.close()
+        
+        def on_complete(count, error, cancelled):
+            if error:
+                self.remove_partial_file(filename)
+                messagebox.showerror("Backup Error", f"Failed to backup: {str(error)}")
+            elif cancelled:
+                self.remove_partial_file(filename)
+                self.update_status("Backup cancelled", self.app.colors['warning'])
+            else:
+                messagebox.showinfo("Success", f"Backed up {count} questions to:\n{filename}")
+                self.update_status(f"✓ Database backed up successfully", self.app.colors['success'])
+        
+        ProgressDialog(self.app, "Backing Up Database", task, on_complete, total=total)
+    
+    def restore_backup(self):
+        """Restore questions from a JSON/JSONL backup, optionally compressed"""
+        if self.app.db_manager.collection is None:
+            messagebox.showerror("Database Error", "Database not connected")
+            return
+        
+        filename = filedialog.askopenfilename(
+            filetypes=[
+                ("Backup files", "*.json *.jsonl *.gz *.zst"),
+                ("All files", "*.*")
+            ]
+        )
+        
+        if not filename:
+            return
+        
+        if detect_backup_format(filename)[1] == 'zstd' and not ZSTD_AVAILABLE:
+            messagebox.showerror("Restore Error", "Zstandard compression requires the 'zstandard' package")
+            return
+        
+        job = RestoreJob(self.app.db_manager, filename)
+        
+        resume = False
+        already_restored = job.load_checkpoint()
+        if already_restored:
+            answer = messagebox.askyesnocancel(
+                "Resume Restore",
+                f"A previous restore of this file stopped after {already_restored} questions.\n\n"
+                "Yes: resume from there\nNo: restore the whole file again"
+            )
+            if answer is None:
                 return
+            resume = answer
+        elif not messagebox.askyesno(
+            "Restore Backup",
+            "Questions from the backup will overwrite questions with the same ID.\nContinue?"
+        ):
+            return
+        
+        def task(progress, cancel_event):
+            def on_progress(restored, meta):
+                total = meta.get('expected_questions') or meta.get('total_questions')
+                progress(restored, total, f"Restored {restored}" + (f" of {total}" if total else "") + " questions")
             
-            # Create backup filename
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-                initialfile=f"mcq_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            )
+            return job.run(resume=resume, progress_callback=on_progress, cancel_event=cancel_event)
+        
+        def on_complete(report, error, cancelled):
+            if job.meta.get('subject_data') and self.app.config_manager.merge_subject_data(job.meta['subject_data']):
+                self.app.update_all_combos()
             
-            if filename:
-                # Create backup data
-                backup_data = create_backup_data(all_questions, self.app.config_manager.subject_data)
-                
-                # Save to JSON
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(backup_data, f, indent=2, ensure_ascii=False)
-                
-                messagebox.showinfo("Success", f"Backed up {len(all_questions)} questions to:\n{filename}")
-                self.update_status(f"✓ Database backed up successfully", self.app.colors['success'])
-                
-        except Exception as e:
-            messagebox.showerror("Backup Error", f"Failed to backup: {str(e)}")
\ No newline at end of file
+            self.app.refresh_dashboard()
+            
+            if error:
+                messagebox.showerror(
+                    "Restore Error",
+                    f"Failed to restore: {str(error)}\n\nRun the restore again to resume from the last checkpoint."
+                )
+            elif cancelled:
+                self.update_status("Restore cancelled; run it again to resume", self.app.colors['warning'])
+            else:
+                message = f"Restored: {report['restored']} questions"
+                if report['skipped']:
+                    message += f"\nAlready restored earlier: {report['skipped']}"
+                if report['conflicts']:
+                    message += f"\nSkipped (same question under another ID): {report['conflicts']}"
+                messagebox.showinfo("Restore Complete", message)
+                self.update_status(f"✓ Restored {report['restored']} questions", self.app.colors['success'])
+        
+        ProgressDialog(self.app, "Restoring Backup", task, on_complete)
+    
+    def offer_fingerprint_backfill(self):
+        """Offer to backfill fingerprints when some questions were stored before they existed"""
+        try:
+            missing = self.app.db_manager.count_missing_fingerprints()
+        except Exception:
+            return
+        
+        if missing and messagebox.askyesno(
+            "Backfill Fingerprints",
+            f"{missing} questions were stored before duplicate-detection fingerprints existed.\n"
+            "Until they are fingerprinted, imports check them by exact text only.\n\n"
+            "Compute their fingerprints and near-duplicate (LSH) keys now?"
+        ):
+            self.run_fingerprint_backfill(missing)
+    
+    def backfill_fingerprints(self):
+        """Add content fingerprints to questions stored before they existed"""
+        if self.app.db_manager.collection is None:
+            messagebox.showerror("Database Error", "Database not connected")
+            return
+        
+        if not messagebox.askyesno(
+            "Backfill Fingerprints",
+            "Compute duplicate-detection fingerprints and near-duplicate (LSH) keys\n"
+            "for all questions that don't have them yet?\n"
+            "This may take a while on large databases."
+        ):
+            return
+        
+        self.run_fingerprint_backfill()
+    
+    def run_fingerprint_backfill(self, total=None):
+        """Run the fingerprint backfill in a progress dialog"""
+        def task(progress, cancel_event):
+            return self.app.db_manager.backfill_fingerprints(
+                progress_callback=lambda updated, conflicts: progress(
+                    updated + conflicts, total, f"Fingerprinted {updated} questions, {conflicts} conflicts"
+                ),
+                cancel_event=cancel_event
+            )
+        
+        def on_complete(result, error, cancelled):
+            if error:
+                messagebox.showerror("Backfill Error", f"Failed to backfill fingerprints: {str(error)}")
+            elif cancelled:
+                self.update_status(
+                    f"Backfill cancelled after {result['updated']} questions; run it again to continue",
+                    self.app.colors['warning']
+                )
+            else:
+                message = f"Fingerprinted: {result['updated']} questions"
+                if result['conflicts']:
+                    message += f"\nNormalized duplicates left unchanged: {result['conflicts']}"
+                messagebox.showinfo("Backfill Complete", message)
+                self.update_status(f"✓ Fingerprinted {result['updated']} questions", self.app.colors['success'])
+        
+        ProgressDialog(self.app, "Backfilling Fingerprints", task, on_complete, total=total)
+    
+    def verify_statistics(self):
+        """Check the question count rollups and rebuild them if they drifted"""
+        if self.app.db_manager.collection is None:
+            messagebox.showerror("Database Error", "Database not connected")
+            return
+        
+        def task(progress, cancel_event):
+            progress(0, None, "Comparing statistics with the questions...")
+            drift = self.app.db_manager.verify_question_stats()
+            if drift and not cancel_event.is_set():
+                progress(0, None, f"Rebuilding statistics ({len(drift)} counters drifted)...")
+                self.app.db_manager.rebuild_question_stats()
+            return drift
+        
+        def on_complete(drift, error, cancelled):
+            if error:
+                messagebox.showerror("Statistics Error", f"Failed to verify statistics: {str(error)}")
+            elif cancelled:
+                self.update_status("Statistics verification cancelled", self.app.colors['warning'])
+            elif not drift:
+                self.update_status("✓ Statistics are up to date", self.app.colors['success'])
+            else:
+                self.app.refresh_dashboard()
+                messagebox.showinfo(
+                    "Statistics Rebuilt",
+                    f"{len(drift)} counters had drifted from the questions and were rebuilt."
+                )
+                self.update_status(f"✓ Rebuilt statistics ({len(drift)} counters repaired)", self.app.colors['success'])
+        
+        ProgressDialog(self.app, "Verifying Statistics", task, on_complete)
\ No newline at end of file
@@ -2,16 +2,25 @@
 Processor tab for importing questions from JSON
 """
 
+import io
+import os
+import queue
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
+import pyperclip
 from .base_tab import BaseTab
-from utils.helpers import parse_json_questions, export_questions_to_csv
+from database.import_journal import ImportJournal
+from database.import_pipeline import ImportPipeline
+from utils.constants import IMPORT_EVENTS_POLL_MS
+from utils.helpers import export_questions_to_csv
 
 
 class ProcessorTab(BaseTab):
     def __init__(self, parent, app):
         super().__init__(parent, app)
         self.processed_questions = []
+        self.pipeline = None
+        self.source = ''
         self.setup()
     
     def setup(self):
@@ -55,6 +64,20 @@ class ProcessorTab(BaseTab):
             'secondary'
         ).pack(side=tk.LEFT, padx=(0, 10))
         
+        self.create_button(
+            button_frame,
+            "Load JSON File",
+            self.load_json_file,
+            'secondary'
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.create_button(
+            button_frame,
+            "Process Clipboard",
+            self.process_clipboard,
+            'secondary'
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
         self.save_json_btn = self.create_button(
             button_frame,
             "Save to Database",
@@ -86,6 +109,22 @@ class ProcessorTab(BaseTab):
             bg=self.app.colors['bg']
         ).pack()
         
+        # Progress
+        progress_frame = tk.Frame(container, bg=self.app.colors['bg'])
+        progress_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=100)
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        
+        self.cancel_btn = self.create_button(
+            progress_frame,
+            "Cancel",
+            self.cancel_pipeline,
+            'danger'
+        )
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.RIGHT)
+        
         # Results
         results_frame = self.create_label_frame(container, "Processing Results")
         results_frame.pack(fill=tk.BOTH, expand=True)
@@ -105,80 +144,207 @@ class ProcessorTab(BaseTab):
             messagebox.showwarning("No Input", "Please paste JSON data first")
             return
         
-        # Parse JSON
-        success, result, suggested_topics, suggested_classifications = parse_json_questions(json_text)
+        self.start_processing(lambda: io.StringIO(json_text), "JSON")
+    
+    def load_json_file(self):
+        """Process questions streamed from a JSON file"""
+        filename = filedialog.askopenfilename(
+            filetypes=[("JSON files", "*.json"), ("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        
+        if not filename:
+            return
+        
+        self.start_processing(lambda: open(filename, 'r', encoding='utf-8'), os.path.basename(filename))
+    
+    def process_clipboard(self):
+        """Process questions straight from the clipboard, without pasting them into the editor"""
+        try:
+            text = pyperclip.paste()
+        except Exception:
+            try:
+                text = self.app.root.clipboard_get()
+            except tk.TclError:
+                text = ''
+        
+        if not text or not text.strip():
+            messagebox.showwarning("No Input", "The clipboard is empty")
+            return
         
-        if not success:
-            messagebox.showerror("Error", result)
+        self.start_processing(lambda: io.StringIO(text), "clipboard")
+    
+    def start_processing(self, open_stream, source):
+        """Check questions from a text source for problems and duplicates in the background"""
+        if self.pipeline:
             return
         
-        questions = result
+        self.processed_questions = []
+        self.save_json_btn.config(state=tk.DISABLED)
+        self.export_csv_btn.config(state=tk.DISABLED)
         
-        # Clear results
         self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, f"Processing questions from {source}...\n\n")
+        if self.app.db_manager.collection is None:
+            self.results_text.insert(tk.END, "⚠️ Database not connected. Cannot check for duplicates.\n\n")
         
-        # Process AI suggestions if enabled
-        if self.auto_add_topics_var.get() and (suggested_topics or suggested_classifications):
-            self.results_text.insert(tk.END, "AI Suggestions found:\n")
-            
-            # Process suggested topics
-            if suggested_topics:
-                for topic in suggested_topics:
-                    # Find which subject this topic belongs to
-                    for q in questions:
-                        if q.get('topic') == topic:
-                            subject = q.get('subject', '')
-                            if subject and self.app.config_manager.add_topic_to_subject(subject, topic):
-                                self.results_text.insert(tk.END, f"✓ Added new topic '{topic}' to subject '{subject}'\n")
-                            break
-            
-            # Process suggested classifications
-            if suggested_classifications:
-                for classification in suggested_classifications:
-                    for q in questions:
-                        if q.get('classification') == classification:
-                            subject = q.get('subject', '')
-                            if subject and self.app.config_manager.add_classification_to_subject(subject, classification):
-                                self.results_text.insert(tk.END, f"✓ Added new classification '{classification}' to subject '{subject}'\n")
-                            break
-            
-            self.results_text.insert(tk.END, "\n")
+        self.source = source
+        self.run_pipeline(ImportPipeline(
+            self.app.db_manager,
+            self.app.username,
+            open_stream=open_stream,
+            near_duplicate_threshold=self.app.config_manager.near_duplicate_threshold
+        ))
+    
+    def run_pipeline(self, pipeline):
+        """Start an import pipeline and show its results as they arrive"""
+        self.pipeline = pipeline
+        self.progress_bar.config(value=0)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.update_status("Processing..." if not pipeline.insert else "Saving to database...")
         
-        # Check for duplicates
-        duplicates = []
-        new_questions = []
+        pipeline.start()
+        self.frame.after(IMPORT_EVENTS_POLL_MS, self.poll_pipeline)
+    
+    def cancel_pipeline(self):
+        """Stop the running import at the next batch boundary"""
+        if self.pipeline:
+            self.pipeline.cancel()
+            self.cancel_btn.config(state=tk.DISABLED)
+            self.update_status("Cancelling...")
+    
+    def poll_pipeline(self):
+        """Show queued import results on the Tk main thread"""
+        pipeline = self.pipeline
+        latest_progress = None
         
-        if self.app.db_manager.collection:
-            for q in questions:
-                # Check for duplicates based on question and subject
-                if self.app.db_manager.check_duplicate(q.get('subject', ''), q.get('question', '')):
-                    duplicates.append(q['question'])
+        try:
+            while True:
+                event = pipeline.events.get_nowait()
+                kind = event[0]
+                
+                if kind == 'done':
+                    self.finish_pipeline(pipeline, event[1], event[2])
+                    return
+                elif kind == 'progress':
+                    latest_progress = event[1]
+                elif kind == 'accepted':
+                    self.processed_questions.extend(event[1])
                 else:
-                    new_questions.append(q)
+                    self.show_pipeline_result(kind, event[1])
+        except queue.Empty:
+            pass
+        
+        if latest_progress:
+            self.show_progress(latest_progress)
+        
+        self.frame.after(IMPORT_EVENTS_POLL_MS, self.poll_pipeline)
+    
+    def show_progress(self, report):
+        """Update the progress bar and status from a pipeline report"""
+        if report['total']:
+            handled = report['new'] + report['invalid'] + report['repeated'] + report['duplicates'] + report['resumed']
+            self.progress_bar.config(value=100 * handled / report['total'])
+        elif report['size']:
+            self.progress_bar.config(value=100 * report['position'] / report['size'])
+        
+        if not self.pipeline.cancelled:
+            if self.pipeline.insert:
+                self.update_status(f"Saving... {report['imported']} questions saved")
+            else:
+                self.update_status(f"Processing... {report['read']} questions read, {report['new']} new")
+    
+    def show_pipeline_result(self, kind, items):
+        """Append one batch of skipped or reported questions to the results"""
+        if kind == 'invalid':
+            for number, message in items:
+                self.results_text.insert(tk.END, f"✗ Question {number} skipped: {message}\n")
+        elif kind == 'repeated':
+            for q in items:
+                self.results_text.insert(tk.END, f"Repeated (first copy kept): {q.get('question', '')[:80]}...\n")
+        elif kind == 'duplicates':
+            for q in items:
+                self.results_text.insert(tk.END, f"Duplicate: {q.get('question', '')[:80]}...\n")
+        elif kind == 'paraphrases':
+            for q, similarity, existing_question in items:
+                self.results_text.insert(tk.END, f"Possible paraphrase: {q.get('question', '')[:80]}...\n")
+                self.results_text.insert(
+                    tk.END,
+                    f"   ≈ {similarity:.0%} similar to: {existing_question.get('question', '')[:80]}...\n"
+                )
+    
+    def finish_pipeline(self, pipeline, report, error):
+        """Show the outcome of a finished import pipeline"""
+        self.pipeline = None
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.progress_bar.config(value=0 if error or pipeline.cancelled else 100)
+        
+        if pipeline.insert:
+            self.finish_saving(pipeline, report, error)
         else:
-            new_questions = questions
-            self.results_text.insert(tk.END, "⚠️ Database not connected. Cannot check for duplicates.\n\n")
+            self.finish_processing(pipeline, report, error)
+    
+    def finish_processing(self, pipeline, report, error):
+        """Summarize a processing run and enable saving its new questions"""
+        if error:
+            self.processed_questions = []
+            messagebox.showerror("Error", f"Failed to process questions: {str(error)}")
+            self.update_status("Processing failed", self.app.colors['danger'])
+            return
         
-        # Display results
-        self.results_text.insert(tk.END, f"Total questions in JSON: {len(questions)}\n")
-        self.results_text.insert(tk.END, f"New questions: {len(new_questions)}\n")
-        self.results_text.insert(tk.END, f"Duplicate questions: {len(duplicates)}\n\n")
+        if pipeline.cancelled:
+            self.processed_questions = []
+            self.results_text.insert(tk.END, "\nProcessing cancelled.\n")
+            self.update_status("Processing cancelled")
+            return
         
-        if duplicates:
-            self.results_text.insert(tk.END, "Duplicate questions found:\n")
-            for i, dup in enumerate(duplicates, 1):
-                self.results_text.insert(tk.END, f"{i}. {dup[:80]}...\n")
+        if not report['read']:
+            message = "No questions found in JSON"
+            if report['warning']:
+                message += f"\n\n{report['warning']}"
+            messagebox.showerror("Error", message)
+            self.update_status("No questions found")
+            return
         
-        # Store processed questions
-        self.processed_questions = new_questions
+        # Process AI suggestions if enabled
+        suggested_topics = pipeline.meta.get('suggested_topics') or []
+        suggested_classifications = pipeline.meta.get('suggested_classifications') or []
+        if self.auto_add_topics_var.get() and (suggested_topics or suggested_classifications):
+            self.results_text.insert(tk.END, "\nAI Suggestions found:\n")
+            
+            # Add each suggestion to the subject of the first question using it
+            for topic in suggested_topics:
+                subject = report['topic_subjects'].get(topic)
+                if subject and self.app.config_manager.add_topic_to_subject(subject, topic):
+                    self.results_text.insert(tk.END, f"✓ Added new topic '{topic}' to subject '{subject}'\n")
+            
+            for classification in suggested_classifications:
+                subject = report['classification_subjects'].get(classification)
+                if subject and self.app.config_manager.add_classification_to_subject(subject, classification):
+                    self.results_text.insert(tk.END, f"✓ Added new classification '{classification}' to subject '{subject}'\n")
+        
+        # Display results
+        self.results_text.insert(tk.END, "\n")
+        if report['warning']:
+            self.results_text.insert(tk.END, f"⚠️ {report['warning']}\nThe complete questions before that point were kept.\n\n")
+        self.results_text.insert(tk.END, f"Total questions read from {self.source}: {report['read']}\n")
+        self.results_text.insert(tk.END, f"Invalid questions: {report['invalid']}\n")
+        self.results_text.insert(tk.END, f"Repeated questions: {report['repeated']}\n")
+        self.results_text.insert(tk.END, f"Duplicate questions: {report['duplicates']}\n")
+        if report['paraphrases']:
+            threshold = self.app.config_manager.near_duplicate_threshold
+            self.results_text.insert(
+                tk.END,
+                f"Possible paraphrases of existing questions (similarity ≥ {threshold:.0%}): {report['paraphrases']}\n"
+            )
+        self.results_text.insert(tk.END, f"New questions: {report['new']}\n")
         
         # Enable buttons if there are new questions
-        if new_questions:
+        if self.processed_questions:
             self.save_json_btn.config(state=tk.NORMAL)
             self.export_csv_btn.config(state=tk.NORMAL)
-            self.update_status(f"Processed {len(questions)} questions. {len(new_questions)} are new.")
+            self.update_status(f"Processed {report['read']} questions. {report['new']} are new.")
         else:
-            self.update_status("All questions are duplicates!")
+            self.update_status("No new questions to save!")
     
     def save_json_to_db(self):
         """Save processed questions to database"""
@@ -186,44 +352,72 @@ class ProcessorTab(BaseTab):
             messagebox.showwarning("No Data", "No new questions to save")
             return
         
-        if not self.app.db_manager.collection:
+        if self.app.db_manager.collection is None:
             messagebox.showerror("Database Error", "Database not connected")
             return
         
-        try:
-            # Insert questions
-# Insert questions
-            count = self.app.db_manager.insert_questions(self.processed_questions, self.app.username)
-            
-            # Update user's question count
-            if hasattr(self.app, 'user_manager') and self.app.user_manager.collection:
-                self.app.user_manager.update_questions_created(self.app.username, count)
-            
-            messagebox.showinfo(
-                "Success", 
-                f"Successfully saved {count} questions to database!"
-            )
-
-            
-            # Clear inputs
-            self.json_input.delete(1.0, tk.END)
-            self.results_text.delete(1.0, tk.END)
-            self.results_text.insert(tk.END, f"✓ Saved {count} questions to database")
-            
-            # Disable buttons
-            self.save_json_btn.config(state=tk.DISABLED)
-            self.export_csv_btn.config(state=tk.DISABLED)
-            
+        if self.pipeline:
+            return
+        
+        self.save_json_btn.config(state=tk.DISABLED)
+        self.export_csv_btn.config(state=tk.DISABLED)
+        
+        self.run_pipeline(ImportPipeline(
+            self.app.db_manager,
+            self.app.username,
+            questions=self.processed_questions,
+            insert=True,
+            user_manager=getattr(self.app, 'user_manager', None),
+            journal=ImportJournal.for_questions(self.processed_questions)
+        ))
+    
+    def finish_saving(self, pipeline, report, error):
+        """Show the outcome of saving the processed questions"""
+        count = report['imported']
+        
+        if count:
             # Update combos
             self.app.update_all_combos()
             
             # Refresh dashboard
             self.app.refresh_dashboard()
+        
+        if error or pipeline.cancelled:
+            # Questions saved before stopping are duplicates when saving again
+            self.save_json_btn.config(state=tk.NORMAL)
+            self.export_csv_btn.config(state=tk.NORMAL)
             
-            self.update_status(f"✓ {count} questions saved to database", self.app.colors['success'])
+            if pipeline.journal.error:
+                resume_hint = f"Progress couldn't be recorded for resuming ({pipeline.journal.error})."
+            else:
+                resume_hint = "Save again to resume after the last saved batch."
             
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to save to database:\n{str(e)}")
+            if error:
+                messagebox.showerror(
+                    "Database Error",
+                    f"Failed to save to database:\n{str(error)}\n\nSaved before the error: {count} questions\n"
+                    + resume_hint
+                )
+            else:
+                messagebox.showinfo("Cancelled", f"Saving cancelled. {count} questions were saved.")
+            self.update_status(f"{count} questions saved to database")
+            return
+        
+        message = f"Successfully saved {count} questions to database!"
+        if report['resumed']:
+            message += f"\n{report['resumed']} questions were already saved by an earlier attempt."
+        skipped = report['invalid'] + report['repeated'] + report['duplicates']
+        if skipped:
+            message += f"\n\n{skipped} questions were skipped as invalid or duplicates."
+        messagebox.showinfo("Success", message)
+        
+        # Clear inputs
+        self.processed_questions = []
+        self.json_input.delete(1.0, tk.END)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, f"✓ Saved {count} questions to database")
+        
+        self.update_status(f"✓ {count} questions saved to database", self.app.colors['success'])
     
     def export_to_csv(self):
         """Export questions to CSV"""
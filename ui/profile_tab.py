@@ -179,7 +179,7 @@ class ProfileTab(BaseTab):
     
     def load_profile(self):
         """Load user profile data"""
-        if not hasattr(self.app, 'user_manager') or not self.app.user_manager.collection:
+        if not hasattr(self.app, 'user_manager') or self.app.user_manager.collection is None:
             return
         
         try:
@@ -213,7 +213,7 @@ class ProfileTab(BaseTab):
     
     def load_statistics(self):
         """Load user statistics"""
-        if not hasattr(self.app, 'user_manager') or not self.app.user_manager.collection:
+        if not hasattr(self.app, 'user_manager') or self.app.user_manager.collection is None:
             return
         
         try:
@@ -255,7 +255,7 @@ class ProfileTab(BaseTab):
     
     def load_recent_sessions(self):
         """Load recent sessions"""
-        if not hasattr(self.app, 'user_manager') or not self.app.user_manager.collection:
+        if not hasattr(self.app, 'user_manager') or self.app.user_manager.collection is None:
             return
         
         try:
@@ -279,7 +279,7 @@ class ProfileTab(BaseTab):
     
     def save_profile(self):
         """Save profile information"""
-        if not hasattr(self.app, 'user_manager') or not self.app.user_manager.collection:
+        if not hasattr(self.app, 'user_manager') or self.app.user_manager.collection is None:
             messagebox.showerror("Error", "Database not connected")
             return
         
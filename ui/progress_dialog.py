@@ -0,0 +1,146 @@
+"""
+Progress dialog for long-running background operations
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import queue
+import threading
+from utils.helpers import safe_grab_set
+
+
+class ProgressDialog:
+    """Dialog that runs a task on a worker thread, showing progress with a Cancel button
+    
+    The task is called as task(progress, cancel_event) on the worker thread.
+    It reports progress by calling progress(done, total, message) and should
+    stop between batches once cancel_event is set. When it finishes,
+    on_complete(result, error, cancelled) runs on the Tk main thread.
+    """
+    
+    POLL_INTERVAL_MS = 100
+    
+    def __init__(self, app, title, task, on_complete, total=None):
+        self.app = app
+        self.task = task
+        self.on_complete = on_complete
+        self.total = total
+        self.cancel_event = threading.Event()
+        self.events = queue.Queue()
+        
+        # Create dialog
+        self.dialog = tk.Toplevel(app.root)
+        self.dialog.title(title)
+        self.dialog.geometry("450x160")
+        self.dialog.transient(app.root)
+        self.dialog.configure(bg=app.colors['white'])
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        # Center dialog
+        self.dialog.update_idletasks()
+        x = (self.dialog.winfo_screenwidth() - 450) // 2
+        y = (self.dialog.winfo_screenheight() - 160) // 2
+        self.dialog.geometry(f"450x160+{x}+{y}")
+        
+        # Make dialog modal
+        self.dialog.update()
+        self.dialog.after(100, lambda: safe_grab_set(self.dialog))
+        
+        self.setup_ui()
+        
+        # Start the worker
+        self.thread = threading.Thread(target=self.run_task, daemon=True)
+        self.thread.start()
+        self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+    
+    def setup_ui(self):
+        """Setup progress dialog UI"""
+        container = tk.Frame(self.dialog, bg=self.app.colors['white'], padx=20, pady=15)
+        container.pack(fill=tk.BOTH, expand=True)
+        
+        self.message_label = tk.Label(
+            container,
+            text="Starting...",
+            font=('Arial', 11),
+            bg=self.app.colors['white'],
+            anchor='w'
+        )
+        self.message_label.pack(fill=tk.X, pady=(0, 10))
+        
+        self.progress_bar = ttk.Progressbar(
+            container,
+            mode='determinate' if self.total else 'indeterminate',
+            maximum=self.total or 100
+        )
+        self.progress_bar.pack(fill=tk.X, pady=(0, 15))
+        if not self.total:
+            self.progress_bar.start(10)
+        
+        self.cancel_btn = tk.Button(
+            container,
+            text="Cancel",
+            command=self.cancel,
+            font=('Arial', 11),
+            bg=self.app.colors['light'],
+            fg=self.app.colors['dark'],
+            padx=30,
+            pady=5,
+            cursor='hand2',
+            relief=tk.FLAT
+        )
+        self.cancel_btn.pack()
+    
+    def run_task(self):
+        """Run the task on the worker thread"""
+        try:
+            result = self.task(self.report_progress, self.cancel_event)
+            self.events.put(('done', result, None))
+        except Exception as e:
+            self.events.put(('done', None, e))
+    
+    def report_progress(self, done, total=None, message=''):
+        """Queue a progress update; safe to call from the worker thread"""
+        self.events.put(('progress', (done, total, message), None))
+    
+    def cancel(self):
+        """Ask the task to stop at the next batch boundary"""
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.message_label.config(text="Cancelling...")
+    
+    def poll(self):
+        """Apply queued worker events on the Tk main thread"""
+        latest_progress = None
+        
+        try:
+            while True:
+                kind, value, error = self.events.get_nowait()
+                if kind == 'done':
+                    self.finish(value, error)
+                    return
+                latest_progress = value
+        except queue.Empty:
+            pass
+        
+        if latest_progress:
+            self.show_progress(*latest_progress)
+        
+        self.dialog.after(self.POLL_INTERVAL_MS, self.poll)
+    
+    def show_progress(self, done, total, message):
+        """Update the progress bar and message"""
+        total = total or self.total
+        if total:
+            if str(self.progress_bar['mode']) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate')
+            self.progress_bar.config(maximum=total, value=min(done, total))
+        
+        if not self.cancel_event.is_set():
+            self.message_label.config(text=message or (f"{done} of {total}" if total else f"{done} processed"))
+    
+    def finish(self, result, error):
+        """Close the dialog and hand the result back"""
+        self.progress_bar.stop()
+        self.dialog.destroy()
+        self.on_complete(result, error, self.cancel_event.is_set())
@@ -0,0 +1,161 @@
+"""
+Streaming backup files for MCQ Database Manager
+"""
+
+import datetime
+import gzip
+import io
+import json
+from .json_stream import iter_object_array
+
+# Check zstandard availability
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+BACKUP_FORMAT_VERSION = 2
+
+# Marker keys of the first and last line of a JSONL backup
+JSONL_HEADER_KEY = 'backup_header'
+JSONL_FOOTER_KEY = 'backup_footer'
+
+
+def detect_backup_format(filename):
+    """Get (format, compression) of a backup file from its name
+    
+    format is 'jsonl' or 'json'; compression is None, 'gzip' or 'zstd'.
+    """
+    name = filename.lower()
+    compression = None
+    
+    if name.endswith('.gz'):
+        compression = 'gzip'
+        name = name[:-3]
+    elif name.endswith('.zst'):
+        compression = 'zstd'
+        name = name[:-4]
+    
+    file_format = 'jsonl' if name.endswith('.jsonl') else 'json'
+    return file_format, compression
+
+
+def open_backup_file(filename, mode, compression=None):
+    """Open a backup file as text, transparently (de)compressing it
+    
+    mode is 'r' or 'w'.
+    """
+    if compression == 'gzip':
+        return gzip.open(filename, mode + 't', encoding='utf-8')
+    
+    if compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        
+        raw = open(filename, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    
+    return open(filename, mode, encoding='utf-8', newline='' if mode == 'w' else None)
+
+
+def _json_default(value):
+    """Serialize ObjectIds and datetimes the way backups always have"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def serialize_question(question):
+    """Serialize a question document to a single JSON line"""
+    return json.dumps(question, ensure_ascii=False, default=_json_default)
+
+
+def write_backup(questions, filename, subject_data, total=None, progress_callback=None,
+                 cancel_event=None, progress_every=1000):
+    """Stream questions from an iterable (e.g. a cursor) into a backup file
+    
+    The format and compression follow the file name (see detect_backup_format).
+    JSONL backups start with a header line holding the manifest and
+    subject_data and end with a footer line holding the final count. JSON
+    backups keep the classic single-object layout, written incrementally.
+    Stops early once cancel_event is set. Returns the number of questions written.
+    """
+    file_format, compression = detect_backup_format(filename)
+    manifest = {
+        'format_version': BACKUP_FORMAT_VERSION,
+        'backup_date': datetime.datetime.now().isoformat(),
+        'expected_questions': total,
+        'compression': compression
+    }
+    count = 0
+    
+    with open_backup_file(filename, 'w', compression) as f:
+        if file_format == 'jsonl':
+            header = dict(manifest, subject_data=subject_data)
+            f.write(json.dumps({JSONL_HEADER_KEY: header}, ensure_ascii=False) + '\n')
+        else:
+            f.write('{\n')
+            for key, value in manifest.items():
+                f.write(f'{json.dumps(key)}: {json.dumps(value)},\n')
+            f.write(f'"subject_data": {json.dumps(subject_data, ensure_ascii=False)},\n')
+            f.write('"questions": [\n')
+        
+        for q in questions:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            
+            if file_format == 'json' and count:
+                f.write(',\n')
+            f.write(serialize_question(q))
+            if file_format == 'jsonl':
+                f.write('\n')
+            count += 1
+            
+            if progress_callback and count % progress_every == 0:
+                progress_callback(count)
+        
+        if file_format == 'jsonl':
+            f.write(json.dumps({JSONL_FOOTER_KEY: {'total_questions': count}}) + '\n')
+        else:
+            f.write(f'\n],\n"total_questions": {count}\n}}\n')
+    
+    if progress_callback:
+        progress_callback(count)
+    
+    return count
+
+
+def iter_backup_questions(filename, meta=None):
+    """Stream the questions of a backup file of any supported format
+    
+    Handles the classic JSON layout as well as JSONL, optionally compressed.
+    Backup metadata (backup_date, subject_data, counts, ...) is collected in
+    meta as it is encountered while iterating.
+    """
+    if meta is None:
+        meta = {}
+    
+    file_format, compression = detect_backup_format(filename)
+    
+    with open_backup_file(filename, 'r', compression) as f:
+        if file_format == 'json':
+            yield from iter_object_array(f, 'questions', meta)
+            return
+        
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            record = json.loads(line)
+            if JSONL_HEADER_KEY in record:
+                meta.update(record[JSONL_HEADER_KEY])
+            elif JSONL_FOOTER_KEY in record:
+                meta.update(record[JSONL_FOOTER_KEY])
+            else:
+                yield record
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Streaming Excel (.xlsx) import and export of questions
+"""
+
+from .helpers import CSV_FIELDS, clean_csv_row
+
+# Check openpyxl availability
+try:
+    import openpyxl
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+EXCEL_SHEET_TITLE = 'Questions'
+
+
+def is_excel_file(filename):
+    """Check whether a file name refers to an Excel workbook"""
+    return filename.lower().endswith('.xlsx')
+
+
+def _cell_text(value):
+    """Convert a cell value to the text a CSV file would hold"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _excel_value(value):
+    """Drop control characters that can't be stored in a worksheet cell"""
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub('', value)
+    return value
+
+
+def iter_xlsx_chunks(filename, chunk_size):
+    """Read questions from the first sheet of a workbook in chunks of at most chunk_size rows
+    
+    The workbook is opened in read-only mode, so rows are parsed from the
+    file as they are iterated instead of loading the whole sheet. The first
+    row holds the column names, as in a CSV file.
+    """
+    workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [_cell_text(value).strip() for value in next(rows, ())]
+        chunk = []
+        
+        for values in rows:
+            if not any(value is not None for value in values):
+                continue
+            
+            row = {name: _cell_text(value) for name, value in zip(header, values) if name}
+            chunk.append(clean_csv_row(row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        
+        if chunk:
+            yield chunk
+    finally:
+        workbook.close()
+
+
+def stream_questions_to_xlsx(questions, filename, progress_callback=None, cancel_event=None, progress_every=1000):
+    """Write questions to a workbook as they arrive from an iterable such as a cursor
+    
+    The workbook is created in write-only mode, which serializes each row
+    as it is appended, so memory stays flat however many questions there
+    are. Stops early once cancel_event is set. Returns the number of rows
+    written.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(EXCEL_SHEET_TITLE)
+    sheet.append(CSV_FIELDS)
+    count = 0
+    
+    for q in questions:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        
+        sheet.append([_excel_value(q.get(field, '')) for field in CSV_FIELDS])
+        count += 1
+        
+        if progress_callback and count % progress_every == 0:
+            progress_callback(count)
+    
+    workbook.save(filename)
+    
+    if progress_callback:
+        progress_callback(count)
+    
+    return count
@@ -0,0 +1,117 @@
+"""
+Question file parsing for batch imports
+
+The functions here run in worker processes, so they are top-level
+functions that only take and return picklable values.
+"""
+
+import csv
+import fnmatch
+import glob
+import json
+import os
+from .constants import IMPORT_JOURNAL_DIR
+from .helpers import read_json_questions, clean_csv_row, validate_question
+
+# File types a batch import picks up from a directory
+QUESTION_FILE_EXTENSIONS = ('.json', '.jsonl', '.csv')
+
+# Per-file summaries a folder import writes into the folder it imported
+IMPORT_REPORT_PREFIX = 'import_report_'
+
+# Files the app itself writes next to imported files; never question files
+GENERATED_FILE_PATTERNS = (
+    IMPORT_REPORT_PREFIX + '*.csv',
+    '*.import-journal.jsonl',
+    '*.restore-checkpoint.json'
+)
+
+# Only the first few errors of each file are kept for the report
+MAX_FILE_ERRORS = 20
+
+
+def find_question_files(pattern):
+    """Expand a directory (searched recursively) or a glob pattern into question files
+    
+    Reports, journals and checkpoints written by earlier imports are left out.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '**', '*')
+    
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and path.lower().endswith(QUESTION_FILE_EXTENSIONS)
+        and not is_generated_file(path)
+    )
+
+
+def is_generated_file(path):
+    """Check whether a file is an import report, journal or restore checkpoint"""
+    name = os.path.basename(path).lower()
+    if any(fnmatch.fnmatch(name, pattern) for pattern in GENERATED_FILE_PATTERNS):
+        return True
+    return os.path.basename(os.path.dirname(os.path.abspath(path))) == IMPORT_JOURNAL_DIR
+
+
+def _iter_jsonl(f):
+    """Yield each line's question, or the ValueError of a malformed line"""
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+def parse_question_file(path):
+    """Parse and validate the questions of a JSON, JSONL or CSV file
+    
+    Returns a dict with the file path, its valid questions, the number of
+    questions read and found invalid, the first MAX_FILE_ERRORS errors, a
+    warning when a JSON file was cut short, and the error that stopped the
+    file from being read at all, if any.
+    """
+    result = {
+        'file': path,
+        'questions': [],
+        'read': 0,
+        'invalid': 0,
+        'errors': [],
+        'warning': None,
+        'error': None
+    }
+    
+    try:
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, 'r', encoding='utf-8', newline='' if extension == '.csv' else None) as f:
+            if extension == '.csv':
+                rows = (clean_csv_row(row) for row in csv.DictReader(f))
+            elif extension == '.jsonl':
+                rows = _iter_jsonl(f)
+            else:
+                success, rows, _, _, result['warning'] = read_json_questions(f)
+                if not success:
+                    result['error'] = rows
+                    return result
+            
+            for row in rows:
+                result['read'] += 1
+                
+                if isinstance(row, ValueError):
+                    is_valid, message = False, f"Invalid JSON: {str(row)}"
+                elif not isinstance(row, dict):
+                    is_valid, message = False, "Not a question object"
+                else:
+                    is_valid, message = validate_question(row)
+                if is_valid:
+                    result['questions'].append(row)
+                else:
+                    result['invalid'] += 1
+                    if len(result['errors']) < MAX_FILE_ERRORS:
+                        result['errors'].append(f"Question {result['read']}: {message}")
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        result['error'] = str(e)
+    
+    return result
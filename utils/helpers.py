@@ -6,7 +6,11 @@ import datetime
 import random
 import csv
 import json
-from tkinter import messagebox
+import hashlib
+import importlib.util
+import unicodedata
+from .constants import DIFFICULTY_LEVELS
+from .json_stream import JSONStreamParser
 
 
 def generate_random_seed():
@@ -24,18 +28,25 @@ def safe_grab_set(window):
         pass  # Some window managers don't support grab
 
 
+# Columns written to and read from question CSV files
+CSV_FIELDS = ['subject', 'topic', 'classification', 'question',
+              'option1', 'option2', 'option3', 'option4',
+              'correctAnswer', 'level', 'marks', 'created_by']
+
+# Fields every question must have a value for
+REQUIRED_QUESTION_FIELDS = ['subject', 'topic', 'classification', 'level', 'question',
+                            'option1', 'option2', 'option3', 'option4', 'correctAnswer']
+
+
 def export_questions_to_csv(questions, filename):
     """Export questions to CSV file"""
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['subject', 'topic', 'classification', 'question', 
-                        'option1', 'option2', 'option3', 'option4', 
-                        'correctAnswer', 'level', 'marks', 'created_by']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
             
             writer.writeheader()
             for q in questions:
-                row = {field: q.get(field, '') for field in fieldnames}
+                row = {field: q.get(field, '') for field in CSV_FIELDS}
                 writer.writerow(row)
         
         return True, f"Exported {len(questions)} questions successfully"
@@ -43,6 +54,69 @@ def export_questions_to_csv(questions, filename):
         return False, f"Failed to export: {str(e)}"
 
 
+def stream_questions_to_csv(questions, filename, progress_callback=None, cancel_event=None, progress_every=1000):
+    """Write questions to CSV as they arrive from an iterable such as a cursor
+    
+    Rows are flushed to disk at every progress step, so memory stays flat and
+    output appears immediately. Stops early once cancel_event is set.
+    Returns the number of rows written.
+    """
+    count = 0
+    
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        csvfile.flush()
+        
+        for q in questions:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            
+            writer.writerow({field: q.get(field, '') for field in CSV_FIELDS})
+            count += 1
+            
+            if count % progress_every == 0:
+                csvfile.flush()
+                if progress_callback:
+                    progress_callback(count)
+    
+    if progress_callback:
+        progress_callback(count)
+    
+    return count
+
+
+def parse_marks(value):
+    """Parse marks as a whole number; empty means the default of 1, None that they're invalid"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return 1
+    try:
+        marks = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(marks) if marks.is_integer() else None
+
+
+def clean_csv_row(row):
+    """Normalize a question row read from CSV"""
+    # Convert marks to int; invalid marks are kept for validate_question to report
+    marks = parse_marks(row.get('marks'))
+    if marks is not None:
+        row['marks'] = marks
+    
+    # Levels are stored lowercase, as the statistics count them
+    if isinstance(row.get('level'), str):
+        row['level'] = row['level'].strip().lower()
+    
+    # Ensure topic and classification are strings
+    if not row.get('topic'):
+        row['topic'] = ''
+    if not row.get('classification'):
+        row['classification'] = ''
+    
+    return row
+
+
 def import_questions_from_csv(filename):
     """Import questions from CSV file"""
     try:
@@ -52,25 +126,29 @@ def import_questions_from_csv(filename):
             reader = csv.DictReader(csvfile)
             
             for row in reader:
-                # Convert marks to int
-                try:
-                    row['marks'] = int(row.get('marks', 1))
-                except:
-                    row['marks'] = 1
-                
-                # Ensure topic and classification are strings
-                if not row.get('topic'):
-                    row['topic'] = ''
-                if not row.get('classification'):
-                    row['classification'] = ''
-                
-                questions.append(row)
+                questions.append(clean_csv_row(row))
         
         return True, questions
     except Exception as e:
         return False, str(e)
 
 
+def iter_csv_chunks(filename, chunk_size):
+    """Read questions from a CSV file in chunks of at most chunk_size rows"""
+    with open(filename, 'r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        chunk = []
+        
+        for row in reader:
+            chunk.append(clean_csv_row(row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        
+        if chunk:
+            yield chunk
+
+
 def parse_json_questions(json_text):
     """Parse JSON text containing questions"""
     try:
@@ -91,15 +169,49 @@ def parse_json_questions(json_text):
         return False, f"An error occurred: {str(e)}", None, None
 
 
+def read_json_questions(fp):
+    """Incrementally parse questions from LLM output or a JSON file
+    
+    Questions are decoded one at a time from the text stream fp with a
+    lenient parser, so code fences, surrounding text and trailing commas
+    are accepted and every complete question before a truncation is kept.
+    Returns (success, questions or error message, suggested topics,
+    suggested classifications, warning) where warning describes where
+    parsing stopped early, or is None.
+    """
+    parser = JSONStreamParser(fp, lenient=True)
+    meta = {}
+    
+    try:
+        questions = [q for q in parser.iter_array('questions', meta) if isinstance(q, dict)]
+    except Exception as e:
+        return False, f"An error occurred: {str(e)}", None, None, None
+    
+    if not questions:
+        message = "No questions found in JSON"
+        if parser.error:
+            message += f" ({parser.error})"
+        return False, message, None, None, None
+    
+    warning = None
+    if parser.error:
+        warning = f"Input ended early or is malformed after {len(questions)} complete questions ({parser.error})"
+    
+    suggested_topics = meta.get('suggested_topics') or []
+    suggested_classifications = meta.get('suggested_classifications') or []
+    
+    return True, questions, suggested_topics, suggested_classifications, warning
+
+
 def validate_question(question):
     """Validate a question object"""
-    required_fields = ['subject', 'topic', 'classification', 'level', 'question',
-                      'option1', 'option2', 'option3', 'option4', 'correctAnswer']
-    
-    for field in required_fields:
+    for field in REQUIRED_QUESTION_FIELDS:
         if not question.get(field):
             return False, f"Missing required field: {field}"
     
+    if str(question['level']).strip().lower() not in DIFFICULTY_LEVELS:
+        return False, f"Level must be one of: {', '.join(DIFFICULTY_LEVELS)}"
+    
     # Check if correct answer matches one of the options
     correct = question['correctAnswer']
     options = [question['option1'], question['option2'], 
@@ -109,14 +221,48 @@ def validate_question(question):
         return False, "Correct answer must match one of the options"
     
     # Validate marks
-    try:
-        int(question.get('marks', 1))
-    except:
+    if parse_marks(question.get('marks', 1)) is None:
         return False, "Marks must be a number"
     
     return True, "Valid"
 
 
+def normalize_text(text):
+    """Normalize text for comparisons: Unicode form, case and whitespace"""
+    text = unicodedata.normalize('NFKC', str(text or ''))
+    return ' '.join(text.casefold().split())
+
+
+def compute_fingerprint(subject, question):
+    """Compute a compact content fingerprint of a question within a subject"""
+    content = f"{normalize_text(subject)}\x1f{normalize_text(question)}"
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def dedupe_questions(questions, seen=None):
+    """Drop questions repeated within a batch, keeping the first occurrence
+    
+    Questions repeat when their fingerprints match, so differences in case,
+    whitespace or Unicode form don't hide a repeat. seen is a set of
+    fingerprints kept earlier (e.g. by previous batches) and is updated in
+    place. Returns (unique questions, dropped questions).
+    """
+    if seen is None:
+        seen = set()
+    
+    unique = []
+    dropped = []
+    for q in questions:
+        fingerprint = compute_fingerprint(q.get('subject', ''), q.get('question', ''))
+        if fingerprint in seen:
+            dropped.append(q)
+        else:
+            seen.add(fingerprint)
+            unique.append(q)
+    
+    return unique, dropped
+
+
 def create_backup_data(questions, subject_data):
     """Create backup data structure"""
     # Convert ObjectId to string for JSON serialization
@@ -136,15 +282,10 @@ def create_backup_data(questions, subject_data):
     }
 
 
-# Check matplotlib availability
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    import matplotlib
-    matplotlib.use('TkAgg')
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+# Check matplotlib availability without importing it, since import workers
+# load this module too; the dashboard imports it when it draws charts
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+if not MATPLOTLIB_AVAILABLE:
     print("Warning: matplotlib not installed. Charts will not be available.")
 
 
@@ -0,0 +1,190 @@
+"""
+Incremental JSON parsing for large question files
+"""
+
+import json
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class JSONStreamParser:
+    """Parses a top-level JSON object from a text stream without loading it whole
+    
+    Values are decoded one at a time with JSONDecoder.raw_decode over a
+    sliding buffer that is refilled from the stream as needed.
+    
+    A lenient parser accepts what LLMs tend to produce: text or markdown
+    code fences around the JSON, a bare array instead of an object, and
+    trailing commas. A syntax error, e.g. from a truncated response, ends
+    the array instead of failing it, so every complete item before it is
+    kept; the error is left in self.error.
+    """
+    
+    def __init__(self, fp, chunk_size=READ_CHUNK_SIZE, lenient=False):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.lenient = lenient
+        self.error = None
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+    
+    def fill(self):
+        """Read the next chunk into the buffer; returns False at end of stream"""
+        if self.eof:
+            return False
+        
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        
+        # Drop the consumed part so the buffer only holds unread data
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self):
+        """Skip whitespace and return the next character, or '' at end of stream"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+    
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be char"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+    
+    def skip_to(self, chars):
+        """Skip ahead to the next of chars and return it, or '' at end of stream"""
+        while True:
+            found = [i for i in (self.buffer.find(c, self.pos) for c in chars) if i >= 0]
+            if found:
+                self.pos = min(found)
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if not self.fill():
+                return ''
+    
+    def skip_to_start(self):
+        """Skip to the bracket that opens the questions, past any brackets in leading text
+        
+        An object must start with a key or be empty, and an array of
+        questions with an object or be empty, so a bracket such as the one
+        in "here are [3] questions:" is passed over. Returns the opening
+        bracket, or '' at end of stream.
+        """
+        while True:
+            char = self.skip_to('{[')
+            if not char or self.next_after_bracket() in ('"}' if char == '{' else '{]'):
+                return char
+            self.pos += 1
+    
+    def next_after_bracket(self):
+        """Return the first non-whitespace character after the bracket at pos, without consuming"""
+        offset = 1
+        while True:
+            while self.pos + offset < len(self.buffer) and self.buffer[self.pos + offset] in _WHITESPACE:
+                offset += 1
+            if self.pos + offset < len(self.buffer):
+                return self.buffer[self.pos + offset]
+            if not self.fill():
+                return ''
+    
+    def skip_comma(self, closing):
+        """Consume a separating comma; returns False if closing follows instead
+        
+        A lenient parser also treats a trailing comma before closing as the end.
+        """
+        if self.peek() != ',':
+            self.expect(closing)
+            return False
+        
+        self.pos += 1
+        if self.lenient and self.peek() == closing:
+            self.pos += 1
+            return False
+        return True
+    
+    def decode_value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            
+            # A number at the very end of the buffer may continue in the next chunk
+            if end >= len(self.buffer) and self.fill():
+                continue
+            
+            self.pos = end
+            return value
+    
+    def iter_array(self, array_key, meta=None):
+        """Yield the items of the array stored under array_key
+        
+        Every other top-level key is decoded whole and stored in meta. A
+        lenient parser also yields the items of a top-level array.
+        """
+        if meta is None:
+            meta = {}
+        
+        if not self.lenient:
+            yield from self._iter_object(array_key, meta)
+            return
+        
+        try:
+            # Skip code fences and any text before the JSON
+            if self.skip_to_start() == '[':
+                yield from self._iter_items()
+            else:
+                yield from self._iter_object(array_key, meta)
+        except ValueError as e:
+            # Positions in decode errors are relative to the buffer, not the stream
+            self.error = getattr(e, 'msg', str(e))
+    
+    def _iter_object(self, array_key, meta):
+        self.expect('{')
+        if self.peek() == '}':
+            return
+        
+        while True:
+            key = self.decode_value()
+            self.expect(':')
+            
+            if key == array_key:
+                yield from self._iter_items()
+            else:
+                meta[key] = self.decode_value()
+            
+            if not self.skip_comma('}'):
+                return
+    
+    def _iter_items(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        
+        while True:
+            yield self.decode_value()
+            if not self.skip_comma(']'):
+                return
+
+
+def iter_object_array(fp, array_key, meta=None):
+    """Yield the items of one array of the top-level JSON object in fp"""
+    return JSONStreamParser(fp).iter_array(array_key, meta)
@@ -0,0 +1,75 @@
+"""
+MinHash signatures and LSH band keys for near-duplicate question detection
+"""
+
+import hashlib
+import random
+import re
+from .helpers import normalize_text
+
+# Words per shingle; word pairs still overlap well for reworded questions
+SHINGLE_SIZE = 2
+
+# 20 bands of 3 rows: questions with a shingle Jaccard similarity of 0.7 share
+# at least one band with >99% probability, at 0.5 with ~93%, at 0.3 with ~42%
+LSH_BANDS = 20
+LSH_ROWS = 3
+MINHASH_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures are stored, so the permutations must never change
+_random = random.Random(20240101)
+_PERMUTATIONS = [
+    (_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Get the set of word shingles of normalized text"""
+    words = _WORD_PATTERN.findall(normalize_text(text))
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard(first, second):
+    """Jaccard similarity of two sets"""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def minhash_signature(shingle_set):
+    """Compute the MinHash signature (MINHASH_PERMUTATIONS values) of a set of shingles"""
+    hashes = [_hash(shingle) for shingle in shingle_set] or [0]
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def lsh_band_keys(subject, question):
+    """Compute the LSH band keys of a question
+    
+    Each key hashes one band of the MinHash signature together with the
+    subject, so only questions of the same subject become candidates.
+    Questions sharing any band key are likely near-duplicates.
+    """
+    signature = minhash_signature(shingles(question))
+    subject_key = normalize_text(subject)
+    
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        content = f"{subject_key}\x1f{band}\x1f{','.join(map(str, rows))}"
+        keys.append(hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest())
+    return keys
@@ -0,0 +1,298 @@
+"""
+In-memory inverted index for instant local question search
+"""
+
+import heapq
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from .helpers import normalize_text
+
+# Fields tokenized into the index, with how much each occurrence counts
+INDEXED_FIELDS = {
+    'question': 1,
+    'option1': 1,
+    'option2': 1,
+    'option3': 1,
+    'option4': 1,
+    'topic': 2
+}
+
+# Fields kept per question so results can be filtered without the database
+FILTER_FIELDS = ['subject', 'topic', 'classification', 'level', 'created_by']
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Compact the postings once this share of indexed documents is tombstoned
+COMPACT_RATIO = 0.25
+
+# Fuzzy search: minimum trigram (Jaccard) similarity of a term to a misspelling,
+# how many similar terms a query word expands to, how many vocabulary terms
+# are examined per query word, and the share of the vocabulary (but at least
+# a minimum number of terms) above which a trigram is too common to narrow
+# the candidates down
+FUZZY_MIN_SIMILARITY = 0.35
+FUZZY_MAX_EXPANSIONS = 5
+FUZZY_CANDIDATE_BUDGET = 2000
+FUZZY_COMMON_TRIGRAM_RATIO = 0.05
+FUZZY_COMMON_TRIGRAM_MIN_TERMS = 50
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has in is it its of on or that the to was were which with'.split()
+)
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Split text into normalized search terms"""
+    return [token for token in _TOKEN_PATTERN.findall(normalize_text(text)) if token not in STOP_WORDS]
+
+
+def trigrams(term):
+    """Get the set of trigrams of a term, padded so short terms still have some"""
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over the questions of some subjects
+    
+    Every indexed question gets a dense document number. A term's postings
+    are two parallel arrays of document numbers and term frequencies, far
+    smaller than dicts of Python ints. Postings are append-only: removing or
+    re-indexing a question tombstones its old document number, and the
+    postings are compacted once tombstones make up COMPACT_RATIO of them.
+    
+    For typo-tolerant search, the vocabulary is indexed by trigrams as well:
+    a misspelled query word expands to the terms sharing most of its
+    trigrams, so fuzzy lookups scale with the vocabulary a word's trigrams
+    reach (capped by FUZZY_CANDIDATE_BUDGET), not with the number of
+    questions. All methods are thread-safe.
+    """
+    
+    def __init__(self, subjects=None):
+        self.subjects = set(subjects) if subjects else None
+        self._lock = threading.RLock()
+        self.clear()
+    
+    def clear(self):
+        """Remove every question from the index"""
+        with self._lock:
+            self.postings = {}
+            self.trigram_terms = {}
+            self.doc_ids = []
+            self.doc_lengths = array('I')
+            self.doc_fields = []
+            self.docno_by_id = {}
+            self.total_length = 0
+            self.tombstones = 0
+    
+    def __len__(self):
+        return len(self.docno_by_id)
+    
+    def covers(self, subject):
+        """Check whether questions of subject belong in this index"""
+        return self.subjects is None or subject in self.subjects
+    
+    def build(self, questions, progress_callback=None, cancel_event=None, progress_every=1000):
+        """Index questions from an iterable (e.g. a cursor); returns the number indexed"""
+        count = 0
+        for question in questions:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            
+            self.add(question)
+            count += 1
+            if progress_callback and count % progress_every == 0:
+                progress_callback(count)
+        return count
+    
+    def add(self, question):
+        """Index a question, replacing any earlier version of it"""
+        terms = Counter()
+        for field, weight in INDEXED_FIELDS.items():
+            for token in tokenize(question.get(field, '')):
+                terms[token] += weight
+        
+        with self._lock:
+            question_id = question['_id']
+            self.remove(question_id)
+            if not self.covers(question.get('subject')):
+                return
+            
+            docno = len(self.doc_ids)
+            for term, frequency in terms.items():
+                entry = self.postings.get(term)
+                if entry is None:
+                    entry = self.postings[term] = (array('I'), array('H'))
+                    self._add_to_vocabulary(term)
+                entry[0].append(docno)
+                entry[1].append(min(frequency, 0xFFFF))
+            
+            length = sum(terms.values())
+            self.doc_ids.append(question_id)
+            self.doc_lengths.append(length)
+            self.doc_fields.append(tuple(question.get(field) for field in FILTER_FIELDS))
+            self.docno_by_id[question_id] = docno
+            self.total_length += length
+    
+    def remove(self, question_id):
+        """Remove a question from the index, if present"""
+        with self._lock:
+            docno = self.docno_by_id.pop(question_id, None)
+            if docno is None:
+                return
+            
+            self.doc_ids[docno] = None
+            self.total_length -= self.doc_lengths[docno]
+            self.tombstones += 1
+            if self.tombstones > len(self.doc_ids) * COMPACT_RATIO:
+                self.compact()
+    
+    def compact(self):
+        """Renumber the live documents and drop tombstoned postings"""
+        with self._lock:
+            renumber = {}
+            doc_ids = []
+            doc_lengths = array('I')
+            doc_fields = []
+            for docno, question_id in enumerate(self.doc_ids):
+                if question_id is not None:
+                    renumber[docno] = len(doc_ids)
+                    doc_ids.append(question_id)
+                    doc_lengths.append(self.doc_lengths[docno])
+                    doc_fields.append(self.doc_fields[docno])
+            
+            postings = {}
+            for term, (docnos, frequencies) in self.postings.items():
+                live_docnos = array('I')
+                live_frequencies = array('H')
+                for docno, frequency in zip(docnos, frequencies):
+                    if docno in renumber:
+                        live_docnos.append(renumber[docno])
+                        live_frequencies.append(frequency)
+                if live_docnos:
+                    postings[term] = (live_docnos, live_frequencies)
+            
+            self.postings = postings
+            self.trigram_terms = {}
+            for term in postings:
+                self._add_to_vocabulary(term)
+            self.doc_ids = doc_ids
+            self.doc_lengths = doc_lengths
+            self.doc_fields = doc_fields
+            self.docno_by_id = {question_id: docno for docno, question_id in enumerate(doc_ids)}
+            self.tombstones = 0
+    
+    def on_write(self, operation, question_id, question):
+        """Keep the index in sync with a question write (a DatabaseManager write listener)"""
+        if operation == 'delete':
+            self.remove(question_id)
+        else:
+            self.add(question)
+    
+    def _add_to_vocabulary(self, term):
+        for gram in trigrams(term):
+            self.trigram_terms.setdefault(gram, []).append(term)
+    
+    def fuzzy_terms(self, word):
+        """Get up to FUZZY_MAX_EXPANSIONS indexed terms similar to word
+        
+        Returns (term, similarity) pairs, most similar first. An exactly
+        matching term has similarity 1.0.
+        """
+        grams = trigrams(word)
+        
+        with self._lock:
+            common = max(len(self.postings) * FUZZY_COMMON_TRIGRAM_RATIO, FUZZY_COMMON_TRIGRAM_MIN_TERMS)
+            candidates = set()
+            
+            # Rare trigrams narrow the candidates down best, so use them first
+            for gram in sorted(grams, key=lambda g: len(self.trigram_terms.get(g, ()))):
+                terms = self.trigram_terms.get(gram, ())
+                if candidates and len(terms) > common:
+                    break
+                candidates.update(terms[:FUZZY_CANDIDATE_BUDGET - len(candidates)])
+                if len(candidates) >= FUZZY_CANDIDATE_BUDGET:
+                    break
+        
+        similar = []
+        for term in candidates:
+            term_grams = trigrams(term)
+            shared = len(grams & term_grams)
+            similarity = shared / (len(grams) + len(term_grams) - shared)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                similar.append((term, similarity))
+        
+        return heapq.nlargest(FUZZY_MAX_EXPANSIONS, similar, key=lambda item: item[1])
+    
+    def _term_scores(self, term, documents, average_length):
+        """Get the BM25 score of term for every live document containing it"""
+        entry = self.postings.get(term)
+        if entry is None:
+            return {}
+        
+        docnos, frequencies = entry
+        # Tombstoned postings slightly inflate the document frequency until compaction
+        frequency = len(docnos)
+        idf = math.log(1 + (max(documents - frequency, 0) + 0.5) / (frequency + 0.5))
+        
+        scores = {}
+        for docno, term_frequency in zip(docnos, frequencies):
+            if self.doc_ids[docno] is None:
+                continue
+            length_norm = 1 - BM25_B + BM25_B * self.doc_lengths[docno] / average_length
+            scores[docno] = idf * term_frequency * (BM25_K1 + 1) / (term_frequency + BM25_K1 * length_norm)
+        return scores
+    
+    def _matches(self, docno, filters):
+        fields = self.doc_fields[docno]
+        return all(fields[FILTER_FIELDS.index(field)] == value for field, value in filters.items())
+    
+    def search(self, text, filters=None, limit=None, fuzzy=False):
+        """Rank the questions matching any term of text with BM25
+        
+        filters maps FILTER_FIELDS to required values. With fuzzy, each query
+        word also matches similar terms, scored in proportion to their
+        trigram similarity. Returns a list of (question_id, score) pairs,
+        best first, at most limit long.
+        """
+        unknown = set(filters or {}) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter local search on: {', '.join(sorted(unknown))}")
+        
+        words = set(tokenize(text))
+        
+        with self._lock:
+            documents = len(self.docno_by_id)
+            if not documents or not words:
+                return []
+            
+            average_length = self.total_length / documents or 1
+            scores = {}
+            for word in words:
+                expansions = self.fuzzy_terms(word) if fuzzy else [(word, 1.0)]
+                
+                # A document counts once per query word, via its best matching term
+                best = {}
+                for term, similarity in expansions:
+                    for docno, score in self._term_scores(term, documents, average_length).items():
+                        best[docno] = max(best.get(docno, 0.0), score * similarity)
+                
+                for docno, score in best.items():
+                    scores[docno] = scores.get(docno, 0.0) + score
+            
+            if filters:
+                scores = {docno: score for docno, score in scores.items() if self._matches(docno, filters)}
+            
+            if limit is not None:
+                ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            else:
+                ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            
+            return [(self.doc_ids[docno], score) for docno, score in ranked]
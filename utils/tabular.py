@@ -0,0 +1,78 @@
+"""
+Column-wise validation of tabular question imports
+
+Large CSV files are read in pandas chunks and every check runs as a
+whole-column operation, instead of calling validate_question per row.
+"""
+
+from .constants import DIFFICULTY_LEVELS
+from .helpers import CSV_FIELDS, REQUIRED_QUESTION_FIELDS
+
+# Check pandas availability
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+OPTION_FIELDS = ['option1', 'option2', 'option3', 'option4']
+
+
+def iter_csv_frames(filename, chunk_size):
+    """Read a question CSV file as DataFrames of at most chunk_size rows
+    
+    Every column is read as text with empty cells kept as '', and rows are
+    indexed from 0 across chunks.
+    """
+    return pd.read_csv(
+        filename,
+        dtype=str,
+        keep_default_na=False,
+        encoding='utf-8',
+        chunksize=chunk_size
+    )
+
+
+def validate_frame(frame):
+    """Validate a DataFrame of questions with whole-column checks
+    
+    Applies the checks of validate_question: required fields, the correct
+    answer matching an option, numeric marks and a known level. Returns
+    (valid questions as a list of dicts, errors) where errors is a list of
+    (row index, message) pairs, one per invalid row, listing all of its
+    problems.
+    """
+    frame = frame.copy()
+    for field in CSV_FIELDS:
+        if field not in frame.columns:
+            frame[field] = ''
+    text = frame[CSV_FIELDS].fillna('').astype(str)
+    
+    problems = {}
+    for field in REQUIRED_QUESTION_FIELDS:
+        problems[f"Missing required field: {field}"] = text[field].eq('')
+    
+    in_options = text[OPTION_FIELDS].eq(text['correctAnswer'], axis=0).any(axis=1)
+    problems["Correct answer must match one of the options"] = ~in_options & text['correctAnswer'].ne('')
+    
+    # Same rule as parse_marks: empty marks default to 1, others must be whole numbers
+    marks = pd.to_numeric(text['marks'].str.strip().replace('', '1'), errors='coerce')
+    problems["Marks must be a number"] = marks.isna() | (marks % 1 != 0)
+    
+    known_level = text['level'].str.strip().str.lower().isin(DIFFICULTY_LEVELS)
+    problems[f"Level must be one of: {', '.join(DIFFICULTY_LEVELS)}"] = ~known_level & text['level'].ne('')
+    
+    failed = pd.DataFrame(problems)
+    invalid = failed.any(axis=1)
+    
+    errors = []
+    for row_index, row in failed[invalid].iterrows():
+        errors.append((row_index, '; '.join(message for message, failed_check in row.items() if failed_check)))
+    
+    valid = frame[~invalid].copy()
+    valid['marks'] = marks[~invalid].astype(int)
+    valid['level'] = text.loc[~invalid, 'level'].str.strip().str.lower()
+    for field in ('topic', 'classification'):
+        valid[field] = text.loc[~invalid, field]
+    
+    return valid.to_dict('records'), errors